@@ -5,6 +5,10 @@ import os
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    # True: asyncpg/aiosqlite AsyncSession, False: sync driver sessions run in the threadpool
+    DATABASE_ASYNC: bool = True
+    # True: 시작 시 alembic upgrade head 실행, 워커 여러 개로 배포할 때는 False로 두고 배포 단계에서 실행
+    DATABASE_AUTO_MIGRATE: bool = True
 
     # CORS
     ALLOWED_ORIGINS: List[str]
@@ -17,14 +21,109 @@ class Settings(BaseSettings):
     # Google OAuth
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
+    GOOGLE_OIDC_DISCOVERY_URL: str = "https://accounts.google.com/.well-known/openid-configuration"
+    GOOGLE_OIDC_METADATA_TTL_SECONDS: int = 60 * 60 # discovery 문서/JWKS 백그라운드 갱신 주기
+
+    # Upload
+    UPLOAD_MAX_BYTES: int = 20 * 1024 * 1024 # 20MB
+
+    # Thumbnails (WebP, stored next to the original)
+    THUMBNAIL_WIDTHS: List[int] = [160, 320, 640]
 
     # Resource Directories
     PERSON_RESOURCE_DIR: str = "resources/persons"
     CLOTH_RESOURCE_DIR: str = "resources/cloths"
     RESULT_RESOURCE_DIR: str = "resources/results"
 
+    # Storage backend: "supabase" (Supabase Storage over pooled HTTP) or "local" (*_RESOURCE_DIR)
+    STORAGE_BACKEND: str = "supabase"
+    STORAGE_MAX_CONNECTIONS: int = 20
+    STORAGE_TIMEOUT_SECONDS: float = 30.0
+    STORAGE_RETRY_ATTEMPTS: int = 3 # 첫 시도를 포함한 최대 횟수 (일시적 오류만 재시도)
+    STORAGE_RETRY_BASE_DELAY_SECONDS: float = 0.1
+    STORAGE_RETRY_MAX_DELAY_SECONDS: float = 1.0
+    STORAGE_BREAKER_FAILURE_THRESHOLD: int = 5 # 연속 실패 수, 넘으면 서킷을 열고 바로 503
+    STORAGE_BREAKER_RESET_SECONDS: float = 15.0
+    STORAGE_HEDGE_MIN_DELAY_SECONDS: float = 0.05 # 다운로드가 p95 지연(최소 이 값)을 넘기면 같은 요청을 한 번 더 보냄
+    STORAGE_HEDGE_MAX_RATIO: float = 0.1 # 헤지 요청 수 상한 (전체 다운로드 대비), 0이면 사용 안 함
+
+    # Local disk cache in front of storage downloads (0 disables)
+    IMAGE_CACHE_DIR: str = "resources/cache"
+    IMAGE_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024 # 1GB, 같은 디렉터리를 쓰는 uvicorn 워커 전체의 합계
+
     # VTON
-    VTON_METHOD: str = "vertex_ai" # run_vton or vertex_ai
+    VTON_METHOD: str = "vertex_ai" # vertex_ai or local (CPU 옷 합성)
+    VTON_FALLBACK_METHOD: str = "" # 기본 엔진이 포화(429)/장애(503)일 때 대신 쓸 엔진, 비워 두면 사용 안 함
+    VTON_MODEL_NAME: str = "gemini-2.5-flash-image"
+    VTON_WARMUP_ON_STARTUP: bool = False # 시작 시 Vertex AI 채널을 미리 연결
+
+    # VTON input normalization (EXIF rotate, downsize, re-encode before the model call)
+    VTON_INPUT_MAX_EDGE: int = 1536
+    VTON_INPUT_FORMAT: str = "JPEG" # JPEG or WEBP
+    VTON_INPUT_QUALITY: int = 90
+    VTON_INPUT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # Try-on result cache (same inputs -> reuse the stored result file)
+    TRYON_RESULT_CACHE_TTL_SECONDS: int = 60 * 60 * 24 * 7 # 7 days
+    TRYON_RESULT_CACHE_MAX_ENTRIES: int = 10000
+
+    # List endpoints (keyset pagination)
+    PAGE_DEFAULT_LIMIT: int = 50
+    PAGE_MAX_LIMIT: int = 200
+
+    # Shop catalog snapshot (/images/shop-clothes)
+    SHOP_CATALOG_TTL_SECONDS: int = 60 * 5 # 다른 워커의 상점 업로드/삭제가 반영되기까지 최대 지연
+    SHOP_CATALOG_MAX_CACHED_PAGES: int = 64 # 스냅샷마다 직렬화해 보관하는 (limit, cursor) 페이지 수
+
+    # HTTP caching (uuid 기반 파일명이라 이미지 응답은 내용이 바뀌지 않음)
+    IMAGE_CACHE_MAX_AGE_SECONDS: int = 60 * 60 * 24 * 365
+
+    # Authentication caches (verified JWT claims / user principal)
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = 60 * 10
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60 # 다른 워커의 사용자 변경이 반영되기까지 최대 지연
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 10000
+
+    # Try-on job queue
+    # 작업은 DB 조회/저장할 때만 커넥션을 쓰고 모델 호출을 기다리는 동안에는 반납하므로 DB 풀 크기(5+10)보다 많아도 됩니다.
+    TRYON_WORKER_COUNT: int = 16 # 동시에 처리할 가상 피팅 작업 수, 모델 호출 수는 VTON_CONCURRENCY_*가 따로 제한
+    TRYON_QUEUE_MAX_SIZE: int = 100 # 대기열 최대 길이, 초과 시 429
+    TRYON_JOB_TTL_SECONDS: int = 60 * 60 # 완료된 작업 상태 보관 시간
+    TRYON_BATCH_MAX_ITEMS: int = 24 # /tryon/batch 한 번에 요청할 수 있는 옷 사진 수
+    TRYON_BATCH_CONCURRENCY: int = 4 # 배치 하나가 동시에 큐에 올리는 작업 수
+    TRYON_USER_RATE_PER_MINUTE: float = 30 # 사용자별 가상 피팅 요청 토큰 충전 속도
+    TRYON_USER_BURST: int = 24 # 사용자별 토큰 버킷 크기 (배치 최대 크기 이상)
+
+    # VTON admission control (AIMD 동시 호출 수 제한)
+    VTON_CONCURRENCY_INITIAL: int = 4
+    VTON_CONCURRENCY_MIN: int = 1
+    VTON_CONCURRENCY_MAX: int = 16
+    VTON_CONCURRENCY_DECREASE_FACTOR: float = 0.5 # 쿼터 초과(429) 시 limit에 곱하는 값
+    VTON_ADMISSION_MAX_WAITERS: int = 32 # 모델 호출 대기 최대 수, 초과 시 429
+    VTON_QUOTA_RETRY_AFTER_SECONDS: int = 10 # 쿼터 초과로 거절할 때 Retry-After
+    VTON_RETRY_ATTEMPTS: int = 3 # 첫 시도를 포함한 최대 횟수 (5xx/시간 초과만 재시도, 쿼터 초과는 재시도 안 함)
+    VTON_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    VTON_RETRY_MAX_DELAY_SECONDS: float = 4.0
+    VTON_BREAKER_FAILURE_THRESHOLD: int = 5 # 연속 실패 수, 넘으면 서킷을 열고 바로 503
+    VTON_BREAKER_RESET_SECONDS: float = 30.0
+
+    # Local VTON engine (NumPy/PIL 합성, 모델 호출 없이 CPU에서 실행)
+    LOCAL_VTON_CONCURRENCY: int = 2 # 동시에 실행할 합성 수 (고정), 스레드 풀을 DB 세션과 나눠 씁니다
+    LOCAL_VTON_MAX_WAITERS: int = 32 # 합성 대기 최대 수, 초과 시 429
+
+    # Prometheus /metrics (uvicorn 워커마다 따로 집계됩니다)
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None # 설정하면 Authorization: Bearer <token> 헤더가 있어야 응답, 없으면 스크레이프 네트워크에서만 열어 둘 것
+
+    # Request tracing (Server-Timing 헤더, OTLP/JSON 내보내기)
+    TRACING_ENABLED: bool = True
+    TRACE_EXPORTER: str = "none" # none, file (JSON Lines), otlp (OTLP/HTTP JSON 수집기)
+    TRACE_EXPORT_FILE: str = "traces.jsonl"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACE_SAMPLE_RATE: float = 0.1 # 내보낼 요청 비율 (traceparent 헤더의 sampled 플래그가 우선)
+    TRACE_EXPORT_INTERVAL_SECONDS: float = 5.0
+    TRACE_EXPORT_MAX_SPANS: int = 10000 # 내보내기 전 버퍼 크기, 넘으면 오래된 span부터 버림
+    TRACE_SERVICE_NAME: str = "fastapi-vton"
 
     # Admin credentials
     ADMIN_USERNAME: str = "cookie8744@hanyang.ac.kr"
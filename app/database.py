@@ -1,5 +1,8 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 from app.config import settings # .env 파일에서 값을 읽어온 settings 객체
 
 #아래 주소를 .env 파일 DATABASE_URL에 적어주세요
@@ -7,6 +10,26 @@ from app.config import settings # .env 파일에서 값을 읽어온 settings 
 #SUPABASE_URL ='https://lbaqzmqmlbythlozegee.supabase.co'
 #SUPABASE_KEY ="sb_publishable_Xa4F8p44GYRWvcRZussBhQ_xTGlDM-K"
 
+# DATABASE_ASYNC=True일 때 사용할 비동기 드라이버
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> URL:
+    """
+    동기 드라이버 URL(postgresql://, sqlite://)을 같은 DB의 비동기 드라이버 URL로 바꿉니다.
+    """
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if drivername is None:
+        raise ValueError(f"No async driver configured for {parsed.drivername}")
+    query = dict(parsed.query)
+    # asyncpg는 libpq의 sslmode 대신 ssl 파라미터를 받습니다.
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return parsed.set(drivername=drivername, query=query)
+
 # 1. settings 객체에서 DATABASE_URL을 한 번만 읽어옵니다.
 engine_args = {}
 
@@ -14,20 +37,87 @@ engine_args = {}
 if "sqlite" in settings.DATABASE_URL:
     engine_args["connect_args"] = {"check_same_thread": False}
 
-# 3. engine을 한 번만 생성합니다.
+# 3. engine을 한 번만 생성합니다. (스키마 생성과 동기 모드에서 사용)
 engine = create_engine(
-    settings.DATABASE_URL, 
-    pool_pre_ping=True, 
+    settings.DATABASE_URL,
+    pool_pre_ping=True,
     pool_recycle=300,
     **engine_args
 )
-# --- (이하 코드는 전혀 수정할 필요 없음) ---
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# 비동기 모드에서는 요청 처리 중 DB 대기가 이벤트 루프를 막지 않도록 비동기 드라이버를 사용합니다.
+async_engine = create_async_engine(
+    to_async_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_recycle=300,
+) if settings.DATABASE_ASYNC else None
+
+class ThreadedSession:
+    """
+    동기 Session을 AsyncSession과 같은 await 인터페이스로 감쌉니다(DATABASE_ASYNC=False).
+    DB 호출은 스레드 풀에서 실행되므로 리포지토리 코드는 두 모드에서 동일합니다.
+    """
+    def __init__(self, sync_session: Session):
+        self.sync_session = sync_session
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalars, statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self):
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance, attribute_names=None):
+        await run_in_threadpool(self.sync_session.refresh, instance, attribute_names)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+# 커밋 후에도 속성 접근이 지연 조회(추가 DB 왕복)를 일으키지 않도록 expire_on_commit=False로 둡니다.
+SyncSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# 리포지토리가 받는 세션 타입 (두 모드 모두 await 인터페이스)
+DbSession = AsyncSession | ThreadedSession
+
+if async_engine is not None:
+    SessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+else:
+    def SessionLocal() -> ThreadedSession:
+        return ThreadedSession(SyncSessionLocal())
 
 # 의존성 주입용
-def get_db():
+async def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
@@ -0,0 +1,30 @@
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.database import engine
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+# Base.metadata.create_all로 만들던 스키마와 같은 리비전
+INITIAL_REVISION = "0001"
+
+def alembic_config() -> Config:
+    config = Config(ALEMBIC_INI)
+    config.attributes["skip_logging_config"] = True
+    return config
+
+def upgrade_database(revision: str = "head"):
+    """
+    DB 스키마를 지정한 리비전(기본: 최신)까지 마이그레이션합니다.
+    마이그레이션 도입 전 create_all로 만든 DB는 초기 리비전으로 stamp한 뒤 이어서 적용합니다.
+    """
+    config = alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        tables = inspect(connection).get_table_names()
+        if "users" in tables and "alembic_version" not in tables:
+            command.stamp(config, INITIAL_REVISION)
+        command.upgrade(config, revision)
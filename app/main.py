@@ -1,37 +1,85 @@
 # app/main.py
-import os
-import sys
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware # Import SessionMiddleware
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 
-from app import models
-from app.database import engine
+from app.database import async_engine, engine
+from app.db_migrations import upgrade_database
 from app.config import settings
+from app.services.tryon_job_service import tryon_job_manager
+from app.services.vton_service import vton_engines
+from app.utils.body_limit import BodySizeLimitMiddleware
+from app.utils.storage_backend import storage_backend
+from app.utils.oauth_client import google_oauth_client
+from app.utils.metrics import MetricsMiddleware, metrics_response
+from app.utils.tracing import TracingMiddleware, instrument_engine, trace_exporter
 
-# Add project path
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(os.path.join(BASE_DIR, "vton"))
+logging.basicConfig(level=logging.INFO)
 
-# Initialize database
-models.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Apply pending schema migrations (or run `alembic upgrade head` before deploy)
+    if settings.DATABASE_AUTO_MIGRATE:
+        await run_in_threadpool(upgrade_database)
+    # Start try-on workers
+    await tryon_job_manager.start()
+    # Load Google OIDC metadata/JWKS before the first login
+    google_oauth_client.prefetch()
+    trace_exporter.start()
+    if settings.VTON_WARMUP_ON_STARTUP:
+        try:
+            await vton_engines.warm_up()
+        except Exception as e:
+            logging.warning(f"VTON engine warm-up failed: {e}")
+    yield
+    await tryon_job_manager.stop()
+    await trace_exporter.stop()
+    await google_oauth_client.aclose()
+    await storage_backend.aclose()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 # Create FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
-# CORS settings
+# Reject oversized uploads before the multipart body is read
+# (64KB of headroom for the multipart boundaries and part headers)
+app.add_middleware(BodySizeLimitMiddleware, max_bytes=settings.UPLOAD_MAX_BYTES + 64 * 1024, path_prefixes=("/upload/",))
+
+# CORS settings (added after the body size limit so its 413 responses get CORS headers too)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
     allow_credentials=True, # Needed for cookies/auth headers in some cases
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Trace-Id"],
 )
 
 # Session Middleware
 app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY, https_only=False)
 
+# Request count/latency per route template (outside CORS/session/body limit, so rejected uploads are counted too;
+# tracing below is added last and wraps it)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.add_api_route("/metrics", metrics_response, methods=["GET"], include_in_schema=False)
+
+# Root span per request, child spans for DB/storage/model calls, Server-Timing header on every response
+if settings.TRACING_ENABLED:
+    instrument_engine(engine)
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine)
+    app.add_middleware(
+        TracingMiddleware,
+        sample_rate=settings.TRACE_SAMPLE_RATE,
+        timing_allow_origin=", ".join(settings.ALLOWED_ORIGINS),
+    )
+
 # Register API routers
 from app.routes import upload, tryon, result, auth, users, images, admin
 app.include_router(upload.router)
@@ -1,5 +1,5 @@
 # app/models.py
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship, declarative_base
 from datetime import datetime
 
@@ -14,7 +14,7 @@ class User(Base):
     profile_image = Column(String, nullable=True) # google 프로필 이미지 URL
     is_active = Column(Boolean, default = True)
     is_superuser = Column(Boolean, default = False)
-    created_at = Column(DateTime, default=datetime.now())
+    created_at = Column(DateTime, default=datetime.now)
 
     person_photos = relationship("PersonPhoto", back_populates="user")
     cloth_photos = relationship("ClothPhoto", back_populates="user")
@@ -27,7 +27,8 @@ class PersonPhoto(Base): # 사람 사진 저장
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     filename_original = Column(String, nullable=False)
     filename = Column(String, unique=True, nullable=False)
-    uploaded_at = Column(DateTime, default=datetime.now())
+    uploaded_at = Column(DateTime, default=datetime.now)
+    thumbnail_widths = Column(String, nullable=False, default="", server_default="") # 저장된 WebP 썸네일 폭 (예: "160,320")
 
     user = relationship("User", back_populates="person_photos")
     result_photos = relationship("ResultPhoto", back_populates="person_photo")
@@ -39,7 +40,8 @@ class ClothPhoto(Base): # 옷 사진 저장
     filename_original = Column(String, nullable=False)
     filename = Column(String, unique=True, nullable=False)
     fitting_type = Column(String, nullable=False, default='upper')
-    uploaded_at = Column(DateTime, default=datetime.now())
+    uploaded_at = Column(DateTime, default=datetime.now)
+    thumbnail_widths = Column(String, nullable=False, default="", server_default="") # 저장된 WebP 썸네일 폭 (예: "160,320")
 
     user = relationship("User", back_populates="cloth_photos")
     result_photos = relationship("ResultPhoto", back_populates="cloth_photo")
@@ -52,9 +54,18 @@ class ResultPhoto(Base): # 결과 저장
     person_photo_id = Column(Integer, ForeignKey("person_photos.id"), nullable=False)
     cloth_photo_id = Column(Integer, ForeignKey("cloth_photos.id"), nullable =False)
     filename = Column(String,unique=True, nullable=False)
-    created_at = Column(DateTime, default=datetime.now())
+    created_at = Column(DateTime, default=datetime.now)
+    thumbnail_widths = Column(String, nullable=False, default="", server_default="") # 저장된 WebP 썸네일 폭 (예: "160,320")
     
     user = relationship("User", back_populates="result_photos")
     person_photo = relationship("PersonPhoto", back_populates="result_photos")
     cloth_photo = relationship("ClothPhoto", back_populates="result_photos")
 
+# 목록 API(키셋 페이지네이션) 정렬 순서에 맞춘 인덱스 - migrations/versions/0002_list_query_indexes.py
+Index("ix_users_created_at", User.created_at.desc(), User.id.desc())
+Index("ix_person_photos_user_id_uploaded_at", PersonPhoto.user_id, PersonPhoto.uploaded_at.desc(), PersonPhoto.id.desc())
+Index("ix_person_photos_uploaded_at", PersonPhoto.uploaded_at.desc(), PersonPhoto.id.desc())
+Index("ix_cloth_photos_user_id_uploaded_at", ClothPhoto.user_id, ClothPhoto.uploaded_at.desc(), ClothPhoto.id.desc())
+Index("ix_cloth_photos_uploaded_at", ClothPhoto.uploaded_at.desc(), ClothPhoto.id.desc())
+Index("ix_result_photos_user_id_created_at", ResultPhoto.user_id, ResultPhoto.created_at.desc(), ResultPhoto.id.desc())
+Index("ix_result_photos_created_at", ResultPhoto.created_at.desc(), ResultPhoto.id.desc())
@@ -1,15 +1,31 @@
 import os
 import logging
-from typing import List, Optional, Type, Dict
-from sqlalchemy.orm import Session
+from typing import Any, Iterable, List, Optional, Type, Dict
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
 from app.models import PersonPhoto, ClothPhoto, ResultPhoto, Base
-from app.utils.supabase_client import supabase
+from app.database import DbSession
+from app.utils.pagination import PageParams, PageResult, fetch_page
+from app.utils.http_cache import ListValidator, list_validator
+from app.utils.singleflight import SingleFlight
+from app.utils.disk_cache import image_disk_cache
+from app.utils.storage_backend import StorageBackend, get_storage_backend, storage_resilience
+from app.utils.image_processing import parse_thumbnail_widths, thumbnail_filename
+from app.utils.metrics import record_storage_bytes
+from app.utils.tracing import start_span
+from app.config import settings
 
 # --- Constants ---
 CATEGORY_DIRS = {
-    "clothes": "resources/cloths",
-    "persons": "resources/persons",
-    "results": "resources/results",
+    "clothes": settings.CLOTH_RESOURCE_DIR,
+    "persons": settings.PERSON_RESOURCE_DIR,
+    "results": settings.RESULT_RESOURCE_DIR,
+}
+
+CATEGORY_BUCKETS = {
+    "clothes": "cloth_photo",
+    "persons": "person_photo",
+    "results": "result_photo",
 }
 
 CATEGORY_MODELS: Dict[str, Type[Base]] = {
@@ -18,21 +34,34 @@ CATEGORY_MODELS: Dict[str, Type[Base]] = {
     "results": ResultPhoto,
 }
 
+# 같은 파일을 동시에 내려받는 요청은 한 번의 다운로드로 합칩니다.
+image_download_flight = SingleFlight()
+
 # --- Repository Class ---
 class ImageRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: DbSession, storage: StorageBackend | None = None):
         self.db = db
+        self.storage = storage or get_storage_backend()
 
-    def get_all_photos_by_category(self, category: str) -> Optional[List[Type[Base]]]:
+    async def get_all_photos_by_category(self, category: str, page: PageParams) -> Optional[PageResult[Base]]:
         """
-        관리자용: 지정된 카테고리의 모든 사진 레코드를 가져옵니다.
+        지정된 카테고리의 사진 레코드를 최신순으로 한 페이지씩 가져옵니다.
         """
         model = CATEGORY_MODELS.get(category)
         if not model:
             return None
-        return self.db.query(model).order_by(model.id.desc()).all()
+        return await fetch_page(self.db, select(model), model, page)
 
-    def delete_photo_by_id(self, category: str, photo_id: int) -> Optional[Type[Base]]:
+    async def get_list_validator(self, category: str, user_id: int) -> Optional[ListValidator]:
+        """
+        사용자의 카테고리별 목록이 바뀌었는지 판단하는 검증자(ETag/Last-Modified)를 집계 쿼리로 계산합니다.
+        """
+        model = CATEGORY_MODELS.get(category)
+        if not model:
+            return None
+        return await list_validator(self.db, model, user_id)
+
+    async def delete_photo_by_id(self, category: str, photo_id: int) -> Optional[Type[Base]]:
         """
         관리자용: ID로 특정 사진 레코드를 삭제하고, 삭제된 객체를 반환합니다.
         """
@@ -40,54 +69,130 @@ class ImageRepository:
         if not model:
             return None
         
-        photo_to_delete = self.db.query(model).filter(model.id == photo_id).first()
+        photo_to_delete = await self.db.get(model, photo_id)
         
         if photo_to_delete:
             # First, commit the deletion to the database
-            self.db.delete(photo_to_delete)
-            self.db.commit()
+            await self.db.delete(photo_to_delete)
+            await self.db.commit()
             return photo_to_delete
             
         return None
 
-    def get_all_photos_for_user(self, user_id: int) -> Dict[str, List[Type[Base]]]:
+    async def get_all_photos_for_user(self, user_id: int) -> Dict[str, List[Type[Base]]]:
         """
         특정 사용자의 모든 사진 레코드를 카테고리별로 가져옵니다.
         """
-        photos = {
-            "persons": self.db.query(PersonPhoto).filter(PersonPhoto.user_id == user_id).all(),
-            "clothes": self.db.query(ClothPhoto).filter(ClothPhoto.user_id == user_id).all(),
-            "results": self.db.query(ResultPhoto).filter(ResultPhoto.user_id == user_id).all(),
-        }
+        photos = {}
+        for category, model in (("persons", PersonPhoto), ("clothes", ClothPhoto), ("results", ResultPhoto)):
+            result = await self.db.scalars(select(model).where(model.user_id == user_id))
+            photos[category] = list(result.all())
         return photos
 
-    def get_shop_cloth_photos(self) -> List[ClothPhoto]:
+    async def get_shop_cloth_photos(self) -> List[ClothPhoto]:
         """
-        상점(SHOP_USER_ID)에 해당하는 모든 ClothPhoto 레코드를 가져옵니다.
+        상점(SHOP_USER_ID)에 해당하는 모든 ClothPhoto 레코드를 목록 API와 같은 순서(최신순)로 가져옵니다.
         """
-        from app.config import settings # 순환 참조 방지를 위해 함수 내에서 임포트
         shop_user_id = settings.SHOP_USER_ID
-        return self.db.query(ClothPhoto).filter(ClothPhoto.user_id == shop_user_id).all()
+        result = await self.db.scalars(
+            select(ClothPhoto)
+            .where(ClothPhoto.user_id == shop_user_id)
+            .order_by(ClothPhoto.uploaded_at.desc(), ClothPhoto.id.desc())
+        )
+        return list(result.all())
 
     def get_public_url(self, bucket: str, filename: str) -> Optional[str]:
         """
-        Supabase Storage에서 파일의 공개 URL을 가져옵니다.
+        저장소에서 파일의 공개 URL을 가져옵니다.
         """
         if not filename:
             return None
-        return supabase.storage.from_(bucket).get_public_url(filename)
+        return self.storage.public_url(bucket, filename)
+
+    def get_public_urls(self, bucket: str, filenames: Iterable[str]) -> List[Optional[str]]:
+        """
+        여러 파일의 공개 URL을 한 번에 만듭니다. 목록 API에서 페이지당 한 번 호출합니다.
+        """
+        return self.storage.public_urls(bucket, filenames)
 
-    def download_image(self, bucket: str, filename: str) -> bytes:
+    def serialize_photos(self, bucket: str, photos: List[Base]) -> List[Dict[str, Any]]:
         """
-        Supabase Storage에서 파일을 다운로드하여 바이트로 반환합니다.
+        사진 레코드 목록을 공개 URL과 썸네일 URL을 포함한 응답용 dict 목록으로 바꿉니다.
         """
+        urls = self.get_public_urls(bucket, [photo.filename for photo in photos])
+        return [
+            {
+                "id": photo.id,
+                "filename": photo.filename,
+                "user_id": photo.user_id,
+                "image_url": url,
+                "thumbnail_urls": self.get_thumbnail_urls(bucket, photo.filename, photo.thumbnail_widths),
+                "fitting_type": getattr(photo, "fitting_type", None),
+                "uploaded_at": getattr(photo, "uploaded_at", None),
+                "created_at": getattr(photo, "created_at", None),
+            }
+            for photo, url in zip(photos, urls)
+        ]
+
+    def get_thumbnail_urls(self, bucket: str, filename: str, thumbnail_widths: str) -> Dict[int, str]:
+        """
+        원본 옆에 저장된 WebP 썸네일의 공개 URL을 레코드에 기록된 가로 폭별로 반환합니다.
+        썸네일 저장에 실패했거나 아직 백필하지 않은 레코드(thumbnail_widths가 빈 값)는 빈 dict를 반환합니다.
+        """
+        widths = parse_thumbnail_widths(thumbnail_widths)
+        if not filename or not widths:
+            return {}
+        urls = self.storage.public_urls(bucket, [thumbnail_filename(filename, width) for width in widths])
+        return dict(zip(widths, urls))
+
+    def get_local_path(self, bucket: str, filename: str) -> Optional[str]:
+        """
+        로컬 저장소를 사용할 때 파일의 디스크 경로를 반환합니다. 원격 저장소이면 None입니다.
+        """
+        return self.storage.local_path(bucket, filename)
+
+    async def delete_image_files(self, bucket: str, filenames: Iterable[str]):
+        """
+        저장소에서 원본 파일과 썸네일을 한 번의 요청으로 삭제합니다.
+        """
+        paths = []
+        for filename in filenames:
+            paths.append(filename)
+            paths.extend(thumbnail_filename(filename, width) for width in settings.THUMBNAIL_WIDTHS)
+        await self.storage.delete(bucket, paths)
+
+    async def download_image(self, bucket: str, filename: str) -> bytes | memoryview:
+        """
+        저장소에서 파일을 다운로드하여 바이트로 반환합니다.
+        로컬 디스크 캐시에 있으면 다운로드 없이 mmap된 memoryview를 반환합니다.
+        """
+        use_cache = not self.storage.is_local
+        if use_cache:
+            # open/mmap/utime도 디스크 I/O이므로 put과 마찬가지로 이벤트 루프 밖에서 실행합니다.
+            cached = await run_in_threadpool(image_disk_cache.get, bucket, filename)
+            if cached is not None:
+                return cached
         try:
-            return supabase.storage.from_(bucket).download(filename)
+            return await image_download_flight.do(
+                (bucket, filename),
+                lambda: self._download(bucket, filename, use_cache),
+            )
         except Exception as e:
             logging.error(f"Failed to download image {filename} from {bucket}: {e}")
             raise e
 
-    def get_image_path(self, category: str, image_name: str) -> Optional[str]:
+    async def _download(self, bucket: str, filename: str, use_cache: bool) -> bytes:
+        # 읽기는 멱등하므로 일시적 오류는 재시도하고, 느린 요청은 헤지합니다.
+        with start_span("storage.get", **{"storage.bucket": bucket}) as span:
+            data = await storage_resilience.call(lambda: self.storage.get(bucket, filename), hedge=True)
+            if span is not None:
+                span.attributes["storage.bytes"] = len(data)
+        record_storage_bytes(bucket, "in", len(data))
+        if use_cache:
+            await run_in_threadpool(image_disk_cache.put, bucket, filename, data)
+        return data
+
+    async def get_image_path(self, category: str, image_name: str) -> Optional[str]:
         """
         DB를 확인하여 카테고리와 이미지 이름이 유효한지 검증하고,
         유효하다면 전체 파일 경로를 반환합니다.
@@ -102,7 +207,7 @@ class ImageRepository:
             logging.warning(f"Invalid image name requested: {image_name}")
             return None
 
-        record_exists = self.db.query(model).filter(model.filename == image_name).first()
+        record_exists = await self.db.scalar(select(model.id).where(model.filename == image_name))
         if not record_exists:
             return None
 
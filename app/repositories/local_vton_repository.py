@@ -0,0 +1,124 @@
+# app/repositories/local_vton_repository.py
+import io
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageFilter
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.tracing import start_span
+
+# 합성 방식을 바꾸면 올려서 이전 방식으로 만든 캐시 결과를 재사용하지 않도록 합니다.
+COMPOSITOR_VERSION = "overlay-v1"
+
+# 테두리 색(배경)과 RGB 거리 합이 이 값보다 크면 전경으로 봅니다.
+BACKGROUND_DISTANCE_THRESHOLD = 60
+# 전경 비율이 이 범위를 벗어나면 배경 분리에 실패한 것으로 보고 이미지 전체를 씁니다.
+FOREGROUND_MIN_RATIO = 0.03
+FOREGROUND_MAX_RATIO = 0.92
+
+# 사람 영역 대비 옷을 놓을 위치 (위, 아래, 너비 비율)
+GARMENT_REGIONS = {
+    "upper": (0.17, 0.56, 1.0),
+    "lower": (0.47, 0.96, 0.8),
+    "overall": (0.17, 0.93, 1.0),
+}
+# 옷 비율을 유지한 높이가 영역 높이의 이 비율보다 작으면 세로로 늘립니다.
+GARMENT_MIN_HEIGHT_RATIO = 0.7
+
+Box = Tuple[int, int, int, int]
+
+def _foreground_mask(rgb: np.ndarray) -> Optional[np.ndarray]:
+    """
+    이미지 테두리의 중간값 색을 배경으로 보고 전경 마스크를 만듭니다. 배경이 단색이 아니면 None을 반환합니다.
+    """
+    border = np.concatenate((rgb[0], rgb[-1], rgb[:, 0], rgb[:, -1]))
+    background = np.median(border, axis=0).astype(np.int16)
+    distance = np.abs(rgb.astype(np.int16) - background).sum(axis=2)
+    mask = distance > BACKGROUND_DISTANCE_THRESHOLD
+    ratio = mask.mean()
+    if ratio < FOREGROUND_MIN_RATIO or ratio > FOREGROUND_MAX_RATIO:
+        return None
+    return mask
+
+def _bounding_box(mask: np.ndarray, min_fraction: float = 0.02) -> Box:
+    """
+    전경 픽셀이 min_fraction 이상인 행/열만 세어 잡음에 흔들리지 않는 (left, top, right, bottom)을 구합니다.
+    """
+    rows = np.flatnonzero(mask.sum(axis=1) > mask.shape[1] * min_fraction)
+    cols = np.flatnonzero(mask.sum(axis=0) > mask.shape[0] * min_fraction)
+    if not len(rows) or not len(cols):
+        return 0, 0, mask.shape[1], mask.shape[0]
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+def _garment_layer(cloth: Image.Image) -> Tuple[Image.Image, Image.Image]:
+    """
+    옷 사진에서 배경을 떼어 낸 옷 이미지와 가장자리를 부드럽게 만든 알파 마스크를 반환합니다.
+    """
+    rgb = np.asarray(cloth)
+    mask = _foreground_mask(rgb)
+    if mask is None:
+        return cloth, Image.new("L", cloth.size, 255)
+    box = _bounding_box(mask)
+    alpha = Image.fromarray(mask.astype(np.uint8) * 255, mode="L").filter(ImageFilter.GaussianBlur(2))
+    return cloth.crop(box), alpha.crop(box)
+
+def composite_garment(
+    person_image_bytes: bytes | memoryview,
+    cloth_image_bytes: bytes | memoryview,
+    cloth_type: str = "upper",
+) -> bytes:
+    """
+    옷 사진의 배경을 제거하고 사람 사진의 상체/하체/전신 영역에 맞춰 덮어씌운 PNG를 만듭니다.
+    모델 없이 CPU에서 이미지 한 장당 0.1~0.3초 정도에 끝나는 근사 합성이며, 결과 품질보다 응답 속도가 중요할 때 사용합니다.
+    """
+    with Image.open(io.BytesIO(person_image_bytes)) as image:
+        person = image.convert("RGB")
+    with Image.open(io.BytesIO(cloth_image_bytes)) as image:
+        cloth = image.convert("RGB")
+
+    person_mask = _foreground_mask(np.asarray(person))
+    if person_mask is None:
+        left, top, right, bottom = 0, 0, person.width, person.height
+    else:
+        left, top, right, bottom = _bounding_box(person_mask)
+
+    region_top, region_bottom, region_width = GARMENT_REGIONS.get(cloth_type, GARMENT_REGIONS["upper"])
+    height = bottom - top
+    box_width = max(1, int((right - left) * region_width))
+    box_height = max(1, int(height * (region_bottom - region_top)))
+
+    garment, alpha = _garment_layer(cloth)
+    # 너비를 영역에 맞추고, 높이는 영역 안에 들어오도록 비율을 조금 바꿔 맞춥니다.
+    garment_height = garment.height * box_width / garment.width
+    garment_height = min(box_height, max(box_height * GARMENT_MIN_HEIGHT_RATIO, garment_height))
+    size = (box_width, max(1, round(garment_height)))
+    garment = garment.resize(size, Image.Resampling.BILINEAR)
+    alpha = alpha.resize(size, Image.Resampling.BILINEAR)
+
+    x = (left + right - size[0]) // 2
+    y = top + int(height * region_top)
+    person.paste(garment, (x, y), alpha)
+
+    output = io.BytesIO()
+    # 결과는 저장소에 한 번 올리고 끝나므로 압축률보다 인코딩 속도를 우선합니다.
+    person.save(output, format="PNG", compress_level=1)
+    return output.getvalue()
+
+async def run_vton_locally(
+    person_image_bytes: bytes | memoryview,
+    person_mime_type: str,
+    cloth_image_bytes: bytes | memoryview,
+    cloth_mime_type: str,
+    cloth_type: str = "upper",
+) -> bytes:
+    """
+    CPU 합성을 스레드 풀에서 실행합니다. Vertex AI 호출과 같은 인자를 받습니다.
+    """
+    try:
+        with start_span("vton.generate", **{"vton.model": COMPOSITOR_VERSION, "vton.cloth_type": cloth_type}):
+            return await run_in_threadpool(composite_garment, person_image_bytes, cloth_image_bytes, cloth_type)
+    except Exception as e:
+        logging.error(f"An error occurred in run_vton_locally: {e}", exc_info=True)
+        raise
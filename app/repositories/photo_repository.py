@@ -1,28 +1,36 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 from app import models
+from app.database import DbSession
+from app.utils.pagination import PageParams, PageResult, fetch_page
 
 class PhotoRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: DbSession):
         self.db = db
 
-    def get_person_photo_by_id(self, photo_id: int, user_id: int) -> models.PersonPhoto | None:
-        return self.db.query(models.PersonPhoto).filter(
+    async def get_person_photo_by_id(self, photo_id: int, user_id: int) -> models.PersonPhoto | None:
+        return await self.db.scalar(select(models.PersonPhoto).where(
             models.PersonPhoto.id == photo_id,
             models.PersonPhoto.user_id == user_id
-        ).first()
+        ))
 
-    def get_cloth_photo_by_id(self, photo_id: int) -> models.ClothPhoto | None:
-        return self.db.query(models.ClothPhoto).filter(
+    async def get_cloth_photo_by_id(self, photo_id: int) -> models.ClothPhoto | None:
+        return await self.db.scalar(select(models.ClothPhoto).where(
             models.ClothPhoto.id == photo_id,
             # models.ClothPhoto.user_id == user_id
-        ).first()
+        ))
 
-    def get_all_by_user_id(self, user_id: int) -> list[models.PersonPhoto]:
-        return self.db.query(models.PersonPhoto).filter(
+    async def release_connection(self):
+        """
+        조회 트랜잭션을 끝내 커넥션을 풀에 돌려줍니다. expire_on_commit=False이므로 조회한 객체는 계속 쓸 수 있습니다.
+        """
+        await self.db.commit()
+
+    async def get_all_by_user_id(self, user_id: int, page: PageParams) -> PageResult[models.PersonPhoto]:
+        return await fetch_page(self.db, select(models.PersonPhoto).where(
             models.PersonPhoto.user_id == user_id
-        ).all()
+        ), models.PersonPhoto, page)
     
-    def get_all_cloth_photos_by_user_id(self, user_id: int) -> list[models.ClothPhoto]:
-        return (self.db.query(models.ClothPhoto).filter(
+    async def get_all_cloth_photos_by_user_id(self, user_id: int, page: PageParams) -> PageResult[models.ClothPhoto]:
+        return await fetch_page(self.db, select(models.ClothPhoto).where(
             models.ClothPhoto.user_id == user_id
-        ).order_by(models.ClothPhoto.fitting_type.desc()).all())
+        ), models.ClothPhoto, page)
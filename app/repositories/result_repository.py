@@ -1,27 +1,31 @@
-from sqlalchemy.orm import Session
+from typing import Iterable
+from sqlalchemy import select
 from app import models
-from typing import List
+from app.database import DbSession
+from app.utils.pagination import PageParams, PageResult, fetch_page
+from app.utils.image_processing import format_thumbnail_widths
 
 class ResultRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: DbSession):
         self.db = db
 
-    def create_result(self, user_id: int, person_photo_id: int, cloth_photo_id: int, filename: str) -> models.ResultPhoto:
+    async def create_result(self, user_id: int, person_photo_id: int, cloth_photo_id: int, filename: str, thumbnail_widths: Iterable[int] = ()) -> models.ResultPhoto:
         new_result = models.ResultPhoto(
             user_id=user_id,
             person_photo_id=person_photo_id,
             cloth_photo_id=cloth_photo_id,
             filename=filename,
+            thumbnail_widths=format_thumbnail_widths(thumbnail_widths),
         )
         self.db.add(new_result)
-        self.db.commit()
-        self.db.refresh(new_result)
+        await self.db.commit()
+        await self.db.refresh(new_result)
         return new_result
 
-    def get_results_by_user_id(self, user_id: int) -> List[models.ResultPhoto]:
-        return (
-            self.db.query(models.ResultPhoto)
-            .filter(models.ResultPhoto.user_id == user_id)
-            .order_by(models.ResultPhoto.created_at.desc())
-            .all()
+    async def get_results_by_user_id(self, user_id: int, page: PageParams) -> PageResult[models.ResultPhoto]:
+        return await fetch_page(
+            self.db,
+            select(models.ResultPhoto).where(models.ResultPhoto.user_id == user_id),
+            models.ResultPhoto,
+            page,
         )
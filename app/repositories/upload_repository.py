@@ -1,44 +1,82 @@
-from sqlalchemy.orm import Session
+from typing import Iterable
 from app import models
 from datetime import datetime
-from app.utils.supabase_client import supabase
+from app.database import DbSession
+from app.utils.metrics import record_storage_bytes
+from app.utils.resilience import CircuitOpenError
+from app.utils.tracing import start_span
+from app.utils.storage_backend import StorageBackend, FileContent, get_storage_backend, storage_resilience
+from app.utils.image_processing import format_thumbnail_widths
 
 class UploadRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: DbSession, storage: StorageBackend | None = None):
         self.db = db
+        self.storage = storage or get_storage_backend()
 
-    def upload_file(self, bucket: str, path: str, file_content: bytes, content_type: str):
+    async def upload_file(self, bucket: str, path: str, file_content: FileContent, content_type: str, upsert: bool = False):
+        # 파일 객체를 넘기면 전체를 메모리에 올리지 않고 청크 단위로 전송합니다.
+        # 재시도할 때는 파일 객체를 처음 위치로 되돌려 다시 보내고, 되돌릴 수 없으면 재시도하지 않습니다.
+        is_file = hasattr(file_content, "read")
+        rewindable = not is_file or file_content.seekable()
+        start = file_content.tell() if is_file and rewindable else 0
+
+        async def put():
+            if is_file and rewindable:
+                file_content.seek(start)
+            await self.storage.put(bucket, path, file_content, content_type, upsert=upsert)
+
+        try:
+            # upsert가 아니면 이미 저장된 뒤의 재시도가 '이미 존재' 오류가 되므로, 전송되지 않은 요청만 재시도합니다.
+            with start_span("storage.put", **{"storage.bucket": bucket}):
+                await storage_resilience.call(put, idempotent=upsert, retry=rewindable)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            raise Exception(f"Storage({bucket}) 업로드 실패: {e}")
+        # 파일 객체는 전송하면서 끝까지 읽으므로 읽은 위치로 크기를 구합니다.
+        if not is_file:
+            record_storage_bytes(bucket, "out", memoryview(file_content).nbytes)
+        elif rewindable:
+            record_storage_bytes(bucket, "out", file_content.tell() - start)
+
+    async def copy_file(self, bucket: str, from_path: str, to_path: str):
+        try:
+            # 서버 측 복사이므로 파일 내용을 내려받지 않습니다.
+            with start_span("storage.copy", **{"storage.bucket": bucket}):
+                await self.storage.copy(bucket, from_path, to_path)
+        except Exception as e:
+            raise Exception(f"Storage({bucket}) 복사 실패: {e}")
+
+    async def delete_files(self, bucket: str, paths: Iterable[str]):
         try:
-            # Using the global 'supabase' client which should be initialized with SERVICE_ROLE_KEY
-            supabase.storage.from_(bucket).upload(
-                path=path,
-                file=file_content,
-                file_options={"content-type": content_type}
-            )
+            with start_span("storage.delete", **{"storage.bucket": bucket}):
+                await self.storage.delete(bucket, paths)
         except Exception as e:
-            raise Exception(f"Supabase({bucket}) 업로드 실패: {e}")
+            raise Exception(f"Storage({bucket}) 삭제 실패: {e}")
 
-    def create_person_photo(self, user_id: int, filename_original: str, filename: str) -> models.PersonPhoto:
+    async def create_person_photo(self, user_id: int, filename_original: str, filename: str, thumbnail_widths: Iterable[int] = ()) -> models.PersonPhoto:
         new_photo = models.PersonPhoto(
             user_id=user_id,
             filename_original=filename_original,
             filename=filename,
+            thumbnail_widths=format_thumbnail_widths(thumbnail_widths),
             uploaded_at=datetime.utcnow(),
         )
         self.db.add(new_photo)
-        self.db.commit()
-        self.db.refresh(new_photo)
+        await self.db.commit()
+        await self.db.refresh(new_photo)
         return new_photo
 
-    def create_cloth_photo(self, user_id: int, filename_original: str, filename: str, fitting_type: str) -> models.ClothPhoto:
+    async def create_cloth_photo(self, user_id: int, filename_original: str, filename: str, fitting_type: str, thumbnail_widths: Iterable[int] = ()) -> models.ClothPhoto:
         new_cloth = models.ClothPhoto(
             user_id=user_id,
             filename_original=filename_original,
             filename=filename,
             fitting_type=fitting_type,
+            thumbnail_widths=format_thumbnail_widths(thumbnail_widths),
             uploaded_at=datetime.utcnow(),
         )
         self.db.add(new_cloth)
-        self.db.commit()
-        self.db.refresh(new_cloth)
+        await self.db.commit()
+        await self.db.refresh(new_cloth)
         return new_cloth
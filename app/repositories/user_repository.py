@@ -1,25 +1,26 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 from app import models, schemas
-from typing import List
+from app.database import DbSession
+from app.utils.pagination import PageParams, PageResult, fetch_page
 
 class UserRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: DbSession):
         self.db = db
 
-    def get_by_id(self, user_id: int) -> models.User | None:
-        return self.db.query(models.User).filter(models.User.id == user_id).first()
+    async def get_by_id(self, user_id: int) -> models.User | None:
+        return await self.db.get(models.User, user_id)
 
-    def get_by_email(self, email: str) -> models.User | None:
-        return self.db.query(models.User).filter(models.User.email == email).first()
+    async def get_by_email(self, email: str) -> models.User | None:
+        return await self.db.scalar(select(models.User).where(models.User.email == email))
 
-    def get_all_users(self, skip: int = 0, limit: int = 100) -> List[models.User]:
+    async def get_all_users(self, page: PageParams) -> PageResult[models.User]:
         """
-        모든 사용자 목록을 가져옵니다. 페이지네이션을 지원합니다.
+        모든 사용자 목록을 가입 시각 역순으로 가져옵니다. 커서 기반 페이지네이션을 지원합니다.
         """
-        return self.db.query(models.User).offset(skip).limit(limit).all()
+        return await fetch_page(self.db, select(models.User), models.User, page)
 
-    def create_or_update_google_user(self, *, google_id: str, email: str, name: str, profile_image: str) -> models.User:
-        user = self.get_by_email(email=email)
+    async def create_or_update_google_user(self, *, google_id: str, email: str, name: str, profile_image: str) -> models.User:
+        user = await self.get_by_email(email=email)
         if user:
             # Update existing user if they sign in with Google
             user.google_id = google_id
@@ -36,23 +37,33 @@ class UserRepository:
             )
             self.db.add(user)
         
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
         return user
 
-        self.db.commit()
-        self.db.refresh(user)
+    async def update_user_details(self, user_id: int, user_update: schemas.AdminUserUpdate) -> models.User | None:
+        """
+        관리자용: 전달된 필드만 사용자 정보에 반영합니다.
+        """
+        user = await self.get_by_id(user_id=user_id)
+        if not user:
+            return None
+
+        for field, value in user_update.model_dump(exclude_unset=True).items():
+            setattr(user, field, value)
+
+        await self.db.commit()
+        await self.db.refresh(user)
         return user
 
-    def delete_user(self, user_id: int) -> bool:
+    async def delete_user(self, user_id: int) -> bool:
         """
         ID로 사용자를 삭제합니다.
         """
-        user = self.get_by_id(user_id=user_id)
+        user = await self.get_by_id(user_id=user_id)
         if not user:
             return False
         
-        self.db.delete(user)
-        self.db.commit()
+        await self.db.delete(user)
+        await self.db.commit()
         return True
-
@@ -1,29 +1,86 @@
 # app/repositories/vton_repository.py
 import vertexai
+from google.api_core import exceptions as google_exceptions
 from vertexai.generative_models import GenerativeModel, Part
-import base64
 import logging
+import threading
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.utils.resilience import CircuitBreaker, ResilientDependency, RetryPolicy
+from app.utils.tracing import start_span
 
-def _create_image_part(image_bytes: bytes, mime_type: str) -> Part:
-    encoded_content = base64.b64encode(image_bytes).decode("utf-8")
-    return Part.from_data(data=encoded_content, mime_type=mime_type)
+# 프롬프트를 바꾸면 올려서 이전 프롬프트로 만든 캐시 결과를 재사용하지 않도록 합니다.
+PROMPT_VERSION = "v1"
 
-def run_vton_with_vertex_ai(
-    person_image_bytes: bytes,
-    person_mime_type: str,
-    cloth_image_bytes: bytes,
-    cloth_mime_type: str,
-    cloth_type: str = "upper",
-) -> bytes:
+def _create_image_part(image_bytes: bytes | memoryview, mime_type: str) -> Part:
+    # Part.from_data는 원본 바이트를 받습니다. base64 문자열을 넘기면 인코딩/디코딩으로 사본이 두 번 더 생깁니다.
+    if isinstance(image_bytes, memoryview):
+        image_bytes = image_bytes.tobytes()
+    return Part.from_data(data=image_bytes, mime_type=mime_type)
+
+def is_quota_error(error: Exception) -> bool:
     """
-    Virtual Try-On with Google Vertex AI (Gemini Flash) using base64 encoded images.
-    Returns the generated image as bytes.
+    Vertex AI 쿼터/요청 한도 초과(HTTP 429, RESOURCE_EXHAUSTED) 오류인지 확인합니다.
     """
-    logging.basicConfig(level=logging.INFO)
-    try:
-        vertexai.init()
+    return isinstance(error, (google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests))
+
+# 일시적인 서버 오류/시간 초과는 같은 요청을 다시 보내면 성공할 수 있습니다.
+_TRANSIENT_ERRORS = (
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.BadGateway,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.Aborted,
+)
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    재시도할 만한 Vertex AI 오류(5xx, 시간 초과)인지 확인합니다. 쿼터 초과는 동시 호출 수 조절로 처리하므로 제외합니다.
+    """
+    return isinstance(error, _TRANSIENT_ERRORS)
+
+class VertexVtonClient:
+    """
+    프로세스 수명 동안 유지되는 Vertex AI 클라이언트입니다.
+    vertexai.init()과 모델 생성은 처음 한 번만 수행하고, 이후 요청은 같은 채널을 공유합니다.
+    """
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self._model: GenerativeModel | None = None
+        self._lock = threading.Lock()
+
+    def _get_model(self) -> GenerativeModel:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    vertexai.init()
+                    self._model = GenerativeModel(self.model_name)
+        return self._model
 
-        model = GenerativeModel("gemini-2.5-flash-image")
+    async def _ensure_model(self) -> GenerativeModel:
+        if self._model is not None:
+            return self._model
+        # 자격 증명 탐색이 네트워크를 쓸 수 있으므로 첫 초기화는 스레드에서 수행
+        return await run_in_threadpool(self._get_model)
+
+    async def warm_up(self):
+        """
+        모델을 초기화하고 가벼운 토큰 계산 요청으로 채널을 미리 연결합니다.
+        """
+        model = await self._ensure_model()
+        await model.count_tokens_async("warm-up")
+        logging.info(f"Vertex AI client warmed up ({self.model_name})")
+
+    async def generate(
+        self,
+        person_image_bytes: bytes | memoryview,
+        person_mime_type: str,
+        cloth_image_bytes: bytes | memoryview,
+        cloth_mime_type: str,
+        cloth_type: str = "upper",
+    ) -> bytes:
+        model = await self._ensure_model()
 
         person_image_part = _create_image_part(person_image_bytes, person_mime_type)
         cloth_image_part = _create_image_part(cloth_image_bytes, cloth_mime_type)
@@ -34,19 +91,59 @@ def run_vton_with_vertex_ai(
             cloth_image_part,
         ]
 
-        response = model.generate_content(prompt)
+        response = await model.generate_content_async(prompt)
 
-        if response.candidates and response.candidates[0].content.parts:
-            for part in response.candidates[0].content.parts:
+        candidates = response.candidates
+        if candidates and candidates[0].content.parts:
+            for part in candidates[0].content.parts:
                 # Vertex AI usually returns image/png or image/jpeg
-                # Check for inline_data which contains the raw bytes (or base64 depending on client version, usually bytes in Part object if accessed via inline_data.data)
-                # Actually, the python client `part.inline_data.data` returns bytes directly if it's populated.
-                if part.inline_data and part.inline_data.data:
+                # `inline_data.data` builds a new bytes object on every access, so read it only once.
+                image_data = part.inline_data.data if part.inline_data else None
+                if image_data:
                     logging.info("Successfully generated image from Vertex AI")
-                    return part.inline_data.data
-        
+                    return image_data
+
         logging.warning("No image parts found in the model response.")
         raise Exception("No image found in the model response.")
+
+vton_client = VertexVtonClient(settings.VTON_MODEL_NAME)
+
+# 이미지 생성은 부수 효과가 없어 멱등한 호출로 재시도합니다.
+vton_resilience = ResilientDependency(
+    name="vertex_ai",
+    retry=RetryPolicy(
+        attempts=settings.VTON_RETRY_ATTEMPTS,
+        base_delay_seconds=settings.VTON_RETRY_BASE_DELAY_SECONDS,
+        max_delay_seconds=settings.VTON_RETRY_MAX_DELAY_SECONDS,
+    ),
+    breaker=CircuitBreaker(
+        "vertex_ai",
+        failure_threshold=settings.VTON_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout_seconds=settings.VTON_BREAKER_RESET_SECONDS,
+    ),
+    is_transient=is_transient_error,
+)
+
+async def run_vton_with_vertex_ai(
+    person_image_bytes: bytes | memoryview,
+    person_mime_type: str,
+    cloth_image_bytes: bytes | memoryview,
+    cloth_mime_type: str,
+    cloth_type: str = "upper",
+) -> bytes:
+    """
+    Virtual Try-On with Google Vertex AI (Gemini Flash) using raw image bytes.
+    Returns the generated image as bytes.
+    """
+    try:
+        with start_span("vton.generate", **{"vton.model": vton_client.model_name, "vton.cloth_type": cloth_type}):
+            return await vton_client.generate(
+                person_image_bytes,
+                person_mime_type,
+                cloth_image_bytes,
+                cloth_mime_type,
+                cloth_type,
+            )
     except Exception as e:
         logging.error(f"An error occurred in run_vton_with_vertex_ai: {e}", exc_info=True)
         raise
@@ -1,9 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
 
 from app import schemas
 from app.services.admin_service import AdminService, get_admin_service
 from app.utils.admin_auth import get_admin_user
+from app.utils.result_cache import tryon_result_cache
+from app.utils.image_processing import normalized_image_cache
+from app.utils.disk_cache import image_disk_cache
+from app.utils.auth_cache import token_claims_cache, user_principal_cache
+from app.utils.oauth_client import google_oauth_client
+from app.services.tryon_service import tryon_flight
+from app.repositories.image_repository import image_download_flight
+from app.utils.pagination import PageParams, page_params
+from app.utils.shop_catalog import shop_catalog
+from app.utils.admission import tryon_user_buckets, vton_limiter
+from app.services.tryon_job_service import tryon_job_manager
+from app.services.vton_service import vton_engines
+from app.repositories.vton_repository import vton_resilience
+from app.utils.storage_backend import storage_resilience
+from app.utils.tracing import trace_exporter
 
 router = APIRouter(
     prefix="/admin",
@@ -11,21 +25,20 @@ router = APIRouter(
     dependencies=[Depends(get_admin_user)]
 )
 
-@router.get("/users", response_model=List[schemas.User])
-def read_all_users(
-    skip: int = 0,
-    limit: int = 100,
+@router.get("/users", response_model=schemas.Page[schemas.User])
+async def read_all_users(
+    page: PageParams = Depends(page_params),
     admin_service: AdminService = Depends(get_admin_service)
 ):
-    return admin_service.get_all_users(skip=skip, limit=limit)
+    return await admin_service.get_all_users(page)
 
 @router.patch("/users/{user_id}", response_model=schemas.User)
-def update_user_details(
+async def update_user_details(
     user_id: int,
     user_update: schemas.AdminUserUpdate,
     admin_service: AdminService = Depends(get_admin_service)
 ):
-    updated_user = admin_service.update_user(user_id=user_id, user_update=user_update)
+    updated_user = await admin_service.update_user(user_id=user_id, user_update=user_update)
     if updated_user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -34,11 +47,11 @@ def update_user_details(
     return updated_user
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_200_OK)
-def delete_user_account(
+async def delete_user_account(
     user_id: int,
     admin_service: AdminService = Depends(get_admin_service)
 ):
-    success = admin_service.delete_user_account(user_id=user_id)
+    success = await admin_service.delete_user_account(user_id=user_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -46,12 +59,13 @@ def delete_user_account(
         )
     return {"message": f"User with id {user_id} and all associated data deleted successfully."}
 
-@router.get("/photos/{category}", response_model=List[schemas.Photo])
-def read_all_photos(
+@router.get("/photos/{category}", response_model=schemas.Page[schemas.AdminPhoto])
+async def read_all_photos(
     category: str,
+    page: PageParams = Depends(page_params),
     admin_service: AdminService = Depends(get_admin_service)
 ):
-    photos = admin_service.get_all_photos(category=category)
+    photos = await admin_service.get_all_photos(category=category, page=page)
     if photos is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -60,15 +74,39 @@ def read_all_photos(
     return photos
 
 @router.delete("/photos/{category}/{photo_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_photo(
+async def delete_photo(
     category: str,
     photo_id: int,
     admin_service: AdminService = Depends(get_admin_service)
 ):
-    success = admin_service.delete_photo(category=category, photo_id=photo_id)
+    success = await admin_service.delete_photo(category=category, photo_id=photo_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Photo with id {photo_id} in category '{category}' not found.",
         )
     return
+
+@router.get("/stats")
+def read_stats():
+    """
+    프로세스 내부 캐시와 중복 호출 병합(single-flight) 통계를 반환합니다.
+    """
+    return {
+        "tryon_result_cache": tryon_result_cache.stats(),
+        "normalized_image_cache": normalized_image_cache.stats(),
+        "image_disk_cache": image_disk_cache.stats(),
+        "tryon_singleflight": tryon_flight.stats(),
+        "image_download_singleflight": image_download_flight.stats(),
+        "auth_token_cache": token_claims_cache.stats(),
+        "auth_user_cache": user_principal_cache.stats(),
+        "google_oidc_metadata": google_oauth_client.stats(),
+        "shop_catalog": shop_catalog.stats(),
+        "tryon_jobs": tryon_job_manager.stats(),
+        "vton_admission": vton_limiter.stats(),
+        "tryon_user_rate_limit": tryon_user_buckets.stats(),
+        "vertex_ai_resilience": vton_resilience.stats(),
+        "vton_engines": vton_engines.stats(),
+        "storage_resilience": storage_resilience.stats(),
+        "trace_exporter": trace_exporter.stats(),
+    }
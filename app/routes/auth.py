@@ -1,30 +1,33 @@
 from fastapi import APIRouter, Depends, Request, HTTPException
 from fastapi.responses import RedirectResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 from typing import Optional
 
-from app.database import get_db
+from app.database import DbSession, get_db
 from app.repositories.user_repository import UserRepository
 from app.services.auth_service import AuthService
+from app.utils.oauth_client import GoogleOAuthClient, get_google_oauth_client
 from app import schemas
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 # Dependency for AuthService
-def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
+def get_auth_service(
+    db: DbSession = Depends(get_db),
+    oauth_client: GoogleOAuthClient = Depends(get_google_oauth_client)
+) -> AuthService:
     user_repo = UserRepository(db)
-    return AuthService(user_repo)
+    return AuthService(user_repo, oauth_client)
 
 @router.post("/token", response_model=schemas.Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), 
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """
     Admin login endpoint. Delegates to AuthService to authenticate and get JWT token.
     """
-    return auth_service.admin_login(form_data)
+    return await auth_service.admin_login(form_data)
 
 
 @router.get('/google/login')
@@ -1,11 +1,15 @@
-from typing import List
+import os
 from enum import Enum
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import RedirectResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse, RedirectResponse
 
 from app.services.image_service import ImageService, get_image_service
+from app.repositories.image_repository import CATEGORY_BUCKETS
 from app.utils.security import get_current_user
-from app import models, schemas
+from app.utils.auth_cache import UserPrincipal
+from app.utils.pagination import PageParams, page_params
+from app.utils.http_cache import etag_matches, immutable_headers, immutable_not_modified
+from app import schemas
 
 router = APIRouter(
     prefix="/images",
@@ -17,54 +21,81 @@ class ImageCategory(str, Enum):
     persons = "persons"
     results = "results"
 
-@router.get("/shop-clothes", response_model=List[schemas.Photo])
-async def get_shop_clothes_list(image_service: ImageService = Depends(get_image_service)):
+@router.get("/shop-clothes", response_model=schemas.Page[schemas.Photo])
+async def get_shop_clothes_list(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    image_service: ImageService = Depends(get_image_service)
+):
     """
     상점(Shop)의 'clothes' 이미지 파일 목록을 반환합니다.
+    메모리의 카탈로그 스냅샷에서 미리 직렬화된 JSON을 그대로 응답하고, ETag가 같으면 304를 반환합니다.
     """
-    images = image_service.get_shop_cloth_list()
-    if not images:
+    catalog_page = await image_service.get_shop_cloth_list(page)
+    if catalog_page.empty and page.after is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No shop clothes found.",
         )
-    return images
+    headers = {"ETag": catalog_page.etag}
+    if etag_matches(request, catalog_page.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=catalog_page.body, media_type="application/json", headers=headers)
 
-@router.get("/my-clothes", response_model=List[schemas.Photo])
+@router.get("/my-clothes", response_model=schemas.Page[schemas.Photo])
 async def get_my_clothes_list(
-    current_user: models.User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    current_user: UserPrincipal = Depends(get_current_user),
     image_service: ImageService = Depends(get_image_service)
 ):
     """
     현재 로그인된 사용자의 'clothes' 이미지 파일 목록을 반환합니다.
+    목록이 바뀌지 않았으면(If-None-Match 일치) 304를 반환합니다.
     """
-    images = image_service.get_cloth_list_by_user_id(current_user.id)
+    validator = await image_service.get_list_validator("clothes", current_user.id)
+    not_modified = validator.not_modified(request)
+    if not_modified:
+        return not_modified
+    images = await image_service.get_cloth_list_by_user_id(current_user.id, page)
     if images is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No clothes found for the current user.",
         )
+    validator.apply(response)
     return images
 
-@router.get("/persons", response_model=List[schemas.Photo])
+@router.get("/persons", response_model=schemas.Page[schemas.Photo])
 async def get_person_images_list(
-    current_user: models.User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    current_user: UserPrincipal = Depends(get_current_user),
     image_service: ImageService = Depends(get_image_service)
 ):
     """
     현재 로그인된 사용자의 'persons' 이미지 파일 목록을 반환합니다.
+    목록이 바뀌지 않았으면(If-None-Match 일치) 304를 반환합니다.
     """
-    images = image_service.get_image_list_by_user_id(current_user.id)
+    validator = await image_service.get_list_validator("persons", current_user.id)
+    not_modified = validator.not_modified(request)
+    if not_modified:
+        return not_modified
+    images = await image_service.get_image_list_by_user_id(current_user.id, page)
     if images is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No images found for the current user.",
         )
+    validator.apply(response)
     return images
 
-@router.get("/{category}", response_model=List[schemas.Photo])
+@router.get("/{category}", response_model=schemas.Page[schemas.Photo])
 async def get_public_images_list(
     category: ImageCategory,
+    page: PageParams = Depends(page_params),
     image_service: ImageService = Depends(get_image_service)
 ):
     """
@@ -75,11 +106,8 @@ async def get_public_images_list(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Access to person images requires authentication. Please use the /images/persons endpoint.",
         )
-    
-    # Note: This endpoint might be problematic if it returns objects without 'image_url' set 
-    # because get_all_photos_by_category just returns DB models.
-    # For now we leave it as is, but ideally, it should also enrich with URLs.
-    images = image_service.get_image_list_by_category(category.value)
+
+    images = await image_service.get_image_list_by_category(category.value, page)
     if images is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -89,24 +117,29 @@ async def get_public_images_list(
 
 @router.get("/{category}/{image_name}")
 async def get_image(
+    request: Request,
     category: ImageCategory,
     image_name: str,
     image_service: ImageService = Depends(get_image_service)
 ):
     """
     지정된 카테고리에서 특정 이름의 이미지 파일을 반환합니다.
+    저장 파일은 내용이 바뀌지 않으므로 브라우저/CDN이 오래 캐시하도록 immutable 헤더를 붙입니다.
     """
-    # Mapping category to bucket name
-    bucket_map = {
-        "clothes": "cloth_photo",
-        "persons": "person_photo",
-        "results": "result_photo"
-    }
-    bucket = bucket_map.get(category.value)
+    bucket = CATEGORY_BUCKETS.get(category.value)
     
     if not bucket:
          raise HTTPException(status_code=400, detail="Invalid category")
 
+    # 로컬 저장소는 이 경로가 곧 공개 URL이므로 파일을 직접 응답합니다.
+    local_path = image_service.image_repo.get_local_path(bucket, image_name)
+    if local_path:
+        if not os.path.isfile(local_path):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found.")
+        return immutable_not_modified(request, bucket, image_name) or FileResponse(
+            local_path, headers=immutable_headers(bucket, image_name)
+        )
+
     url = image_service.image_repo.get_public_url(bucket, image_name)
 
     if not url:
@@ -115,4 +148,6 @@ async def get_image(
             detail="Image not found or invalid name.",
         )
     
-    return RedirectResponse(url)
\ No newline at end of file
+    return immutable_not_modified(request, bucket, image_name) or RedirectResponse(
+        url, headers=immutable_headers(bucket, image_name)
+    )
\ No newline at end of file
@@ -1,38 +1,60 @@
 # app/routes/result.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from fastapi.responses import RedirectResponse
-from app.database import get_db
+import os
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse, RedirectResponse
+from app.database import DbSession, get_db
 from app.services.result_service import ResultService
 from app.repositories.result_repository import ResultRepository
 from app.repositories.image_repository import ImageRepository
 from app.utils.security import get_current_user
-from app import models
+from app.utils.auth_cache import UserPrincipal
+from app.utils.pagination import PageParams, page_params
+from app.utils.http_cache import immutable_headers, immutable_not_modified
 
 router = APIRouter(prefix="/results", tags=["results"])
 
 # Dependency for ResultService
-def get_result_service(db: Session = Depends(get_db)) -> ResultService:
+def get_result_service(db: DbSession = Depends(get_db)) -> ResultService:
     result_repo = ResultRepository(db)
     image_repo = ImageRepository(db)
     return ResultService(result_repo, image_repo)
 
 # 개별 이미지 (Redirect to Supabase)
 @router.get("/image/{filename}")
-def get_result_image(filename: str, service: ResultService = Depends(get_result_service)):
+def get_result_image(request: Request, filename: str, service: ResultService = Depends(get_result_service)):
+    # 결과 파일명은 uuid 기반이라 내용이 바뀌지 않으므로 immutable 캐시 헤더를 붙입니다.
+    local_path = service.image_repo.get_local_path("result_photo", filename)
+    if local_path:
+        if not os.path.isfile(local_path):
+            raise HTTPException(status_code=404, detail="Image not found")
+        return immutable_not_modified(request, "result_photo", filename) or FileResponse(
+            local_path, headers=immutable_headers("result_photo", filename)
+        )
     url = service.image_repo.get_public_url("result_photo", filename)
     if not url:
         raise HTTPException(status_code=404, detail="Image not found")
-    return RedirectResponse(url)
+    return immutable_not_modified(request, "result_photo", filename) or RedirectResponse(
+        url, headers=immutable_headers("result_photo", filename)
+    )
 
 # 모든 결과 리스트 조회
 @router.get("/{user_id}")
 async def list_results(
+    request: Request,
+    response: Response,
     user_id: int,
+    page: PageParams = Depends(page_params),
     result_service: ResultService = Depends(get_result_service),
-    current_user: models.User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     if user_id != current_user.id and not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not authorized to view these results")
         
-    return result_service.get_user_results(user_id)
+    # 결과 목록이 바뀌지 않았으면(If-None-Match 일치) 304를 반환합니다.
+    validator = await result_service.get_results_validator(user_id)
+    not_modified = validator.not_modified(request)
+    if not_modified:
+        return not_modified
+    results = await result_service.get_user_results(user_id, page)
+    validator.apply(response)
+    return results
@@ -1,52 +1,152 @@
 # app/routes/tryon.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from app.database import get_db
-from app.services.tryon_service import TryonService, PhotoNotFoundError, VtonProcessingError
-from app.repositories.photo_repository import PhotoRepository
-from app.repositories.result_repository import ResultRepository
-from app.repositories.image_repository import ImageRepository
-from app.repositories.upload_repository import UploadRepository
+import json
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from app.config import settings
+from app.services.tryon_service import PhotoNotFoundError, VtonProcessingError
+from app.services.tryon_job_service import TryonJobManager, TryonJob, get_tryon_job_manager
+from app.services.tryon_batch_service import TryonBatchService, get_tryon_batch_service
 from app.utils.security import get_current_user
-from app import models
+from app.utils.auth_cache import UserPrincipal
+from app.utils.admission import AdmissionRejectedError
+from app.utils.resilience import CircuitOpenError
 
 router = APIRouter(prefix="/tryon", tags=["tryon"])
 
-# Dependency for TryonService
-def get_tryon_service(db: Session = Depends(get_db)) -> TryonService:
-    photo_repo = PhotoRepository(db)
-    result_repo = ResultRepository(db)
-    image_repo = ImageRepository(db)
-    upload_repo = UploadRepository(db)
-    return TryonService(photo_repo, result_repo, image_repo, upload_repo)
-
 class TryonRequest(BaseModel):
     user_id: int
     person_photo_id: int
     cloth_photo_id: int
 
+class TryonBatchRequest(BaseModel):
+    person_photo_id: int
+    cloth_photo_ids: List[int] = Field(min_length=1, max_length=settings.TRYON_BATCH_MAX_ITEMS)
+
+def _serialize_job(job: TryonJob) -> dict:
+    result = job.result or {}
+    return {
+        "job_id": job.id,
+        "status": job.status.value,
+        "result_id": result.get("id"),
+        "result_filename": result.get("filename"),
+        "result_url": result.get("image_url"),
+        "error": job.error,
+    }
+
+def _too_many_requests(e: AdmissionRejectedError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(e),
+        headers={"Retry-After": e.retry_after_header},
+    )
+
+def _service_unavailable(e: CircuitOpenError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": e.retry_after_header},
+    )
+
+async def _submit_job(req: TryonRequest, user_id: int, job_manager: TryonJobManager) -> TryonJob:
+    try:
+        job_manager.admit_user(user_id)
+        return await job_manager.submit(
+            user_id=user_id,
+            person_photo_id=req.person_photo_id,
+            cloth_photo_id=req.cloth_photo_id
+        )
+    except AdmissionRejectedError as e:
+        raise _too_many_requests(e)
+
 @router.post("")
 async def tryon(
     req: TryonRequest,
-    tryon_service: TryonService = Depends(get_tryon_service),
-    current_user: models.User = Depends(get_current_user)
+    job_manager: TryonJobManager = Depends(get_tryon_job_manager),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
+    job = await _submit_job(req, current_user.id, job_manager)
     try:
-        result_data = await tryon_service.create_tryon_result(
-            user_id=current_user.id,
-            person_photo_id=req.person_photo_id,
-            cloth_photo_id=req.cloth_photo_id
-        )
+        result_data = await job_manager.wait(job)
         return {
             "message": "합성 완료",
             "result_id": result_data["id"],
             "result_filename": result_data["filename"],
             "result_url": result_data["image_url"] # Include the generated image URL
         }
+    except AdmissionRejectedError as e:
+        raise _too_many_requests(e)
+    except CircuitOpenError as e:
+        raise _service_unavailable(e)
     except PhotoNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except VtonProcessingError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"가상 피팅 처리 중 오류 발생: {e}")
+
+@router.post("/batch")
+async def tryon_batch(
+    req: TryonBatchRequest,
+    request: Request,
+    batch_service: TryonBatchService = Depends(get_tryon_batch_service),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    사람 사진 한 장에 여러 옷 사진을 입혀 보고, 각 결과를 완료되는 순서대로 스트리밍합니다.
+    기본은 NDJSON(한 줄에 결과 하나)이며, Accept: text/event-stream이면 Server-Sent Events로 응답합니다.
+    마지막에는 {"done": true, ...} 요약을 보냅니다.
+    """
+    try:
+        batch_service.job_manager.admit_user(current_user.id, cost=len(req.cloth_photo_ids))
+        await batch_service.prepare(current_user.id, req.person_photo_id)
+    except AdmissionRejectedError as e:
+        raise _too_many_requests(e)
+    except CircuitOpenError as e:
+        raise _service_unavailable(e)
+    except PhotoNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except VtonProcessingError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    items = batch_service.stream(current_user.id, req.person_photo_id, req.cloth_photo_ids)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"} # 프록시가 버퍼링하지 않도록
+
+    if "text/event-stream" in request.headers.get("accept", ""):
+        async def sse():
+            async for item in items:
+                event = "done" if item.get("done") else "result"
+                yield f"event: {event}\ndata: {json.dumps(item, ensure_ascii=False)}\n\n"
+        return StreamingResponse(sse(), media_type="text/event-stream", headers=headers)
+
+    async def ndjson():
+        async for item in items:
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson", headers=headers)
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_tryon_job(
+    req: TryonRequest,
+    job_manager: TryonJobManager = Depends(get_tryon_job_manager),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    가상 피팅 작업을 등록하고 작업 ID를 즉시 반환합니다.
+    """
+    job = await _submit_job(req, current_user.id, job_manager)
+    return _serialize_job(job)
+
+@router.get("/jobs/{job_id}")
+async def get_tryon_job(
+    job_id: str,
+    job_manager: TryonJobManager = Depends(get_tryon_job_manager),
+    current_user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    가상 피팅 작업의 상태와 결과 URL을 반환합니다.
+    """
+    job = job_manager.get(job_id)
+    if not job or (job.user_id != current_user.id and not current_user.is_superuser):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return _serialize_job(job)
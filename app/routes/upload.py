@@ -1,18 +1,18 @@
 # app/routes/upload.py
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 import os
-from app.services.upload_service import UploadService, InvalidImageFileError, ImageProcessingError
+from app.services.upload_service import UploadService, InvalidImageFileError, ImageProcessingError, FileTooLargeError
 from app.repositories.upload_repository import UploadRepository
-from app.database import get_db
-from sqlalchemy.orm import Session
+from app.database import DbSession, get_db
 from app.utils.security import get_current_user
-from app import models
+from app.utils.auth_cache import UserPrincipal
+from app.utils.resilience import CircuitOpenError
 
 #라우터 기본 설정
 router = APIRouter(prefix="/upload", tags=["upload"])
 
 # Dependency for UploadService
-def get_upload_service(db: Session = Depends(get_db)) -> UploadService:
+def get_upload_service(db: DbSession = Depends(get_db)) -> UploadService:
     upload_repo = UploadRepository(db)
     return UploadService(upload_repo)
 
@@ -21,7 +21,7 @@ def get_upload_service(db: Session = Depends(get_db)) -> UploadService:
 async def upload_person( # 비동기 엔드포인트
     file: UploadFile = File(...), # UploadFile 설명: .filename .content_type .read() 사용가능
     upload_service: UploadService = Depends(get_upload_service),
-    current_user: models.User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     try:
         new_photo = await upload_service.upload_person_photo(file=file, user_id=current_user.id)
@@ -30,6 +30,10 @@ async def upload_person( # 비동기 엔드포인트
         raise HTTPException(status_code=400, detail=str(e))
     except ImageProcessingError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": e.retry_after_header})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파일 업로드 중 오류 발생: {e}")
 
@@ -38,7 +42,7 @@ async def upload_person( # 비동기 엔드포인트
 async def upload_cloth(
     file: UploadFile = File(...),
     upload_service: UploadService = Depends(get_upload_service),
-    current_user: models.User = Depends(get_current_user)
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     try:
         new_cloth = await upload_service.upload_cloth_photo(file=file, user_id=current_user.id, fitting_type="upper") # TODO: 나중에 자동/선택 로직
@@ -47,5 +51,9 @@ async def upload_cloth(
         raise HTTPException(status_code=400, detail=str(e))
     except ImageProcessingError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": e.retry_after_header})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파일 업로드 중 오류 발생: {e}")
@@ -1,16 +1,13 @@
 from fastapi import APIRouter, Depends
-from app import models, schemas
+from app import schemas
 from app.utils.security import get_current_user
-from app.services.user_service import UserService, get_user_service
+from app.utils.auth_cache import UserPrincipal
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/me", response_model=schemas.User)
 async def read_users_me(
-    current_user: models.User = Depends(get_current_user),
-    user_service: UserService = Depends(get_user_service)
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
-    # Although current_user is already fetched, we call the service
-    # to maintain a consistent architectural pattern.
-    # The service could add more business logic here in the future.
-    return user_service.get_user_by_id(current_user.id)
+    # get_current_user가 이미 (캐시된) 사용자 정보를 조회했으므로 DB를 다시 조회하지 않습니다.
+    return current_user
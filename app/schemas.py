@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
 
 # Base schema for a User
 class UserBase(BaseModel):
@@ -36,6 +38,7 @@ class User(UserBase):
 class Photo(BaseModel):
     id: int
     image_url: str
+    thumbnail_urls: Optional[Dict[int, str]] = None # 가로 폭(px)별 WebP 썸네일, srcset용
     fitting_type: Optional[str] = None
     #filename: str
     #user_id: int
@@ -45,6 +48,17 @@ class Photo(BaseModel):
     class Config:
         from_attributes = True
 
+# Schema for admin photo listings (includes owner and stored filename)
+class AdminPhoto(Photo):
+    filename: str
+    user_id: int
+
+# Generic schema for one page of a cursor-paginated list
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None # 다음 페이지 요청 시 cursor로 전달, 마지막 페이지이면 None
+    limit: int
+
 # Schema for JWT token
 class Token(BaseModel):
     access_token: str
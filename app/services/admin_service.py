@@ -1,81 +1,91 @@
-import os
-from sqlalchemy.orm import Session
+import logging
 from fastapi import Depends
-from typing import List, Optional, Type
+from typing import Any, Dict, Optional
 
 from app import models, schemas
-from app.database import get_db
+from app.database import DbSession, get_db
 from app.repositories.user_repository import UserRepository
-from app.repositories.image_repository import ImageRepository, CATEGORY_DIRS
+from app.repositories.image_repository import ImageRepository, CATEGORY_BUCKETS
+from app.utils.auth_cache import user_principal_cache
+from app.utils.pagination import PageParams
+from app.utils.shop_catalog import shop_catalog
+from app.config import settings
 
 class AdminService:
     def __init__(self, user_repo: UserRepository, image_repo: ImageRepository):
         self.user_repo = user_repo
         self.image_repo = image_repo
 
-    def get_all_users(self, skip: int = 0, limit: int = 100) -> List[schemas.User]:
+    async def get_all_users(self, page: PageParams) -> Dict[str, Any]:
         """
-        모든 사용자 목록을 가져오는 서비스 함수입니다.
+        모든 사용자 목록을 한 페이지씩 가져오는 서비스 함수입니다.
         """
-        return self.user_repo.get_all_users(skip=skip, limit=limit)
+        users = await self.user_repo.get_all_users(page)
+        return users.to_response(users.items, page)
 
-    def update_user(self, user_id: int, user_update: schemas.AdminUserUpdate) -> schemas.User | None:
+    async def update_user(self, user_id: int, user_update: schemas.AdminUserUpdate) -> schemas.User | None:
         """
         사용자 정보를 업데이트하는 서비스 함수입니다.
         """
-        return self.user_repo.update_user_details(user_id=user_id, user_update=user_update)
+        updated_user = await self.user_repo.update_user_details(user_id=user_id, user_update=user_update)
+        # 비활성화/권한 변경이 다음 요청부터 바로 적용되도록 캐시된 사용자 정보를 지웁니다.
+        user_principal_cache.invalidate(user_id)
+        return updated_user
 
-    def get_all_photos(self, category: str) -> Optional[List[schemas.Photo]]:
+    async def get_all_photos(self, category: str, page: PageParams) -> Optional[Dict[str, Any]]:
         """
-        카테고리별 모든 사진 레코드를 가져오는 서비스 함수입니다.
+        카테고리별 사진 레코드를 한 페이지씩 가져오는 서비스 함수입니다.
         """
-        return self.image_repo.get_all_photos_by_category(category)
+        photos = await self.image_repo.get_all_photos_by_category(category, page)
+        if photos is None:
+            return None
+        return photos.to_response(self.image_repo.serialize_photos(CATEGORY_BUCKETS[category], photos.items), page)
 
-    def delete_photo(self, category: str, photo_id: int) -> bool:
+    async def delete_photo(self, category: str, photo_id: int) -> bool:
         """
-        사진을 DB와 파일 시스템에서 모두 삭제하는 서비스 함수입니다.
+        사진을 DB와 저장소에서 모두 삭제하는 서비스 함수입니다.
         """
-        deleted_photo_record = self.image_repo.delete_photo_by_id(category, photo_id)
+        deleted_photo_record = await self.image_repo.delete_photo_by_id(category, photo_id)
         
         if not deleted_photo_record:
             return False
+        if category == "clothes" and deleted_photo_record.user_id == settings.SHOP_USER_ID:
+            shop_catalog.invalidate()
 
         try:
-            directory = CATEGORY_DIRS.get(category)
-            if directory:
-                file_path = os.path.join(directory, deleted_photo_record.filename)
-                if os.path.exists(file_path):
-                    os.remove(file_path)
+            bucket = CATEGORY_BUCKETS.get(category)
+            if bucket:
+                await self.image_repo.delete_image_files(bucket, [deleted_photo_record.filename])
             return True
         except Exception as e:
-            print(f"Error deleting file for photo ID {photo_id}: {e}")
+            logging.error(f"Error deleting file for photo ID {photo_id}: {e}")
             return True
 
-    def delete_user_account(self, user_id: int) -> bool:
+    async def delete_user_account(self, user_id: int) -> bool:
         """
         사용자 계정과 관련된 모든 데이터(파일, DB 레코드)를 삭제합니다.
         """
-        user_to_delete = self.user_repo.get_by_id(user_id)
+        user_to_delete = await self.user_repo.get_by_id(user_id)
         if not user_to_delete:
             return False
 
-        all_photos = self.image_repo.get_all_photos_for_user(user_id)
+        all_photos = await self.image_repo.get_all_photos_for_user(user_id)
         for category, photo_list in all_photos.items():
-            directory = CATEGORY_DIRS.get(category)
-            if not directory:
+            bucket = CATEGORY_BUCKETS.get(category)
+            if not bucket or not photo_list:
                 continue
-            for photo in photo_list:
-                try:
-                    file_path = os.path.join(directory, photo.filename)
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                except Exception as e:
-                    print(f"Error deleting file {file_path}: {e}")
+            try:
+                await self.image_repo.delete_image_files(bucket, [photo.filename for photo in photo_list])
+            except Exception as e:
+                logging.error(f"Error deleting files in {bucket} for user {user_id}: {e}")
 
-        self.user_repo.delete_user(user_id)
+        await self.user_repo.delete_user(user_id)
+        user_principal_cache.invalidate(user_id)
+        if user_id == settings.SHOP_USER_ID:
+            shop_catalog.invalidate()
         return True
 
-def get_admin_service(db: Session = Depends(get_db)) -> AdminService:
+def get_admin_service(db: DbSession = Depends(get_db)) -> AdminService:
     user_repo = UserRepository(db)
     image_repo = ImageRepository(db)
     return AdminService(user_repo, image_repo)
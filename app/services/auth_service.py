@@ -2,35 +2,24 @@
 import base64
 import json
 import secrets
-from sqlalchemy.orm import Session
 from fastapi import HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from authlib.integrations.starlette_client import OAuth
 from datetime import timedelta
 from typing import Optional
 
 from app.config import settings
 from app.repositories.user_repository import UserRepository
 from app.utils.security import create_access_token
+from app.utils.auth_cache import user_principal_cache
+from app.utils.oauth_client import GoogleOAuthClient
 from app import schemas
 
 class AuthService:
-    def __init__(self, user_repo: UserRepository):
+    def __init__(self, user_repo: UserRepository, oauth_client: GoogleOAuthClient):
         self.user_repo = user_repo
-        self.oauth = self._configure_oauth()
+        self.oauth_client = oauth_client
 
-    def _configure_oauth(self):
-        oauth = OAuth()
-        oauth.register(
-            name='google',
-            client_id=settings.GOOGLE_CLIENT_ID,
-            client_secret=settings.GOOGLE_CLIENT_SECRET,
-            server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-            client_kwargs={'scope': 'openid email profile'}
-        )
-        return oauth
-
-    def admin_login(self, form_data: OAuth2PasswordRequestForm) -> schemas.Token:
+    async def admin_login(self, form_data: OAuth2PasswordRequestForm) -> schemas.Token:
         if not (form_data.username == settings.ADMIN_USERNAME and form_data.password == settings.ADMIN_PASSWORD):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -38,7 +27,7 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        user = self.user_repo.get_by_email(email=form_data.username)
+        user = await self.user_repo.get_by_email(email=form_data.username)
         if not user or not user.is_superuser:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -72,11 +61,13 @@ class AuthService:
         state = self._encode_state(state_data)
         
         callback_uri = request.url_for('auth_via_google')
-        return await self.oauth.google.authorize_redirect(request, callback_uri, state=state)
+        google = await self.oauth_client.get_client()
+        return await google.authorize_redirect(request, callback_uri, state=state)
 
     async def handle_google_callback(self, request: Request) -> tuple[str, str]:
         try:
-            token = await self.oauth.google.authorize_access_token(request)
+            google = await self.oauth_client.get_client()
+            token = await google.authorize_access_token(request)
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Authentication failed")
 
@@ -84,12 +75,13 @@ class AuthService:
         if not user_info:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User info missing")
 
-        user = self.user_repo.create_or_update_google_user(
+        user = await self.user_repo.create_or_update_google_user(
             google_id=user_info['sub'],
             email=user_info['email'],
             name=user_info['name'],
             profile_image=user_info['picture']
         )
+        user_principal_cache.invalidate(user.id)
 
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
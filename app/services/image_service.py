@@ -1,12 +1,12 @@
-from typing import List, Optional, Type, Dict, Any
-from sqlalchemy.orm import Session
+from typing import List, Optional, Dict, Any
 from fastapi import Depends
 
-from app.models import Base
-from app import schemas
-from app.database import get_db
-from app.repositories.image_repository import ImageRepository
+from app.database import DbSession, get_db
+from app.repositories.image_repository import ImageRepository, CATEGORY_BUCKETS
 from app.repositories.photo_repository import PhotoRepository
+from app.utils.pagination import PageParams
+from app.utils.shop_catalog import CatalogPage, shop_catalog
+from app.utils.http_cache import ListValidator
 from app.config import settings
 
 class ImageService:
@@ -14,62 +14,55 @@ class ImageService:
         self.image_repo = image_repo
         self.photo_repo = photo_repo
 
-    def get_shop_cloth_list(self) -> List[Dict[str,Any]]:
+    async def get_shop_cloth_list(self, page: PageParams) -> CatalogPage:
         """
-        상점(SHOP_USER_ID)의 'cloth' 이미지 객체 목록을 가져오는 서비스 함수입니다.
+        상점(SHOP_USER_ID)의 'cloth' 이미지 목록 한 페이지를 직렬화된 JSON으로 가져오는 서비스 함수입니다.
         """
-        admin_id = 1
-        return self.get_cloth_list_by_user_id(admin_id)
+        snapshot = await shop_catalog.get_snapshot(self._load_shop_catalog)
+        return snapshot.page(page)
 
-    def get_cloth_list_by_user_id(self, user_id: int) -> List[Dict[str, Any]]:
+    async def _load_shop_catalog(self) -> List[Dict[str, Any]]:
+        photos = await self.image_repo.get_shop_cloth_photos()
+        return self.image_repo.serialize_photos("cloth_photo", photos)
+
+    async def get_cloth_list_by_user_id(self, user_id: int, page: PageParams) -> Dict[str, Any]:
+        """
+        특정 사용자의 'cloth' 이미지 객체 목록을 한 페이지씩 가져오는 서비스 함수입니다.
+        """
+        photos = await self.photo_repo.get_all_cloth_photos_by_user_id(user_id, page)
+        # 🟢 [핵심] 옷 사진은 'cloth_photo' 버킷에서 URL 생성
+        return photos.to_response(self.image_repo.serialize_photos("cloth_photo", photos.items), page)
+
+    async def get_image_list_by_user_id(self, user_id: int, page: PageParams) -> Dict[str, Any]:
         """
-        특정 사용자의 'cloth' 이미지 객체 목록을 가져오는 서비스 함수입니다.
+        특정 사용자의 'person' 이미지 객체 목록을 한 페이지씩 가져오는 서비스 함수입니다.
         """
-        photos = self.photo_repo.get_all_cloth_photos_by_user_id(user_id)
-        result = []
-        for photo in photos:
-            # 🟢 [핵심] 옷 사진은 'cloth_photo' 버킷에서 URL 생성
-            url = self.image_repo.get_public_url("cloth_photo", photo.filename)
-            
-            result.append({
-                "id": photo.id,
-                "image_url": url,  # 프론트엔드가 사용할 이미지 주소
-                "fitting_type": photo.fitting_type
-            })
-        return result
-        
+        photos = await self.photo_repo.get_all_by_user_id(user_id, page)
+        # 🟢 [핵심] 전신 사진은 'person_photo' 버킷에서 URL 생성
+        return photos.to_response(self.image_repo.serialize_photos("person_photo", photos.items), page)
 
-    def get_image_list_by_user_id(self, user_id: int) -> List[Dict[str, Any]]:
+    async def get_image_list_by_category(self, category: str, page: PageParams) -> Optional[Dict[str, Any]]:
         """
-        특정 사용자의 'person' 이미지 객체 목록을 가져오는 서비스 함수입니다.
+        카테고리별 이미지 객체 목록을 한 페이지씩 가져오는 서비스 함수입니다.
         """
-        photos = self.photo_repo.get_all_by_user_id(user_id)
-        
-        result = []
-        for photo in photos:
-            # 🟢 [핵심] 전신 사진은 'person_photo' 버킷에서 URL 생성
-            url = self.image_repo.get_public_url("person_photo", photo.filename)
-            
-            result.append({
-                "id": photo.id,
-                "image_url": url,
-                "uploaded_at": photo.uploaded_at
-            })
-        return result
+        photos = await self.image_repo.get_all_photos_by_category(category, page)
+        if photos is None:
+            return None
+        return photos.to_response(self.image_repo.serialize_photos(CATEGORY_BUCKETS[category], photos.items), page)
 
-    def get_image_list_by_category(self, category: str) -> Optional[List[schemas.Photo]]:
+    async def get_list_validator(self, category: str, user_id: int) -> Optional[ListValidator]:
         """
-        카테고리별 이미지 객체 목록을 가져오는 서비스 함수입니다.
+        사용자의 카테고리별 목록에 대한 조건부 요청 검증자를 가져오는 서비스 함수입니다.
         """
-        return self.image_repo.get_all_photos_by_category(category)
+        return await self.image_repo.get_list_validator(category, user_id)
 
-    def get_image_file_path(self, category: str, image_name: str) -> Optional[str]:
+    async def get_image_file_path(self, category: str, image_name: str) -> Optional[str]:
         """
         특정 이미지의 전체 파일 경로를 가져오는 서비스 함수입니다.
         """
-        return self.image_repo.get_image_path(category=category, image_name=image_name)
+        return await self.image_repo.get_image_path(category=category, image_name=image_name)
 
-def get_image_service(db: Session = Depends(get_db)) -> ImageService:
+def get_image_service(db: DbSession = Depends(get_db)) -> ImageService:
     image_repo = ImageRepository(db)
     photo_repo = PhotoRepository(db)
-    return ImageService(image_repo, photo_repo)
\ No newline at end of file
+    return ImageService(image_repo, photo_repo)
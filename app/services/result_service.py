@@ -1,18 +1,23 @@
-from typing import List, Dict, Any
+from typing import Dict, Any
 from app.repositories.result_repository import ResultRepository
 from app.repositories.image_repository import ImageRepository
 from app import models, schemas
+from app.utils.pagination import PageParams
+from app.utils.http_cache import ListValidator
 
 class ResultService:
     def __init__(self, result_repo: ResultRepository, image_repo: ImageRepository):
         self.result_repo = result_repo
         self.image_repo = image_repo
 
-    def get_user_results(self, user_id: int) -> List[Dict[str, Any]]:
-        results = self.result_repo.get_results_by_user_id(user_id)
+    async def get_results_validator(self, user_id: int) -> ListValidator:
+        return await self.image_repo.get_list_validator("results", user_id)
+
+    async def get_user_results(self, user_id: int, page: PageParams) -> Dict[str, Any]:
+        results = await self.result_repo.get_results_by_user_id(user_id, page)
+        urls = self.image_repo.get_public_urls("result_photo", [result.filename for result in results.items])
         output = []
-        for result in results:
-            url = self.image_repo.get_public_url("result_photo", result.filename)
+        for result, url in zip(results.items, urls):
             output.append({
                 "id": result.id,
                 "filename": result.filename,
@@ -20,5 +25,6 @@ class ResultService:
                 "cloth_photo_id": result.cloth_photo_id,
                 "created_at": result.created_at,
                 "image_url": url,
+                "thumbnail_urls": self.image_repo.get_thumbnail_urls("result_photo", result.filename, result.thumbnail_widths),
             })
-        return output
+        return results.to_response(output, page)
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from typing import BinaryIO, Dict, Iterable, List
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.repositories.upload_repository import UploadRepository
+from app.utils.image_processing import make_thumbnails, thumbnail_filename
+
+class ThumbnailService:
+    """
+    원본 이미지 옆에 목록 화면용 WebP 썸네일(settings.THUMBNAIL_WIDTHS)을 저장합니다.
+    썸네일은 부가 산출물이므로 실패해도 원본 업로드나 합성 결과는 실패시키지 않습니다.
+    """
+    def __init__(self, upload_repo: UploadRepository):
+        self.upload_repo = upload_repo
+
+    async def render(self, source: bytes | memoryview | BinaryIO) -> Dict[int, bytes]:
+        try:
+            return await run_in_threadpool(make_thumbnails, source, settings.THUMBNAIL_WIDTHS)
+        except Exception as e:
+            logging.warning(f"Failed to render thumbnails: {e}")
+            return {}
+
+    async def store(self, bucket: str, filename: str, thumbnails: Dict[int, bytes], upsert: bool = False) -> bool:
+        # 폭별 업로드는 서로 독립적이므로 동시에 보내 요청 경로의 왕복 횟수를 한 번으로 줄입니다.
+        try:
+            await asyncio.gather(*(
+                self.upload_repo.upload_file(
+                    bucket=bucket,
+                    path=thumbnail_filename(filename, width),
+                    file_content=data,
+                    content_type="image/webp",
+                    upsert=upsert,
+                )
+                for width, data in thumbnails.items()
+            ))
+            return bool(thumbnails)
+        except Exception as e:
+            logging.warning(f"Failed to store thumbnails for {bucket}/{filename}: {e}")
+            return False
+
+    async def create_thumbnails(self, bucket: str, filename: str, source: bytes | memoryview | BinaryIO, upsert: bool = False) -> List[int]:
+        """
+        썸네일을 만들어 저장하고 저장된 폭 목록을 반환합니다. 원본보다 좁아지지 않는 폭은 빠지며, 저장에 실패하면 빈 목록입니다.
+        """
+        thumbnails = await self.render(source)
+        if not await self.store(bucket, filename, thumbnails, upsert=upsert):
+            return []
+        return sorted(thumbnails)
+
+    async def copy_thumbnails(self, bucket: str, from_filename: str, to_filename: str, widths: Iterable[int]) -> bool:
+        try:
+            await asyncio.gather(*(
+                self.upload_repo.copy_file(
+                    bucket,
+                    thumbnail_filename(from_filename, width),
+                    thumbnail_filename(to_filename, width),
+                )
+                for width in widths
+            ))
+            return True
+        except Exception as e:
+            logging.warning(f"Failed to copy thumbnails {bucket}/{from_filename} -> {to_filename}: {e}")
+            return False
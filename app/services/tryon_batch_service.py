@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List
+
+from fastapi import Depends
+
+from app.config import settings
+from app.database import DbSession, get_db
+from app.services.tryon_job_service import TryonJobManager, get_tryon_job_manager
+from app.services.tryon_service import PhotoNotFoundError, TryonService, build_tryon_service
+from app.utils.admission import AdmissionRejectedError
+from app.utils.resilience import CircuitOpenError
+
+def _error_status(error: Exception) -> int:
+    # 단건 /tryon 엔드포인트와 같은 상태 코드를 항목별로 알려줍니다.
+    if isinstance(error, PhotoNotFoundError):
+        return 404
+    if isinstance(error, AdmissionRejectedError):
+        return 429
+    if isinstance(error, CircuitOpenError):
+        return 503
+    return 500
+
+class TryonBatchService:
+    """
+    사람 사진 한 장과 옷 사진 여러 장의 가상 피팅을 작업 큐에 나눠 올리고, 끝나는 순서대로 결과를 내보냅니다.
+    한 배치가 워커를 모두 차지하지 않도록 동시에 큐에 올리는 작업 수를 concurrency로 제한합니다.
+    """
+    def __init__(self, tryon_service: TryonService, job_manager: TryonJobManager, concurrency: int):
+        self.tryon_service = tryon_service
+        self.job_manager = job_manager
+        self.concurrency = concurrency
+
+    async def prepare(self, user_id: int, person_photo_id: int):
+        """
+        스트리밍을 시작하기 전에 사람 사진을 확인하고 한 번만 내려받아 둡니다.
+        """
+        await self.tryon_service.prepare_person_image(user_id, person_photo_id)
+
+    async def stream(self, user_id: int, person_photo_id: int, cloth_photo_ids: List[int]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        옷 사진별 결과를 완료되는 순서대로 내보냅니다. 한 항목이 실패해도 나머지는 계속 진행합니다.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run_one(index: int, cloth_photo_id: int) -> Dict[str, Any]:
+            item = {"index": index, "cloth_photo_id": cloth_photo_id}
+            async with semaphore:
+                try:
+                    job = await self.job_manager.submit(
+                        user_id=user_id,
+                        person_photo_id=person_photo_id,
+                        cloth_photo_id=cloth_photo_id,
+                    )
+                    result = await self.job_manager.wait(job)
+                except Exception as e:
+                    logging.warning(f"Batch try-on item {index} (cloth {cloth_photo_id}) failed: {e}")
+                    failed = {**item, "status": "failed", "status_code": _error_status(e), "error": str(e)}
+                    if isinstance(e, (AdmissionRejectedError, CircuitOpenError)):
+                        failed["retry_after"] = e.retry_after_header
+                    return failed
+            return {
+                **item,
+                "status": "succeeded",
+                "result_id": result["id"],
+                "result_filename": result["filename"],
+                "result_url": result["image_url"],
+            }
+
+        tasks = [asyncio.create_task(run_one(i, cloth_id)) for i, cloth_id in enumerate(cloth_photo_ids)]
+        succeeded = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                succeeded += item["status"] == "succeeded"
+                yield item
+        finally:
+            # 클라이언트 연결이 끊기면 아직 큐에 올리지 않은 항목은 취소합니다. (이미 실행 중인 작업은 끝까지 처리됩니다)
+            for task in tasks:
+                task.cancel()
+        yield {"done": True, "total": len(tasks), "succeeded": succeeded, "failed": len(tasks) - succeeded}
+
+def get_tryon_batch_service(
+    db: DbSession = Depends(get_db),
+    job_manager: TryonJobManager = Depends(get_tryon_job_manager),
+) -> TryonBatchService:
+    return TryonBatchService(build_tryon_service(db), job_manager, settings.TRYON_BATCH_CONCURRENCY)
@@ -0,0 +1,198 @@
+# app/services/tryon_job_service.py
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.services.tryon_service import create_tryon_result
+from app.services.vton_service import vton_engines
+from app.utils.admission import AdmissionRejectedError, UserTokenBuckets, tryon_user_buckets
+from app.utils.metrics import TRYON_STAGE_SECONDS
+from app.utils.tracing import SpanHandle, hold_current_span, record_span, resume_span
+
+# Custom Exceptions
+class JobQueueFullError(AdmissionRejectedError):
+    pass
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+@dataclass
+class TryonJob:
+    id: str
+    user_id: int
+    person_photo_id: int
+    cloth_photo_id: int
+    status: JobStatus = JobStatus.queued
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    # 작업을 등록한 요청의 trace, 워커에서 이어서 기록합니다.
+    trace: Optional[SpanHandle] = field(default=None, repr=False)
+    future: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future(), repr=False)
+
+class TryonJobManager:
+    """
+    가상 피팅 작업 큐와 고정 크기 워커 풀을 관리합니다.
+    작업 상태는 프로세스 메모리에 보관되므로 uvicorn 워커마다 독립적입니다.
+    """
+    def __init__(self, worker_count: int, queue_size: int, job_ttl_seconds: int, user_buckets: UserTokenBuckets):
+        self.worker_count = worker_count
+        self.job_ttl_seconds = job_ttl_seconds
+        self.user_buckets = user_buckets
+        self._queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._jobs: Dict[str, TryonJob] = {}
+        self._recent_queue_waits: deque[float] = deque(maxlen=512)
+        self.rejected = 0
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self):
+        if self.started:
+            return
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"tryon-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        # 아직 시작하지 못한 작업도 끝난 것으로 표시해 기다리는 요청과 상태 조회가 멈춰 있지 않도록 합니다.
+        while self._queue is not None and not self._queue.empty():
+            self._cancel_job(self._queue.get_nowait(), "서버가 종료되어 작업이 취소되었습니다.")
+        self._queue = None
+
+    def admit_user(self, user_id: int, cost: int = 1):
+        """
+        사용자별 토큰 버킷에서 요청 수만큼 토큰을 사용합니다. 부족하면 UserRateLimitedError(429)를 발생시킵니다.
+        """
+        self.user_buckets.take(user_id, cost)
+
+    async def submit(self, user_id: int, person_photo_id: int, cloth_photo_id: int) -> TryonJob:
+        """
+        작업을 큐에 등록하고 즉시 반환합니다. 큐가 가득 차면 JobQueueFullError를 발생시킵니다.
+        """
+        await self.start()
+        self._prune_expired()
+
+        job = TryonJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            person_photo_id=person_photo_id,
+            cloth_photo_id=cloth_photo_id,
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            limiter = vton_engines.primary.limiter
+            raise JobQueueFullError(
+                "가상 피팅 작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.",
+                retry_after=limiter.estimate_wait(self._queue.qsize() + limiter.waiting),
+            )
+        self._jobs[job.id] = job
+        job.trace = hold_current_span()
+        return job
+
+    def get(self, job_id: str) -> Optional[TryonJob]:
+        self._prune_expired()
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: TryonJob) -> Dict[str, Any]:
+        """
+        작업이 끝날 때까지 기다린 뒤 결과를 반환합니다. 실패한 작업은 원래 예외를 다시 발생시킵니다.
+        """
+        return await asyncio.shield(job.future)
+
+    def _prune_expired(self):
+        deadline = time.time() - self.job_ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < deadline
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: TryonJob):
+        job.status = JobStatus.running
+        job.started_at = time.time()
+        self._recent_queue_waits.append(job.started_at - job.created_at)
+        TRYON_STAGE_SECONDS.labels("queue").observe(job.started_at - job.created_at)
+        try:
+            with resume_span(job.trace, "tryon.job", **{"tryon.job_id": job.id}):
+                record_span("queue.wait", int(job.created_at * 1e9), int(job.started_at * 1e9))
+                result = await create_tryon_result(
+                    user_id=job.user_id,
+                    person_photo_id=job.person_photo_id,
+                    cloth_photo_id=job.cloth_photo_id,
+                )
+        except asyncio.CancelledError:
+            self._cancel_job(job, "작업이 취소되었습니다.")
+            raise
+        except Exception as e:
+            logging.error(f"Try-on job {job.id} failed: {e}")
+            job.status = JobStatus.failed
+            job.error = str(e)
+            job.finished_at = time.time()
+            job.future.set_exception(e)
+            # 아무도 기다리지 않는 작업의 예외가 "never retrieved" 경고로 남지 않도록 처리
+            job.future.exception()
+        else:
+            job.status = JobStatus.succeeded
+            job.result = result
+            job.finished_at = time.time()
+            job.future.set_result(result)
+
+    def _cancel_job(self, job: TryonJob, error: str):
+        job.status = JobStatus.failed
+        job.error = error
+        job.finished_at = time.time()
+        job.future.cancel()
+
+    def stats(self) -> dict:
+        waits = sorted(self._recent_queue_waits)
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_max_size": self._queue_size,
+            "running": sum(1 for job in self._jobs.values() if job.status == JobStatus.running),
+            "workers": len(self._workers),
+            "rejected": self.rejected,
+            "queue_wait_seconds_p50": waits[len(waits) // 2] if waits else 0.0,
+            "queue_wait_seconds_p95": waits[int(len(waits) * 0.95)] if waits else 0.0,
+        }
+
+tryon_job_manager = TryonJobManager(
+    worker_count=settings.TRYON_WORKER_COUNT,
+    queue_size=settings.TRYON_QUEUE_MAX_SIZE,
+    job_ttl_seconds=settings.TRYON_JOB_TTL_SECONDS,
+    user_buckets=tryon_user_buckets,
+)
+
+def get_tryon_job_manager() -> TryonJobManager:
+    return tryon_job_manager
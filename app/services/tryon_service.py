@@ -1,12 +1,21 @@
-import uuid, os
+import asyncio, uuid, logging
+from starlette.concurrency import run_in_threadpool
 from app.config import settings
+from app.database import DbSession, SessionLocal
 from app.repositories.photo_repository import PhotoRepository
 from app.repositories.result_repository import ResultRepository
 from app.repositories.image_repository import ImageRepository
 from app.repositories.upload_repository import UploadRepository
 from app.services import vton_service
+from app.services.thumbnail_service import ThumbnailService
+from app.utils.result_cache import tryon_result_cache
+from app.utils.image_processing import NormalizedImage, normalize_image, normalized_image_cache
+from app.utils.singleflight import SingleFlight
+from app.utils.admission import AdmissionRejectedError
+from app.utils.resilience import CircuitOpenError
+from app.utils.metrics import observe_stage
 from app import schemas
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 # Custom Exceptions
 class PhotoNotFoundError(Exception):
@@ -15,6 +24,9 @@ class PhotoNotFoundError(Exception):
 class VtonProcessingError(Exception):
     pass
 
+# 같은 (사용자, 사람 사진, 옷 사진) 조합의 동시 요청은 한 번의 합성 결과를 공유합니다.
+tryon_flight = SingleFlight()
+
 class TryonService:
     def __init__(self, 
                  photo_repo: PhotoRepository, 
@@ -25,68 +37,97 @@ class TryonService:
         self.result_repo = result_repo
         self.image_repo = image_repo
         self.upload_repo = upload_repo
+        self.thumbnail_service = ThumbnailService(upload_repo)
 
-    def _get_mime_type(self, filename: str) -> str:
-        ext = os.path.splitext(filename)[1].lower()
-        if ext in ['.jpg', '.jpeg']:
-            return 'image/jpeg'
-        elif ext == '.png':
-            return 'image/png'
-        elif ext == '.webp':
-            return 'image/webp'
-        else:
-            return 'image/png' # Default
-
-    async def create_tryon_result(self, user_id: int, person_photo_id: int, cloth_photo_id: int) -> Dict[str, Any]:
-        person_photo = self.photo_repo.get_person_photo_by_id(person_photo_id, user_id)
+    async def prepare_person_image(self, user_id: int, person_photo_id: int):
+        """
+        사람 사진을 확인하고 모델 입력용 이미지를 미리 캐시에 올립니다.
+        배치 요청에서 옷 사진별 작업이 같은 사람 사진을 각자 내려받지 않도록 먼저 한 번 호출합니다.
+        """
+        person_photo = await self.photo_repo.get_person_photo_by_id(person_photo_id, user_id)
+        # 배치 응답을 스트리밍하는 동안 요청 세션이 커넥션을 붙잡고 있지 않도록 합니다.
+        await self.photo_repo.release_connection()
         if not person_photo:
             raise PhotoNotFoundError("선택한 사람 사진을 찾을 수 없습니다.")
+        await self._load_normalized_image("person_photo", person_photo)
 
-        cloth_photo = self.photo_repo.get_cloth_photo_by_id(cloth_photo_id)
+    async def _create_tryon_result(self, user_id: int, person_photo_id: int, cloth_photo_id: int) -> Dict[str, Any]:
+        with observe_stage("db_lookup"):
+            person_photo = await self.photo_repo.get_person_photo_by_id(person_photo_id, user_id)
+            cloth_photo = await self.photo_repo.get_cloth_photo_by_id(cloth_photo_id) if person_photo else None
+            # 모델 호출 대기/실행 중에는 커넥션을 풀에 돌려줍니다. 결과 저장은 새 트랜잭션에서 짧게 처리합니다.
+            # (워커 수가 커넥션 풀 크기보다 많아도 대기 중인 작업이 풀을 다 차지하지 않습니다)
+            await self.photo_repo.release_connection()
+        if not person_photo:
+            raise PhotoNotFoundError("선택한 사람 사진을 찾을 수 없습니다.")
         if not cloth_photo:
             raise PhotoNotFoundError("선택한 옷 사진을 찾을 수 없습니다.")
 
-        try:
-            person_image_bytes = self.image_repo.download_image("person_photo", person_photo.filename)
-            cloth_image_bytes = self.image_repo.download_image("cloth_photo", cloth_photo.filename)
-        except Exception as e:
-            raise VtonProcessingError(f"이미지 다운로드 실패: {e}")
+        # 두 입력 이미지는 서로 독립적이므로 동시에 내려받고 변환합니다.
+        person_image, cloth_image = await asyncio.gather(
+            self._load_normalized_image("person_photo", person_photo),
+            self._load_normalized_image("cloth_photo", cloth_photo),
+        )
 
-        try:
-            if settings.VTON_METHOD == "vertex_ai":
-                result_image_bytes = vton_service.run_vton(
-                    person_image_bytes=person_image_bytes,
-                    person_mime_type=self._get_mime_type(person_photo.filename),
-                    cloth_image_bytes=cloth_image_bytes,
-                    cloth_mime_type=self._get_mime_type(cloth_photo.filename),
+        # 캐시 키에는 결과를 만든 엔진이 들어가므로 대체 엔진의 결과가 기본 엔진 결과로 재사용되지 않습니다.
+        def result_cache_key(engine: vton_service.VtonEngine) -> str:
+            return tryon_result_cache.make_key(
+                person_image.sha256,
+                cloth_image.sha256,
+                cloth_photo.fitting_type,
+                engine.model_name,
+                engine.version,
+            )
+
+        cache_key = result_cache_key(vton_service.vton_engines.primary)
+        result_filename = f"{uuid.uuid4().hex}_result.png"
+        with observe_stage("result_cache_copy"):
+            reused, thumbnail_widths = await self._copy_cached_result(cache_key, result_filename)
+        if not reused:
+            try:
+                vton_output = await vton_service.run_vton(
+                    person_image_bytes=person_image.data,
+                    person_mime_type=person_image.mime_type,
+                    cloth_image_bytes=cloth_image.data,
+                    cloth_mime_type=cloth_image.mime_type,
                     cloth_type=cloth_photo.fitting_type,
                 )
-            else:
-                raise Exception("vertex_ai 환경 변수 설정이 필요합니다")
-            
-            if not result_image_bytes:
-                 raise VtonProcessingError("합성 결과 이미지가 생성되지 않았습니다.")
+                result_image_bytes = vton_output.image
 
-        except Exception as e:
-            raise VtonProcessingError(f"합성 실패: {e}")
+                if not result_image_bytes:
+                     raise VtonProcessingError("합성 결과 이미지가 생성되지 않았습니다.")
 
-        result_filename = f"{uuid.uuid4().hex}_result.png"
-        try:
-            self.upload_repo.upload_file(
-                bucket="result_photo",
-                path=result_filename,
-                file_content=result_image_bytes,
-                content_type="image/png"
-            )
-        except Exception as e:
-            raise VtonProcessingError(f"결과 이미지 업로드 실패: {e}")
+            except (AdmissionRejectedError, CircuitOpenError):
+                # 대기열 초과/쿼터 초과/서킷 열림은 합성 실패가 아니라 재시도 대상이므로 그대로 전달합니다.
+                raise
+            except Exception as e:
+                raise VtonProcessingError(f"합성 실패: {e}")
 
-        new_result = self.result_repo.create_result(
-            user_id=user_id,
-            person_photo_id=person_photo_id,
-            cloth_photo_id=cloth_photo_id,
-            filename=result_filename,
-        )
+            try:
+                with observe_stage("upload"):
+                    await self.upload_repo.upload_file(
+                        bucket="result_photo",
+                        path=result_filename,
+                        file_content=result_image_bytes,
+                        content_type="image/png"
+                    )
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                raise VtonProcessingError(f"결과 이미지 업로드 실패: {e}")
+
+            with observe_stage("thumbnails"):
+                thumbnail_widths = await self.thumbnail_service.create_thumbnails("result_photo", result_filename, result_image_bytes)
+            tryon_result_cache.put(result_cache_key(vton_output.engine), result_filename, thumbnail_widths)
+
+        with observe_stage("db_insert"):
+            new_result = await self.result_repo.create_result(
+                user_id=user_id,
+                person_photo_id=person_photo_id,
+                cloth_photo_id=cloth_photo_id,
+                filename=result_filename,
+                thumbnail_widths=thumbnail_widths,
+            )
 
         result_image_url = self.image_repo.get_public_url("result_photo", result_filename)
 
@@ -94,4 +135,84 @@ class TryonService:
             "id": new_result.id,
             "filename": new_result.filename,
             "image_url": result_image_url
-        }
\ No newline at end of file
+        }
+
+    async def _load_normalized_image(self, bucket: str, photo) -> NormalizedImage:
+        """
+        모델 입력용으로 정규화한 이미지를 반환합니다.
+        사진 ID별로 캐시하므로 같은 사진을 다시 쓰면 다운로드와 디코딩/리사이즈를 모두 건너뜁니다.
+        """
+        cache_key = (
+            bucket,
+            photo.id,
+            settings.VTON_INPUT_MAX_EDGE,
+            settings.VTON_INPUT_FORMAT,
+            settings.VTON_INPUT_QUALITY,
+        )
+        normalized = normalized_image_cache.get(cache_key)
+        if normalized:
+            return normalized
+
+        try:
+            with observe_stage("download"):
+                image_bytes = await self.image_repo.download_image(bucket, photo.filename)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            raise VtonProcessingError(f"이미지 다운로드 실패: {e}")
+
+        try:
+            with observe_stage("normalize"):
+                normalized = await run_in_threadpool(
+                    normalize_image,
+                    image_bytes,
+                    settings.VTON_INPUT_MAX_EDGE,
+                    settings.VTON_INPUT_FORMAT,
+                    settings.VTON_INPUT_QUALITY,
+                )
+        except Exception as e:
+            raise VtonProcessingError(f"이미지 변환 실패: {e}")
+
+        normalized_image_cache.put(cache_key, normalized)
+        return normalized
+
+    async def _copy_cached_result(self, cache_key: str, result_filename: str) -> Tuple[bool, List[int]]:
+        """
+        같은 입력으로 만든 결과 파일이 캐시에 있으면 새 이름으로 복사하고 (True, 복사한 썸네일 폭 목록)을 반환합니다.
+        원본 결과 파일이 사라졌다면 캐시 항목을 지우고 (False, [])를 반환합니다.
+        """
+        cached = tryon_result_cache.get(cache_key)
+        if not cached:
+            return False, []
+        cached_filename = cached.filename
+        try:
+            await self.upload_repo.copy_file("result_photo", cached_filename, result_filename)
+        except Exception as e:
+            logging.warning(f"Cached try-on result {cached_filename} could not be reused: {e}")
+            tryon_result_cache.invalidate(cache_key)
+            return False, []
+        copied = await self.thumbnail_service.copy_thumbnails(
+            "result_photo", cached_filename, result_filename, cached.thumbnail_widths
+        )
+        return True, cached.thumbnail_widths if copied else []
+
+def build_tryon_service(db: DbSession) -> TryonService:
+    photo_repo = PhotoRepository(db)
+    result_repo = ResultRepository(db)
+    image_repo = ImageRepository(db)
+    upload_repo = UploadRepository(db)
+    return TryonService(photo_repo, result_repo, image_repo, upload_repo)
+
+async def create_tryon_result(user_id: int, person_photo_id: int, cloth_photo_id: int) -> Dict[str, Any]:
+    """
+    가상 피팅 결과를 만듭니다. 같은 (사용자, 사람 사진, 옷 사진) 조합의 동시 요청은 한 번의 합성 결과를 공유합니다.
+    합친 작업은 먼저 온 호출이 취소되어도 계속 실행되므로 호출한 쪽의 DB 세션을 빌리지 않고 자기 세션을 열어 씁니다.
+    """
+    async def run() -> Dict[str, Any]:
+        db = SessionLocal()
+        try:
+            return await build_tryon_service(db)._create_tryon_result(user_id, person_photo_id, cloth_photo_id)
+        finally:
+            await db.close()
+
+    return await tryon_flight.do((user_id, person_photo_id, cloth_photo_id), run)
@@ -1,10 +1,24 @@
-import os, uuid, io
+import os, uuid, hashlib, logging
+from dataclasses import dataclass
 from datetime import datetime
+from typing import BinaryIO, List, Tuple
 from PIL import Image
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
 from app.repositories.upload_repository import UploadRepository
+from app.services.thumbnail_service import ThumbnailService
+from app.utils.shop_catalog import shop_catalog
 from app import schemas
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024 # 1MB
+
+# 파일 앞부분(매직 넘버)으로 실제 이미지 형식을 판별합니다.
+IMAGE_SIGNATURES = {
+    b"\xff\xd8\xff": "image/jpeg",
+    b"\x89PNG\r\n\x1a\n": "image/png",
+}
+
 # Custom Exceptions
 class InvalidImageFileError(Exception):
     pass
@@ -12,36 +26,96 @@ class InvalidImageFileError(Exception):
 class ImageProcessingError(Exception):
     pass
 
+class FileTooLargeError(Exception):
+    pass
+
+@dataclass
+class IngestedFile:
+    file: BinaryIO
+    size: int
+    sha256: str
+    content_type: str
+
+def _sniff_image_type(header: bytes) -> str | None:
+    for signature, content_type in IMAGE_SIGNATURES.items():
+        if header.startswith(signature):
+            return content_type
+    return None
+
+def _verify_image(file: BinaryIO):
+    try:
+        with Image.open(file) as image:
+            image.verify()
+    except Exception:
+        raise ImageProcessingError("손상된 이미지입니다.")
+    finally:
+        file.seek(0)
+
 class UploadService:
     def __init__(self, upload_repo: UploadRepository):
         self.upload_repo = upload_repo
+        self.thumbnail_service = ThumbnailService(upload_repo)
 
-    async def upload_person_photo(self, file: UploadFile, user_id: int) -> schemas.Photo:
-        if not file.filename.lower().endswith(('.jpg','.jpeg','.png')):
-            raise InvalidImageFileError('jpg, jpeg, png 만 가능합니다')
+    async def _ingest(self, file: UploadFile) -> IngestedFile:
+        """
+        업로드 파일을 청크 단위로 읽으며 크기 제한, 해시, 이미지 형식 판별을 한 번에 처리합니다.
+        본문은 메모리로 모으지 않고, Starlette가 받아 둔 스풀 임시 파일을 그대로 저장소로 넘깁니다.
+        """
+        max_bytes = settings.UPLOAD_MAX_BYTES
+        too_large = FileTooLargeError(f"파일이 너무 큽니다. 최대 {max_bytes // (1024 * 1024)}MB까지 가능합니다.")
+        if file.size is not None and file.size > max_bytes:
+            raise too_large
 
-        ext = os.path.splitext(file.filename)[1].lower()
-        save_name = f"{datetime.now().strftime('%Y%m%d')}_{uuid.uuid4().hex}{ext}"
+        digest = hashlib.sha256()
+        size = 0
+        content_type = None
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            if content_type is None:
+                content_type = _sniff_image_type(chunk)
+                if content_type is None:
+                    raise InvalidImageFileError("jpg, jpeg, png 만 가능합니다")
+            size += len(chunk)
+            if size > max_bytes:
+                raise too_large
+            digest.update(chunk)
 
-        contents = await file.read()
+        if content_type is None:
+            raise ImageProcessingError("빈 파일입니다.")
 
-        try:
-            image = Image.open(io.BytesIO(contents))
-            image.verify()
-        except Exception:
-            raise ImageProcessingError("손상된 이미지입니다.")
+        await file.seek(0)
+        await run_in_threadpool(_verify_image, file.file)
+        return IngestedFile(file=file.file, size=size, sha256=digest.hexdigest(), content_type=content_type)
 
-        self.upload_repo.upload_file(
-            bucket="person_photo",
+    async def _store(self, bucket: str, file: UploadFile) -> Tuple[str, List[int]]:
+        """
+        원본을 저장하고 썸네일을 만듭니다. 저장한 파일 이름과 저장된 썸네일 폭 목록을 반환합니다.
+        """
+        ext = os.path.splitext(file.filename)[1].lower()
+        save_name = f"{datetime.now().strftime('%Y%m%d')}_{uuid.uuid4().hex}{ext}"
+
+        ingested = await self._ingest(file)
+        await self.upload_repo.upload_file(
+            bucket=bucket,
             path=save_name,
-            file_content=contents,
-            content_type=file.content_type
+            file_content=ingested.file,
+            content_type=ingested.content_type
         )
+        logging.info(f"Uploaded {bucket}/{save_name} ({ingested.size} bytes, sha256={ingested.sha256})")
+        ingested.file.seek(0)
+        thumbnail_widths = await self.thumbnail_service.create_thumbnails(bucket, save_name, ingested.file)
+        return save_name, thumbnail_widths
+
+    async def upload_person_photo(self, file: UploadFile, user_id: int) -> schemas.Photo:
+        if not file.filename.lower().endswith(('.jpg','.jpeg','.png')):
+            raise InvalidImageFileError('jpg, jpeg, png 만 가능합니다')
+
+        save_name, thumbnail_widths = await self._store("person_photo", file)
 
-        new_photo = self.upload_repo.create_person_photo(
+        new_photo = await self.upload_repo.create_person_photo(
             user_id=user_id,
             filename_original=file.filename,
             filename=save_name,
+            thumbnail_widths=thumbnail_widths,
         )
         return new_photo
 
@@ -49,28 +123,15 @@ class UploadService:
         if not file.filename.lower().endswith((".jpg", ".jpeg", ".png")):
             raise InvalidImageFileError("jpg, jpeg, png만 가능합니다")
 
-        ext = os.path.splitext(file.filename)[1].lower()
-        save_name = f"{datetime.now().strftime('%Y%m%d')}_{uuid.uuid4().hex}{ext}"
-
-        contents = await file.read()
-
-        try:
-            image = Image.open(io.BytesIO(contents))
-            image.verify()
-        except Exception:
-            raise ImageProcessingError("손상된 이미지입니다.")
-        
-        self.upload_repo.upload_file(
-            bucket="cloth_photo",
-            path=save_name,
-            file_content=contents,
-            content_type=file.content_type
-        )
+        save_name, thumbnail_widths = await self._store("cloth_photo", file)
 
-        new_cloth = self.upload_repo.create_cloth_photo(
+        new_cloth = await self.upload_repo.create_cloth_photo(
             user_id=user_id,
             filename_original=file.filename,
             filename=save_name,
             fitting_type=fitting_type,
+            thumbnail_widths=thumbnail_widths,
         )
+        if user_id == settings.SHOP_USER_ID:
+            shop_catalog.invalidate()
         return new_cloth
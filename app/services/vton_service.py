@@ -1,17 +1,228 @@
 # app/services/vton_service.py
-from app.repositories import vton_repository
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Awaitable, Dict, Optional
+from app.config import settings
+from app.repositories import local_vton_repository, vton_repository
+from app.utils.admission import AdaptiveConcurrencyLimiter, AdmissionRejectedError, local_vton_limiter, vton_limiter
+from app.utils.metrics import observe_stage
+from app.utils.resilience import CircuitOpenError, ResilientDependency
+from app.utils.tracing import start_span
 
-def run_vton(
-    person_image_bytes: bytes,
+# Custom Exceptions
+class VtonQuotaExceededError(AdmissionRejectedError):
+    pass
+
+class UnknownVtonEngineError(ValueError):
+    pass
+
+class VtonEngine(ABC):
+    """
+    가상 피팅 엔진의 공통 인터페이스입니다.
+    엔진마다 동시 호출 수 제한(limiter)을 따로 두고, 외부 서비스를 부르는 엔진은 재시도/서킷 브레이커(resilience)를 둡니다.
+    model_name과 version은 결과 캐시 키에 들어가므로 합성 방식이 바뀌면 함께 바꿉니다.
+    """
+    def __init__(self, name: str, model_name: str, version: str, limiter: AdaptiveConcurrencyLimiter,
+                 stage: str, resilience: Optional[ResilientDependency] = None):
+        self.name = name
+        self.model_name = model_name
+        self.version = version
+        self.limiter = limiter
+        # tryon_stage_duration_seconds의 단계 이름 접두사 ({stage}_admission, {stage}_call)
+        self.stage = stage
+        self.resilience = resilience
+        self.fallback_calls = 0
+
+    @abstractmethod
+    async def generate(self, person_image_bytes: bytes | memoryview, person_mime_type: str,
+                       cloth_image_bytes: bytes | memoryview, cloth_mime_type: str, cloth_type: str) -> bytes:
+        ...
+
+    def is_quota_error(self, error: Exception) -> bool:
+        return False
+
+    def is_unavailable_error(self, error: Exception) -> bool:
+        """
+        재시도 후에도 남은 일시적 장애인지 확인합니다. 대체 엔진으로 넘길지 판단할 때 씁니다.
+        """
+        return self.resilience is not None and self.resilience.is_transient(error)
+
+    async def warm_up(self):
+        pass
+
+    def stats(self) -> dict:
+        return {
+            "model_name": self.model_name,
+            "version": self.version,
+            "fallback_calls": self.fallback_calls,
+            "admission": self.limiter.stats(),
+            "resilience": self.resilience.stats() if self.resilience else None,
+        }
+
+class VertexVtonEngine(VtonEngine):
+    def __init__(self):
+        super().__init__(
+            "vertex_ai",
+            model_name=settings.VTON_MODEL_NAME,
+            version=vton_repository.PROMPT_VERSION,
+            limiter=vton_limiter,
+            stage="vton",
+            resilience=vton_repository.vton_resilience,
+        )
+
+    async def generate(self, person_image_bytes, person_mime_type, cloth_image_bytes, cloth_mime_type, cloth_type):
+        return await vton_repository.run_vton_with_vertex_ai(
+            person_image_bytes, person_mime_type, cloth_image_bytes, cloth_mime_type, cloth_type
+        )
+
+    def is_quota_error(self, error: Exception) -> bool:
+        return vton_repository.is_quota_error(error)
+
+    async def warm_up(self):
+        await vton_repository.vton_client.warm_up()
+
+class LocalVtonEngine(VtonEngine):
+    def __init__(self):
+        super().__init__(
+            "local",
+            model_name="local",
+            version=local_vton_repository.COMPOSITOR_VERSION,
+            limiter=local_vton_limiter,
+            stage="vton_local",
+        )
+
+    async def generate(self, person_image_bytes, person_mime_type, cloth_image_bytes, cloth_mime_type, cloth_type):
+        return await local_vton_repository.run_vton_locally(
+            person_image_bytes, person_mime_type, cloth_image_bytes, cloth_mime_type, cloth_type
+        )
+
+class VtonEngineRegistry:
+    """
+    이름으로 가상 피팅 엔진을 등록하고, 설정에 따라 기본 엔진과 대체 엔진을 고릅니다.
+    """
+    def __init__(self):
+        self._engines: Dict[str, VtonEngine] = {}
+        self.primary: Optional[VtonEngine] = None
+        self.fallback: Optional[VtonEngine] = None
+
+    def register(self, engine: VtonEngine) -> VtonEngine:
+        self._engines[engine.name] = engine
+        return engine
+
+    def get(self, name: str) -> VtonEngine:
+        engine = self._engines.get(name)
+        if engine is None:
+            raise UnknownVtonEngineError(f"알 수 없는 VTON 엔진입니다: {name} (사용 가능: {', '.join(self._engines)})")
+        return engine
+
+    def configure(self, primary: str, fallback: str = ""):
+        self.primary = self.get(primary)
+        self.fallback = self.get(fallback) if fallback and fallback != primary else None
+
+    async def warm_up(self):
+        for engine in (self.primary, self.fallback):
+            if engine is not None:
+                await engine.warm_up()
+
+    def stats(self) -> dict:
+        return {
+            "primary": self.primary.name if self.primary else None,
+            "fallback": self.fallback.name if self.fallback else None,
+            "engines": {name: engine.stats() for name, engine in self._engines.items()},
+        }
+
+vton_engines = VtonEngineRegistry()
+vton_engines.register(VertexVtonEngine())
+vton_engines.register(LocalVtonEngine())
+vton_engines.configure(settings.VTON_METHOD, settings.VTON_FALLBACK_METHOD)
+
+@dataclass
+class VtonOutput:
+    image: bytes
+    # 실제로 결과를 만든 엔진 (대체 엔진일 수 있음)
+    engine: VtonEngine
+
+async def run_vton(
+    person_image_bytes: bytes | memoryview,
+    person_mime_type: str,
+    cloth_image_bytes: bytes | memoryview,
+    cloth_mime_type: str,
+    cloth_type: str
+) -> VtonOutput:
+    """
+    기본 엔진으로 합성합니다. 대기열/쿼터 초과(429), 서킷 열림, 재시도 후에도 남은 일시적 장애로 실패하면
+    VTON_FALLBACK_METHOD 엔진이 설정된 경우 그 엔진으로 다시 합성합니다.
+    """
+    def call(engine: VtonEngine) -> Awaitable[bytes]:
+        return _run_engine(engine, person_image_bytes, person_mime_type, cloth_image_bytes, cloth_mime_type, cloth_type)
+
+    primary, fallback = vton_engines.primary, vton_engines.fallback
+    try:
+        return VtonOutput(await call(primary), primary)
+    except Exception as e:
+        if fallback is None or not (
+            isinstance(e, (AdmissionRejectedError, CircuitOpenError)) or primary.is_unavailable_error(e)
+        ):
+            raise
+        logging.warning(f"VTON engine {primary.name} unavailable ({type(e).__name__}: {e}), falling back to {fallback.name}")
+        fallback.fallback_calls += 1
+        return VtonOutput(await call(fallback), fallback)
+
+async def _run_engine(
+    engine: VtonEngine,
+    person_image_bytes: bytes | memoryview,
+    person_mime_type: str,
+    cloth_image_bytes: bytes | memoryview,
+    cloth_mime_type: str,
+    cloth_type: str
+) -> bytes:
+    """
+    일시적 오류(5xx, 시간 초과)는 지터를 준 지수 백오프로 재시도하고, 연속으로 실패하면 서킷을 열어 바로 실패시킵니다.
+    재시도 사이에는 동시 호출 자리를 반납하므로 대기 중인 다른 요청이 먼저 실행될 수 있습니다.
+    """
+    def operation() -> Awaitable[bytes]:
+        return _run_engine_once(engine, person_image_bytes, person_mime_type, cloth_image_bytes, cloth_mime_type, cloth_type)
+
+    if engine.resilience is None:
+        return await operation()
+    return await engine.resilience.call(operation)
+
+async def _run_engine_once(
+    engine: VtonEngine,
+    person_image_bytes: bytes | memoryview,
     person_mime_type: str,
-    cloth_image_bytes: bytes,
+    cloth_image_bytes: bytes | memoryview,
     cloth_mime_type: str,
     cloth_type: str
 ) -> bytes:
-    return vton_repository.run_vton_with_vertex_ai(
-        person_image_bytes,
-        person_mime_type,
-        cloth_image_bytes,
-        cloth_mime_type,
-        cloth_type
-    )
\ No newline at end of file
+    """
+    엔진의 동시 호출 수 제한을 통과한 뒤 합성합니다.
+    쿼터 초과 응답을 받으면 limit을 줄이고 VtonQuotaExceededError(429)로 알립니다.
+    """
+    with observe_stage(f"{engine.stage}_admission"), start_span("admission.vton", **{"vton.engine": engine.name}):
+        await engine.limiter.acquire()
+    try:
+        started = time.monotonic()
+        try:
+            with observe_stage(f"{engine.stage}_call"):
+                result = await engine.generate(
+                    person_image_bytes,
+                    person_mime_type,
+                    cloth_image_bytes,
+                    cloth_mime_type,
+                    cloth_type
+                )
+        except Exception as e:
+            if engine.is_quota_error(e):
+                engine.limiter.on_overload()
+                raise VtonQuotaExceededError(
+                    "모델 호출 한도를 초과했습니다. 잠시 후 다시 시도해주세요.",
+                    retry_after=settings.VTON_QUOTA_RETRY_AFTER_SECONDS,
+                ) from e
+            raise
+        engine.limiter.on_success(time.monotonic() - started)
+        return result
+    finally:
+        engine.limiter.release()
@@ -1,8 +1,8 @@
 from fastapi import Depends, HTTPException, status
-from app import models
 from app.utils.security import get_current_user
+from app.utils.auth_cache import UserPrincipal
 
-def get_admin_user(current_user: models.User = Depends(get_current_user)) -> models.User:
+def get_admin_user(current_user: UserPrincipal = Depends(get_current_user)) -> UserPrincipal:
     """
     현재 사용자가 슈퍼유저인지 확인합니다.
     슈퍼유저가 아닐 경우, 403 Forbidden 에러를 발생시킵니다.
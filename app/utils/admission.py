@@ -0,0 +1,208 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque
+
+from cachetools import TTLCache
+
+from app.config import settings
+
+class AdmissionRejectedError(Exception):
+    """
+    지금은 처리할 수 없어 나중에 다시 시도해야 하는 요청입니다. API에서는 429와 Retry-After로 응답합니다.
+    """
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+class AdmissionQueueFullError(AdmissionRejectedError):
+    pass
+
+class UserRateLimitedError(AdmissionRejectedError):
+    pass
+
+class AdaptiveConcurrencyLimiter:
+    """
+    동시에 실행하는 모델 호출 수를 AIMD 방식으로 조절합니다.
+    성공하면 limit마다 1씩 늘리고(additive increase), 쿼터 초과(429)를 받으면 decrease_factor배로 줄입니다(multiplicative decrease).
+    limit을 넘는 호출은 최대 max_waiters개까지 도착 순서대로 기다리고, 그 이상은 즉시 AdmissionQueueFullError로 거절합니다.
+    """
+    def __init__(self, initial: int, minimum: int, maximum: int, max_waiters: int,
+                 decrease_factor: float = 0.5, decrease_cooldown_seconds: float = 1.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.max_waiters = max_waiters
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown_seconds = decrease_cooldown_seconds
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        # 호출 1건의 평균 소요 시간(EWMA). Retry-After 추정에 사용합니다.
+        self._service_seconds = 10.0
+        self._recent_waits: Deque[float] = deque(maxlen=512)
+        self.admitted = 0
+        self.rejected = 0
+        self.increases = 0
+        self.decreases = 0
+        self.wait_seconds_total = 0.0
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < max(self.minimum, int(self.limit))
+
+    def estimate_wait(self, queued: int) -> float:
+        """
+        앞에 queued개가 기다리고 있을 때 차례가 오기까지 걸릴 대략적인 시간(초)입니다.
+        """
+        return (queued + 1) * self._service_seconds / max(1.0, self.limit)
+
+    async def acquire(self):
+        if self._has_capacity() and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            self._recent_waits.append(0.0)
+            return
+        if len(self._waiters) >= self.max_waiters:
+            self.rejected += 1
+            raise AdmissionQueueFullError(
+                "모델 호출 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.",
+                retry_after=self.estimate_wait(len(self._waiters)),
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 자리를 받은 직후 취소된 경우 자리를 돌려줍니다.
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        waited = time.monotonic() - started
+        self.admitted += 1
+        self.wait_seconds_total += waited
+        self._recent_waits.append(waited)
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self):
+        while self._waiters and self._has_capacity():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def on_success(self, elapsed_seconds: float):
+        self._service_seconds = 0.8 * self._service_seconds + 0.2 * elapsed_seconds
+        if self.limit < self.maximum:
+            self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            self.increases += 1
+            self._wake_waiters()
+
+    def on_overload(self):
+        # 같은 혼잡으로 동시에 실패한 호출들이 limit을 연달아 줄이지 않도록 잠시 추가 감소를 무시합니다.
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown_seconds:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.minimum), self.limit * self.decrease_factor)
+        self.decreases += 1
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        waits = sorted(self._recent_waits)
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_waiters": self.max_waiters,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_p50": waits[len(waits) // 2] if waits else 0.0,
+            "wait_seconds_p95": waits[int(len(waits) * 0.95)] if waits else 0.0,
+            "service_seconds_avg": self._service_seconds,
+        }
+
+class UserTokenBuckets:
+    """
+    사용자별 토큰 버킷입니다. 분당 rate_per_minute개씩 채워지고 최대 burst개까지 모입니다.
+    오래 쓰지 않은 버킷은 가득 찬 상태와 같으므로 TTL이 지나면 지웁니다.
+    """
+    def __init__(self, rate_per_minute: float, burst: int, maxsize: int = 10000):
+        self.rate_per_second = rate_per_minute / 60
+        self.burst = burst
+        refill_seconds = burst / self.rate_per_second if self.rate_per_second else 3600
+        self._buckets: TTLCache = TTLCache(maxsize=maxsize, ttl=refill_seconds)
+        self.allowed = 0
+        self.limited = 0
+
+    def take(self, user_id: int, cost: int = 1):
+        """
+        토큰 cost개를 사용합니다. 부족하면 토큰이 모일 때까지의 시간을 담은 UserRateLimitedError를 발생시킵니다.
+        """
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(user_id, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated_at) * self.rate_per_second)
+        if cost > self.burst or tokens < cost:
+            self.limited += 1
+            self._buckets[user_id] = (tokens, now)
+            shortfall = cost - tokens
+            retry_after = shortfall / self.rate_per_second if self.rate_per_second and cost <= self.burst else 60.0
+            raise UserRateLimitedError("가상 피팅 요청이 너무 많습니다. 잠시 후 다시 시도해주세요.", retry_after=retry_after)
+        self._buckets[user_id] = (tokens - cost, now)
+        self.allowed += 1
+
+    def stats(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "tracked_users": self._buckets.currsize,
+            "rate_per_minute": self.rate_per_second * 60,
+            "burst": self.burst,
+        }
+
+vton_limiter = AdaptiveConcurrencyLimiter(
+    initial=settings.VTON_CONCURRENCY_INITIAL,
+    minimum=settings.VTON_CONCURRENCY_MIN,
+    maximum=settings.VTON_CONCURRENCY_MAX,
+    max_waiters=settings.VTON_ADMISSION_MAX_WAITERS,
+    decrease_factor=settings.VTON_CONCURRENCY_DECREASE_FACTOR,
+)
+
+# CPU 합성은 외부 쿼터가 없으므로 limit을 고정합니다.
+local_vton_limiter = AdaptiveConcurrencyLimiter(
+    initial=settings.LOCAL_VTON_CONCURRENCY,
+    minimum=settings.LOCAL_VTON_CONCURRENCY,
+    maximum=settings.LOCAL_VTON_CONCURRENCY,
+    max_waiters=settings.LOCAL_VTON_MAX_WAITERS,
+)
+
+tryon_user_buckets = UserTokenBuckets(
+    rate_per_minute=settings.TRYON_USER_RATE_PER_MINUTE,
+    burst=settings.TRYON_USER_BURST,
+)
@@ -0,0 +1,135 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from cachetools import TTLCache
+
+from app import models
+from app.config import settings
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """
+    인증된 요청에서 사용하는 사용자 정보의 읽기 전용 사본입니다. 세션과 무관하게 캐시에 보관할 수 있습니다.
+    """
+    id: int
+    email: str
+    name: Optional[str]
+    profile_image: Optional[str]
+    google_id: Optional[str]
+    is_active: bool
+    is_superuser: bool
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, user: models.User) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            profile_image=user.profile_image,
+            google_id=user.google_id,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+            created_at=user.created_at,
+        )
+
+class TokenClaimsCache:
+    """
+    서명 검증을 마친 JWT의 사용자 ID를 보관합니다. 같은 토큰은 만료(exp) 전까지 다시 디코딩하지 않습니다.
+    """
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[int]:
+        with self._lock:
+            entry = self._cache.get(token)
+            if entry is not None and entry[1] is not None and entry[1] <= time.time():
+                # 캐시 TTL보다 토큰 만료가 먼저 온 경우
+                del self._cache[token]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def put(self, token: str, user_id: int, expires_at: Optional[float]):
+        with self._lock:
+            self._cache[token] = (user_id, expires_at)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": self._cache.currsize,
+            "maxsize": self._cache.maxsize,
+            "ttl_seconds": self._cache.ttl,
+        }
+
+class UserPrincipalCache:
+    """
+    사용자 ID별 UserPrincipal 캐시입니다. 관리자가 사용자를 수정/삭제하면 invalidate로 즉시 지웁니다.
+    invalidate는 현재 프로세스에만 적용되므로 다른 uvicorn 워커에는 TTL이 지나야 반영됩니다.
+    """
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        # DB 조회 도중 invalidate된 경우 오래된 값을 다시 넣지 않도록 사용자별 세대를 기록합니다.
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: int) -> Optional[UserPrincipal]:
+        with self._lock:
+            principal = self._cache.get(user_id)
+            if principal is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return principal
+
+    def generation(self, user_id: int) -> int:
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def put(self, principal: UserPrincipal, generation: int):
+        with self._lock:
+            if self._generations.get(principal.id, 0) == generation:
+                self._cache[principal.id] = principal
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._cache.pop(user_id, None)
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "size": self._cache.currsize,
+            "maxsize": self._cache.maxsize,
+            "ttl_seconds": self._cache.ttl,
+        }
+
+token_claims_cache = TokenClaimsCache(
+    maxsize=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_TOKEN_CACHE_TTL_SECONDS,
+)
+
+user_principal_cache = UserPrincipalCache(
+    maxsize=settings.AUTH_USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
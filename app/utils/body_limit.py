@@ -0,0 +1,69 @@
+import json
+from typing import Tuple
+
+from starlette.exceptions import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+class _BodyTooLarge(HTTPException):
+    # HTTPException이므로 FastAPI가 본문 파싱 오류(400)로 바꾸지 않고 413 그대로 응답합니다.
+    def __init__(self, max_bytes: int):
+        super().__init__(status_code=413, detail=_too_large_detail(max_bytes))
+
+def _too_large_detail(max_bytes: int) -> str:
+    return f"요청 크기가 너무 큽니다. 최대 {max_bytes // (1024 * 1024)}MB까지 가능합니다."
+
+class BodySizeLimitMiddleware:
+    """
+    지정한 경로의 요청 본문 크기를 제한하는 ASGI 미들웨어입니다.
+    Content-Length가 한도를 넘으면 본문을 읽기 전에, 스트리밍 중 한도를 넘으면 그 즉시 413으로 응답합니다.
+    """
+    def __init__(self, app: ASGIApp, max_bytes: int, path_prefixes: Tuple[str, ...]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_prefixes = path_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._send_too_large(send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise _BodyTooLarge(self.max_bytes)
+            return message
+
+        async def tracking_send(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            if not response_started:
+                await self._send_too_large(send)
+
+    async def _send_too_large(self, send: Send):
+        body = json.dumps({"detail": _too_large_detail(self.max_bytes)}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,175 @@
+import logging
+import mmap
+import os
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from app.config import settings
+
+TMP_PREFIX = ".tmp-"
+
+class DiskCache:
+    """
+    (bucket, filename) 단위로 저장소 객체를 로컬 디스크에 보관하는 읽기 캐시입니다.
+    파일 이름이 uuid 기반이고 덮어쓰지 않으므로 내용이 바뀌는 경우는 고려하지 않습니다(불변 캐시).
+    uvicorn 워커들이 같은 디렉터리를 나눠 쓰므로 색인을 프로세스 메모리에 두지 않고 디렉터리를 기준으로 동작합니다.
+    조회는 파일이 있는지 바로 확인하고(다른 워커가 쓴 파일도 적중), 적중한 파일의 mtime을 갱신해 사용 시각으로 씁니다.
+    전체 크기는 디렉터리를 다시 훑어 계산하며, max_bytes를 넘으면 mtime이 오래된 파일부터 low_watermark까지 지웁니다(LRU).
+    """
+    # 적중할 때마다 mtime을 쓰지 않도록 이 간격보다 오래된 경우에만 갱신합니다.
+    TOUCH_INTERVAL_SECONDS = 60
+    # 다른 워커가 쓴 파일은 이 프로세스의 추정치에 없으므로, 이 프로세스가 max_bytes의 이 비율만큼 쓸 때마다 디렉터리를 다시 훑습니다.
+    # (워커 N개가 동시에 써도 디렉터리는 max_bytes * (1 + N * SCAN_EVERY_FRACTION)를 넘지 않습니다)
+    SCAN_EVERY_FRACTION = 0.01
+    # 이보다 오래된 임시 파일은 쓰기 도중 중단된 것으로 보고 지웁니다.
+    STALE_TMP_SECONDS = 60 * 10
+
+    def __init__(self, root: str, max_bytes: int, low_watermark: float = 0.9):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.low_watermark = low_watermark
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        # 마지막으로 훑은 디렉터리 크기 + 그 뒤로 이 프로세스가 쓴 크기
+        self._bytes = 0
+        self._entries = 0
+        self._written_since_scan = 0
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+        self.scans = 0
+        if self.enabled:
+            os.makedirs(root, exist_ok=True)
+            self._scan()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _scan(self):
+        """
+        디렉터리 전체 크기를 다시 계산하고, 예산을 넘었으면 mtime이 오래된 파일부터 지웁니다.
+        여러 스레드가 동시에 훑지 않도록 이미 훑는 중이면 건너뜁니다.
+        """
+        if not self._scan_lock.acquire(blocking=False):
+            return
+        try:
+            now = time.time()
+            entries = []
+            total = 0
+            for dirpath, _, filenames in os.walk(self.root):
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    try:
+                        stat = os.stat(path)
+                        if name.startswith(TMP_PREFIX):
+                            if now - stat.st_mtime > self.STALE_TMP_SECONDS:
+                                os.remove(path)
+                            continue
+                    except FileNotFoundError:
+                        # 다른 워커가 방금 지운 파일
+                        continue
+                    entries.append((stat.st_mtime, path, stat.st_size))
+                    total += stat.st_size
+
+            evicted = 0
+            if total > self.max_bytes:
+                target = self.max_bytes * self.low_watermark
+                entries.sort()
+                for _, path, size in entries:
+                    if total <= target:
+                        break
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                    total -= size
+                    evicted += 1
+
+            with self._lock:
+                self._bytes = total
+                self._entries = len(entries) - evicted
+                self._written_since_scan = 0
+                self.evictions += evicted
+                self.scans += 1
+        finally:
+            self._scan_lock.release()
+
+    def path_for(self, bucket: str, filename: str) -> Optional[str]:
+        if not bucket or not filename or ".." in filename or "/" in filename or "\\" in filename or "/" in bucket:
+            return None
+        return os.path.join(self.root, bucket, filename)
+
+    def get(self, bucket: str, filename: str) -> Optional[memoryview]:
+        """
+        캐시된 파일을 mmap으로 열어 복사 없이 memoryview로 반환합니다. 없으면 None입니다.
+        """
+        path = self.path_for(bucket, filename)
+        if not self.enabled or path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                size = stat.st_size
+                data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)) if size else memoryview(b"")
+        except (FileNotFoundError, ValueError):
+            # 없는 파일이거나, 다른 워커 프로세스가 지웠거나 파일이 잘린 경우
+            with self._lock:
+                self.misses += 1
+            return None
+        if time.time() - stat.st_mtime > self.TOUCH_INTERVAL_SECONDS:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += size
+        return data
+
+    def put(self, bucket: str, filename: str, data: bytes | memoryview):
+        path = self.path_for(bucket, filename)
+        size = len(data)
+        if not self.enabled or path is None or size > self.max_bytes:
+            return
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # 같은 디렉터리의 임시 파일에 쓴 뒤 rename하여 읽는 쪽이 절반만 쓰인 파일을 보지 않도록 합니다.
+            fd, tmp_path = tempfile.mkstemp(prefix=TMP_PREFIX, dir=directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"Failed to write disk cache entry {path}: {e}")
+            return
+        with self._lock:
+            self._bytes += size
+            self._entries += 1
+            self._written_since_scan += size
+            scan = (
+                self._bytes > self.max_bytes
+                or self._written_since_scan >= self.max_bytes * self.SCAN_EVERY_FRACTION
+            )
+        if scan:
+            self._scan()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "evictions": self.evictions,
+            "scans": self.scans,
+            # 디렉터리 기준 추정치 (마지막으로 훑은 뒤 다른 워커가 쓴 파일은 빠져 있음)
+            "entries": self._entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+image_disk_cache = DiskCache(root=settings.IMAGE_CACHE_DIR, max_bytes=settings.IMAGE_CACHE_MAX_BYTES)
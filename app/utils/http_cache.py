@@ -0,0 +1,83 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import formatdate
+from typing import Dict, Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.database import DbSession
+from app.utils.pagination import timestamp_column
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    요청의 If-None-Match 헤더가 etag와 일치하는지 확인합니다. (약한 비교, '*' 포함)
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+@dataclass(frozen=True)
+class ListValidator:
+    """
+    사용자별 목록의 (개수, 최대 id, 최대 시각)으로 만든 검증자입니다.
+    사진은 추가/삭제만 되고 수정되지 않으므로 세 값이 같으면 목록도 같습니다.
+    """
+    etag: str
+    last_modified: Optional[datetime]
+
+    def headers(self) -> Dict[str, str]:
+        # 사용자별 응답이므로 공유 캐시에는 저장하지 않고, 브라우저는 매번 ETag로 재검증합니다.
+        headers = {"ETag": self.etag, "Cache-Control": "private, no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = formatdate(self.last_modified.timestamp(), usegmt=True)
+        return headers
+
+    def not_modified(self, request: Request) -> Optional[Response]:
+        """
+        If-None-Match가 일치하면 304 응답을, 아니면 None을 반환합니다.
+        삭제는 최대 시각을 바꾸지 않으므로 If-Modified-Since만으로는 304를 반환하지 않습니다.
+        """
+        if etag_matches(request, self.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers())
+        return None
+
+    def apply(self, response: Response):
+        response.headers.update(self.headers())
+
+async def list_validator(db: DbSession, model, user_id: int) -> ListValidator:
+    """
+    ORM 객체를 만들지 않고 집계 쿼리 한 번으로 사용자의 목록 검증자를 계산합니다.
+    """
+    ts = timestamp_column(model)
+    count, max_id, max_ts = (await db.execute(
+        select(func.count(), func.max(model.id), func.max(ts)).where(model.user_id == user_id)
+    )).one()
+    stamp = max_ts.isoformat() if max_ts else ""
+    return ListValidator(etag=f'W/"{model.__tablename__}-{user_id}-{count}-{max_id or 0}-{stamp}"', last_modified=max_ts)
+
+def immutable_etag(bucket: str, filename: str) -> str:
+    return '"' + hashlib.blake2b(f"{bucket}/{filename}".encode(), digest_size=12).hexdigest() + '"'
+
+def immutable_headers(bucket: str, filename: str) -> Dict[str, str]:
+    """
+    uuid 기반으로 저장되어 내용이 바뀌지 않는 이미지 응답(파일/리다이렉트)의 캐시 헤더입니다.
+    """
+    return {
+        "ETag": immutable_etag(bucket, filename),
+        "Cache-Control": f"public, max-age={settings.IMAGE_CACHE_MAX_AGE_SECONDS}, immutable",
+    }
+
+def immutable_not_modified(request: Request, bucket: str, filename: str) -> Optional[Response]:
+    """
+    불변 이미지에 대한 재검증 요청이면 304 응답을 반환합니다. 내용이 바뀌지 않으므로 If-Modified-Since도 그대로 인정합니다.
+    """
+    if etag_matches(request, immutable_etag(bucket, filename)) or (
+        "if-none-match" not in request.headers and "if-modified-since" in request.headers
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=immutable_headers(bucket, filename))
+    return None
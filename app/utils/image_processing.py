@@ -0,0 +1,128 @@
+import hashlib
+import io
+import os
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Hashable, Iterable, List, Optional
+
+from cachetools import LRUCache
+from PIL import Image, ImageOps
+
+from app.config import settings
+
+FORMAT_MIME_TYPES = {
+    "JPEG": "image/jpeg",
+    "WEBP": "image/webp",
+    "PNG": "image/png",
+}
+
+@dataclass(frozen=True)
+class NormalizedImage:
+    data: bytes
+    mime_type: str
+    sha256: str
+
+def normalize_image(image_bytes: bytes | memoryview, max_edge: int, image_format: str, quality: int) -> NormalizedImage:
+    """
+    EXIF 회전을 적용하고 긴 변을 max_edge 이하로 줄인 뒤 지정한 포맷으로 다시 인코딩합니다.
+    """
+    image_format = image_format.upper()
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        # JPEG는 디코딩 단계에서 1/2, 1/4 ... 로 줄여 읽어 전체 해상도 디코딩을 피합니다.
+        image.draft("RGB", (max_edge, max_edge))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+        if image_format == "JPEG" and image.mode != "RGB":
+            # JPEG는 알파 채널이 없으므로 투명 영역을 흰 배경으로 채웁니다.
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            rgba = image.convert("RGBA")
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            image = background
+
+        output = io.BytesIO()
+        image.save(output, image_format, quality=quality)
+
+    data = output.getvalue()
+    return NormalizedImage(
+        data=data,
+        mime_type=FORMAT_MIME_TYPES.get(image_format, "application/octet-stream"),
+        sha256=hashlib.sha256(data).hexdigest(),
+    )
+
+def thumbnail_filename(filename: str, width: int) -> str:
+    """
+    원본 파일 옆에 저장되는 썸네일 파일 이름입니다. 예) 20250101_abcd.png -> 20250101_abcd_w320.webp
+    """
+    stem = os.path.splitext(filename)[0]
+    return f"{stem}_w{width}.webp"
+
+def format_thumbnail_widths(widths: Iterable[int]) -> str:
+    """
+    저장된 썸네일 폭 목록을 레코드의 thumbnail_widths 컬럼 값으로 바꿉니다. 예) [320, 160] -> "160,320"
+    """
+    return ",".join(str(width) for width in sorted(widths))
+
+def parse_thumbnail_widths(value: Optional[str]) -> List[int]:
+    """
+    thumbnail_widths 컬럼 값을 폭 목록으로 바꿉니다. 빈 값이면 썸네일이 없는 레코드입니다.
+    """
+    return [int(width) for width in value.split(",")] if value else []
+
+def make_thumbnails(source: bytes | memoryview | BinaryIO, widths: Iterable[int], quality: int = 80) -> Dict[int, bytes]:
+    """
+    지정한 가로 폭마다 WebP 썸네일을 만듭니다. 원본보다 좁아지지 않는 폭은 srcset의 폭 표기가 틀리므로 만들지 않습니다.
+    """
+    if not hasattr(source, "read"):
+        source = io.BytesIO(source)
+    widths = sorted(set(widths), reverse=True)
+    thumbnails = {}
+    with Image.open(source) as image:
+        image.draft("RGB", (widths[0], widths[0]))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        # 큰 폭부터 차례로 줄이면 매번 원본에서 리샘플링하는 것보다 빠릅니다.
+        for width in widths:
+            if width >= image.width:
+                continue
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, "WEBP", quality=quality)
+            thumbnails[width] = output.getvalue()
+    return thumbnails
+
+class NormalizedImageCache:
+    """
+    사진 ID별 정규화 결과를 보관하는 LRU 캐시입니다. 전체 크기는 바이트 기준으로 제한됩니다.
+    """
+    def __init__(self, max_bytes: int):
+        self._cache: LRUCache = LRUCache(maxsize=max_bytes, getsizeof=lambda image: len(image.data))
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[NormalizedImage]:
+        image = self._cache.get(key)
+        if image is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return image
+
+    def put(self, key: Hashable, image: NormalizedImage):
+        # 캐시 한도보다 큰 항목은 저장하지 않습니다.
+        if len(image.data) <= self._cache.maxsize:
+            self._cache[key] = image
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._cache),
+            "bytes": self._cache.currsize,
+            "max_bytes": self._cache.maxsize,
+        }
+
+normalized_image_cache = NormalizedImageCache(max_bytes=settings.VTON_INPUT_CACHE_MAX_BYTES)
@@ -0,0 +1,177 @@
+import secrets
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+# 가상 피팅 단계는 수 ms(캐시/DB)부터 수십 초(모델 호출)까지 걸립니다.
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status code", ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response body is sent", ("method", "route"),
+    buckets=STAGE_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served")
+TRYON_STAGE_SECONDS = Histogram(
+    "tryon_stage_duration_seconds", "Try-on latency per stage", ("stage",), buckets=STAGE_BUCKETS
+)
+STORAGE_BYTES = Counter(
+    "storage_bytes_total", "Bytes transferred to/from storage per bucket", ("bucket", "direction")
+)
+
+# 라벨 조합을 미리 만들어 두면 관측할 때 labels() 조회 비용이 들지 않습니다.
+_stage_histograms: Dict[str, Histogram] = {}
+
+@contextmanager
+def observe_stage(stage: str):
+    """
+    with 블록의 소요 시간을 tryon_stage_duration_seconds{stage=...}에 기록합니다. 예외가 나도 기록합니다.
+    """
+    histogram = _stage_histograms.get(stage)
+    if histogram is None:
+        histogram = _stage_histograms[stage] = TRYON_STAGE_SECONDS.labels(stage)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - started)
+
+def record_storage_bytes(bucket: str, direction: str, size: int):
+    """
+    저장소로 보낸(out)/받은(in) 바이트 수를 기록합니다.
+    """
+    STORAGE_BYTES.labels(bucket, direction).inc(size)
+
+class MetricsMiddleware:
+    """
+    요청 수와 지연 시간을 경로 템플릿(/tryon/jobs/{job_id}) 단위로 기록하는 ASGI 미들웨어입니다.
+    실제 경로 대신 템플릿을 라벨로 쓰므로 라벨 조합 수가 API 수를 넘지 않습니다.
+    """
+    def __init__(self, app: ASGIApp, exclude_paths: tuple = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            # 라우터가 매칭한 APIRoute를 scope에 남깁니다. 정적 파일이나 404는 하나의 라벨로 묶습니다.
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "other"
+            method = scope["method"]
+            HTTP_REQUESTS.labels(method, template, str(status_code)).inc()
+            HTTP_REQUEST_SECONDS.labels(method, template).observe(time.perf_counter() - started)
+
+class RuntimeStatsCollector:
+    """
+    스크레이프 시점에 DB 커넥션 풀, 모델 호출 동시성, 작업 큐, 서킷 브레이커 상태를 읽어 게이지로 내보냅니다.
+    요청 처리 경로에서는 아무것도 기록하지 않으므로 비용이 들지 않습니다.
+    """
+    BREAKER_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+    def describe(self):
+        # 등록할 때 collect()가 호출되어 아직 로드 중인 모듈을 import하지 않도록 빈 목록을 돌려줍니다.
+        return []
+
+    def collect(self):
+        # 순환 import를 피하기 위해 수집할 때 가져옵니다.
+        from app.database import async_engine, engine
+        from app.repositories.vton_repository import vton_resilience
+        from app.services.tryon_job_service import tryon_job_manager
+        from app.services.vton_service import vton_engines
+        from app.utils.storage_backend import storage_resilience
+
+        pool_size = GaugeMetricFamily("db_pool_size", "Configured DB connection pool size", labels=("engine",))
+        pool_checked_out = GaugeMetricFamily("db_pool_checked_out", "DB connections currently in use", labels=("engine",))
+        pool_checked_in = GaugeMetricFamily("db_pool_checked_in", "Idle DB connections in the pool", labels=("engine",))
+        pool_overflow = GaugeMetricFamily("db_pool_overflow", "DB connections opened beyond pool_size", labels=("engine",))
+        engines = {"sync": engine}
+        if async_engine is not None:
+            engines["async"] = async_engine.sync_engine
+        for name, db_engine in engines.items():
+            pool = db_engine.pool
+            # QueuePool 계열만 크기 정보를 제공합니다. (SQLite 메모리 DB 등은 제외)
+            if hasattr(pool, "checkedout"):
+                pool_size.add_metric([name], pool.size())
+                pool_checked_out.add_metric([name], pool.checkedout())
+                pool_checked_in.add_metric([name], pool.checkedin())
+                pool_overflow.add_metric([name], max(0, pool.overflow()))
+        yield from (pool_size, pool_checked_out, pool_checked_in, pool_overflow)
+
+        in_flight = GaugeMetricFamily("vton_in_flight", "Model calls currently running", labels=("engine",))
+        waiting = GaugeMetricFamily("vton_waiting", "Model calls waiting for an admission slot", labels=("engine",))
+        limit = GaugeMetricFamily("vton_concurrency_limit", "Current model call concurrency limit", labels=("engine",))
+        rejected = CounterMetricFamily(
+            "vton_admission_rejected", "Model calls rejected because the admission queue was full", labels=("engine",)
+        )
+        fallbacks = CounterMetricFamily("vton_fallback_calls", "Try-ons served by the fallback engine", labels=("engine",))
+        for name, engine in vton_engines.stats()["engines"].items():
+            limiter = engine["admission"]
+            in_flight.add_metric([name], limiter["in_flight"])
+            waiting.add_metric([name], limiter["waiting"])
+            limit.add_metric([name], limiter["limit"])
+            rejected.add_metric([name], limiter["rejected"])
+            fallbacks.add_metric([name], engine["fallback_calls"])
+        yield from (in_flight, waiting, limit, rejected, fallbacks)
+
+        jobs = tryon_job_manager.stats()
+        yield GaugeMetricFamily("tryon_queue_depth", "Try-on jobs waiting in the queue", value=jobs["queue_depth"])
+        yield GaugeMetricFamily("tryon_jobs_running", "Try-on jobs being processed by workers", value=jobs["running"])
+        yield CounterMetricFamily("tryon_jobs_rejected", "Try-on jobs rejected because the queue was full", value=jobs["rejected"])
+
+        breaker_state = GaugeMetricFamily(
+            "dependency_circuit_state", "Circuit breaker state (0=closed, 1=half_open, 2=open)", labels=("dependency",)
+        )
+        calls = CounterMetricFamily("dependency_calls", "Calls made through the resilience layer", labels=("dependency",))
+        retries = CounterMetricFamily("dependency_retries", "Retried dependency calls", labels=("dependency",))
+        hedges = CounterMetricFamily("dependency_hedges", "Hedged duplicate requests", labels=("dependency",))
+        short_circuits = CounterMetricFamily(
+            "dependency_short_circuits", "Calls rejected while the circuit was open", labels=("dependency",)
+        )
+        for dependency in (vton_resilience, storage_resilience):
+            stats = dependency.stats()
+            breaker_state.add_metric([dependency.name], self.BREAKER_STATES[stats["state"]])
+            calls.add_metric([dependency.name], stats["calls"])
+            retries.add_metric([dependency.name], stats["retries"])
+            hedges.add_metric([dependency.name], stats["hedges"])
+            short_circuits.add_metric([dependency.name], stats["short_circuits"])
+        yield from (breaker_state, calls, retries, hedges, short_circuits)
+
+REGISTRY.register(RuntimeStatsCollector())
+
+async def metrics_response(request: Request) -> Response:
+    """
+    Prometheus 텍스트 형식으로 모든 지표를 응답합니다.
+    수집기가 이벤트 루프에서 바뀌는 상태(대기열, 최근 지연 목록)를 읽으므로 스레드 풀이 아닌 루프에서 실행합니다.
+    DB 풀, 서킷 브레이커, 대기열 상태가 드러나므로 METRICS_TOKEN이 설정되어 있으면 Bearer 토큰을 확인합니다.
+    """
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}".encode()
+        if not secrets.compare_digest(request.headers.get("authorization", "").encode(), expected):
+            return Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
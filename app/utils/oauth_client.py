@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import httpx
+from authlib.integrations.starlette_client import OAuth
+
+from app.config import settings
+from app.utils.singleflight import SingleFlight
+
+class GoogleOAuthClient:
+    """
+    프로세스 전체에서 하나만 만드는 Google OAuth 클라이언트입니다.
+    OIDC discovery 문서와 JWKS를 메모리에 보관하고, TTL이 지나면 기존 값으로 응답하면서 백그라운드에서 갱신합니다.
+    최초 로드만 요청이 기다리며, 동시에 들어온 요청은 한 번의 로드를 공유합니다.
+    """
+    def __init__(self, client_id: str, client_secret: str, discovery_url: str, metadata_ttl_seconds: int):
+        self.discovery_url = discovery_url
+        self.metadata_ttl_seconds = metadata_ttl_seconds
+        self.oauth = OAuth()
+        self.oauth.register(
+            name='google',
+            client_id=client_id,
+            client_secret=client_secret,
+            server_metadata_url=discovery_url,
+            client_kwargs={'scope': 'openid email profile'}
+        )
+        self._flight = SingleFlight()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    @property
+    def google(self):
+        return self.oauth.google
+
+    async def get_client(self):
+        """
+        discovery 문서와 JWKS가 준비된 Authlib 클라이언트를 반환합니다.
+        """
+        loaded_at = self.google.server_metadata.get("_loaded_at")
+        if loaded_at is None or "jwks" not in self.google.server_metadata:
+            await self._flight.do("refresh", self._refresh)
+        elif time.time() - loaded_at > self.metadata_ttl_seconds:
+            self._schedule_refresh()
+        return self.google
+
+    def prefetch(self):
+        """
+        시작 시 로그인 요청보다 먼저 메타데이터를 불러오도록 백그라운드 갱신을 예약합니다.
+        """
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+
+    async def _background_refresh(self):
+        try:
+            await self._flight.do("refresh", self._refresh)
+        except Exception as e:
+            # 갱신에 실패해도 기존 메타데이터로 계속 응답하고 다음 요청에서 다시 시도합니다.
+            logging.warning(f"Failed to refresh OIDC metadata from {self.discovery_url}: {e}")
+
+    async def _refresh(self):
+        try:
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.get(self.discovery_url)
+                response.raise_for_status()
+                metadata = response.json()
+                response = await client.get(metadata["jwks_uri"])
+                response.raise_for_status()
+                metadata["jwks"] = response.json()
+        except Exception:
+            self.refresh_failures += 1
+            raise
+        # Authlib은 _loaded_at이 있으면 discovery 문서를, jwks가 있으면 JWKS를 다시 받지 않습니다.
+        metadata["_loaded_at"] = time.time()
+        self.google.server_metadata = metadata
+        self.refreshes += 1
+
+    async def aclose(self):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+        self._refresh_task = None
+
+    def stats(self) -> dict:
+        loaded_at = self.google.server_metadata.get("_loaded_at")
+        return {
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "metadata_age_seconds": time.time() - loaded_at if loaded_at else None,
+            "metadata_ttl_seconds": self.metadata_ttl_seconds,
+        }
+
+google_oauth_client = GoogleOAuthClient(
+    client_id=settings.GOOGLE_CLIENT_ID,
+    client_secret=settings.GOOGLE_CLIENT_SECRET,
+    discovery_url=settings.GOOGLE_OIDC_DISCOVERY_URL,
+    metadata_ttl_seconds=settings.GOOGLE_OIDC_METADATA_TTL_SECONDS,
+)
+
+def get_google_oauth_client() -> GoogleOAuthClient:
+    return google_oauth_client
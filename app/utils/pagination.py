@@ -0,0 +1,75 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Select, tuple_
+
+from app.config import settings
+from app.database import DbSession
+
+T = TypeVar("T")
+
+# 커서 = 마지막으로 응답한 행의 (타임스탬프, id)
+CursorKey = Tuple[Optional[datetime], int]
+
+def timestamp_column(model):
+    """
+    목록 정렬에 쓰는 시각 컬럼입니다. (결과/사용자: created_at, 사진: uploaded_at)
+    """
+    return model.created_at if hasattr(model, "created_at") else model.uploaded_at
+
+def encode_cursor(timestamp: Optional[datetime], row_id: int) -> str:
+    raw = json.dumps([timestamp.isoformat() if timestamp else None, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> CursorKey:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(timestamp) if timestamp else None), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+@dataclass
+class PageParams:
+    limit: int
+    after: Optional[CursorKey] = None
+
+def page_params(
+    limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+) -> PageParams:
+    """
+    목록 API 공통 쿼리 파라미터(limit, cursor)를 받는 의존성입니다.
+    """
+    return PageParams(limit=limit, after=decode_cursor(cursor) if cursor else None)
+
+@dataclass
+class PageResult(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str]
+
+    def to_response(self, items: List[Any], page: PageParams) -> dict:
+        """
+        응답용으로 변환한 items로 schemas.Page 형태의 dict를 만듭니다.
+        """
+        return {"items": items, "next_cursor": self.next_cursor, "limit": page.limit}
+
+async def fetch_page(db: DbSession, stmt: Select, model, page: PageParams) -> PageResult[Any]:
+    """
+    (타임스탬프, id) 내림차순 키셋 페이지네이션으로 한 페이지를 조회합니다.
+    OFFSET과 달리 페이지 번호와 무관하게 인덱스에서 커서 위치부터 limit + 1개만 읽습니다.
+    """
+    ts = timestamp_column(model)
+    if page.after is not None:
+        stmt = stmt.where(tuple_(ts, model.id) < page.after)
+    stmt = stmt.order_by(ts.desc(), model.id.desc()).limit(page.limit + 1)
+    rows = list((await db.scalars(stmt)).all())
+    if len(rows) <= page.limit:
+        return PageResult(items=rows, next_cursor=None)
+    rows = rows[:page.limit]
+    last = rows[-1]
+    return PageResult(items=rows, next_cursor=encode_cursor(getattr(last, ts.key), last.id))
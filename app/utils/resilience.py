@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, TypeVar
+
+T = TypeVar("T")
+
+class CircuitOpenError(Exception):
+    """
+    의존 서비스의 서킷이 열려 있어 호출하지 않고 바로 실패한 요청입니다. API에서는 503과 Retry-After로 응답합니다.
+    """
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+class RetryPolicy:
+    """
+    지수 백오프에 full jitter를 적용한 재시도 정책입니다. attempts는 첫 시도를 포함한 최대 횟수입니다.
+    """
+    def __init__(self, attempts: int, base_delay_seconds: float, max_delay_seconds: float):
+        self.attempts = max(1, attempts)
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+
+    def backoff(self, retry: int) -> float:
+        # 동시에 실패한 호출들이 같은 시각에 다시 몰리지 않도록 0 ~ 상한 사이에서 고르게 뽑습니다.
+        return random.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * (2 ** retry)))
+
+class LatencyTracker:
+    """
+    최근 성공한 호출의 소요 시간으로 분위수를 계산합니다.
+    """
+    def __init__(self, window: int = 512):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def add(self, seconds: float):
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold번 쌓이면 열려서(open) reset_timeout_seconds 동안 호출을 바로 거절합니다.
+    시간이 지나면 반열림(half_open) 상태에서 한 번만 시험 호출을 보내고, 성공하면 닫고 실패하면 다시 엽니다.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.opens = 0
+        self.short_circuits = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_seconds:
+            return self.HALF_OPEN
+        return self._state
+
+    def before_call(self):
+        """
+        호출해도 되는지 확인합니다. 열려 있거나 시험 호출이 이미 나가 있으면 CircuitOpenError를 발생시킵니다.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = True
+            return
+        self.short_circuits += 1
+        retry_after = max(0.0, self.reset_timeout_seconds - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(f"{self.name} 서비스를 일시적으로 사용할 수 없습니다. 잠시 후 다시 시도해주세요.", retry_after=retry_after)
+
+    def record_success(self):
+        if self._state != self.CLOSED:
+            logging.info(f"Circuit breaker '{self.name}' closed")
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._probe_in_flight = False
+        self._consecutive_failures += 1
+        if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.opens += 1
+                logging.warning(f"Circuit breaker '{self.name}' opened after {self._consecutive_failures} consecutive failures")
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def record_ignored(self):
+        # 의존 서비스의 상태와 무관한 오류(404, 잘못된 입력 등)는 서킷 상태를 바꾸지 않고 시험 호출 자리만 돌려줍니다.
+        self._probe_in_flight = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "opens": self.opens,
+            "short_circuits": self.short_circuits,
+        }
+
+class ResilientDependency:
+    """
+    외부 의존 서비스(Vertex AI, Storage) 호출에 재시도, 헤징, 서킷 브레이커를 적용합니다.
+    is_transient는 일시적 장애로 보고 재시도/서킷 실패로 셀 오류를, is_unsent는 요청이 상대에게 전달되지 않은 오류를 판별합니다.
+    멱등하지 않은 호출은 is_unsent인 오류만 재시도합니다.
+    """
+    def __init__(
+        self,
+        name: str,
+        retry: RetryPolicy,
+        breaker: CircuitBreaker,
+        is_transient: Callable[[Exception], bool],
+        is_unsent: Callable[[Exception], bool] = lambda e: False,
+        hedge_min_delay_seconds: float = 0.05,
+        hedge_max_ratio: float = 0.0,
+        hedge_min_samples: int = 20,
+    ):
+        self.name = name
+        self.retry = retry
+        self.breaker = breaker
+        self.is_transient = is_transient
+        self.is_unsent = is_unsent
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds
+        self.hedge_max_ratio = hedge_max_ratio
+        self.hedge_min_samples = hedge_min_samples
+        self.latency = LatencyTracker()
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    async def call(
+        self,
+        operation: Callable[[], Awaitable[T]],
+        idempotent: bool = True,
+        hedge: bool = False,
+        retry: bool = True,
+    ) -> T:
+        """
+        operation을 호출합니다. 재시도할 때마다 operation()을 다시 호출하므로 매번 새 코루틴을 만들어야 합니다.
+        """
+        self.calls += 1
+        for attempt in range(self.retry.attempts):
+            self.breaker.before_call()
+            started = time.monotonic()
+            try:
+                result = await (self._hedged(operation) if hedge else operation())
+            except Exception as e:
+                transient = self.is_transient(e)
+                if transient:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_ignored()
+                retryable = retry and transient and (idempotent or self.is_unsent(e))
+                if not retryable or attempt == self.retry.attempts - 1:
+                    self.failures += 1
+                    raise
+                self.retries += 1
+                delay = self.retry.backoff(attempt)
+                logging.warning(f"{self.name} call failed ({type(e).__name__}: {e}), retry {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # 취소되면 시험 호출 자리를 돌려줍니다.
+                self.breaker.record_ignored()
+                raise
+            self.breaker.record_success()
+            self.latency.add(time.monotonic() - started)
+            return result
+
+    def _hedge_delay(self) -> Optional[float]:
+        if self.hedge_max_ratio <= 0 or len(self.latency) < self.hedge_min_samples:
+            return None
+        if self.hedges >= self.calls * self.hedge_max_ratio:
+            return None
+        return max(self.hedge_min_delay_seconds, self.latency.percentile(0.95))
+
+    async def _hedged(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """
+        첫 요청이 p95 지연을 넘기면 같은 요청을 한 번 더 보내고 먼저 성공한 응답을 씁니다. (읽기 전용 호출에만 사용)
+        헤지 요청 수는 전체 호출의 hedge_max_ratio 이하로 제한합니다.
+        """
+        delay = self._hedge_delay()
+        if delay is None:
+            return await operation()
+
+        tasks = {asyncio.ensure_future(operation())}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return done.pop().result()
+            self.hedges += 1
+            hedge_task = asyncio.ensure_future(operation())
+            tasks.add(hedge_task)
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.hedge_wins += task is hedge_task
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            **self.breaker.stats(),
+            "calls": self.calls,
+            "failures": self.failures,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "latency_seconds_p50": self.latency.percentile(0.5),
+            "latency_seconds_p95": self.latency.percentile(0.95),
+        }
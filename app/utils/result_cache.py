@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from cachetools import TTLCache
+
+from app.config import settings
+
+@dataclass(frozen=True)
+class CachedResult:
+    filename: str
+    thumbnail_widths: List[int]
+
+class TryonResultCache:
+    """
+    모델에 보내는 입력 이미지 내용(sha256)과 모델 설정으로 키를 만드는 가상 피팅 결과 캐시입니다.
+    값은 'result_photo' 버킷에 저장된 결과 파일 이름과 함께 저장된 썸네일 폭 목록입니다.
+    """
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(person_image_sha256: str, cloth_image_sha256: str, fitting_type: str,
+                 model_name: str, prompt_version: str) -> str:
+        return "|".join((
+            person_image_sha256,
+            cloth_image_sha256,
+            fitting_type,
+            model_name,
+            prompt_version,
+        ))
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        result = self._cache.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, filename: str, thumbnail_widths: List[int]):
+        self._cache[key] = CachedResult(filename, thumbnail_widths)
+
+    def invalidate(self, key: str):
+        self._cache.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": self._cache.currsize,
+            "maxsize": self._cache.maxsize,
+            "ttl_seconds": self._cache.ttl,
+        }
+
+tryon_result_cache = TryonResultCache(
+    maxsize=settings.TRYON_RESULT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.TRYON_RESULT_CACHE_TTL_SECONDS,
+)
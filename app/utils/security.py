@@ -3,12 +3,11 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import get_db
+from app.database import DbSession, get_db
 from app.repositories.user_repository import UserRepository # This will be created next
-from app import models
+from app.utils.auth_cache import UserPrincipal, token_claims_cache, user_principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token") # tokenUrl is not used in this flow, but is required
 
@@ -22,22 +21,37 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
+async def get_current_user(token: str = Depends(oauth2_scheme), db: DbSession = Depends(get_db)) -> UserPrincipal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
+    # 검증된 토큰과 사용자 정보를 캐시하여 반복 요청에서는 JWT 디코딩과 DB 조회를 건너뜁니다.
+    user_id = token_claims_cache.get(token)
+    if user_id is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            subject = payload.get("sub")
+            if subject is None:
+                raise credentials_exception
+            user_id = int(subject)
+        except (JWTError, ValueError):
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_id(user_id=int(user_id))
+        token_claims_cache.put(token, user_id, payload.get("exp"))
+
+    user = user_principal_cache.get(user_id)
     if user is None:
-        raise credentials_exception
-    return user
\ No newline at end of file
+        generation = user_principal_cache.generation(user_id)
+        user_repo = UserRepository(db)
+        db_user = await user_repo.get_by_id(user_id=user_id)
+        if db_user is None:
+            raise credentials_exception
+        user = UserPrincipal.from_model(db_user)
+        user_principal_cache.put(user, generation)
+        # /tryon처럼 응답 전에 오래 기다리는 요청이 조회 트랜잭션으로 커넥션을 붙잡고 있지 않도록 끝냅니다.
+        await db.commit()
+
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+    return user
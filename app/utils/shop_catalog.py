@@ -0,0 +1,119 @@
+import hashlib
+import json
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app import schemas
+from app.config import settings
+from app.utils.pagination import CursorKey, PageParams, encode_cursor
+from app.utils.singleflight import SingleFlight
+
+ShopPage = schemas.Page[schemas.Photo]
+
+@dataclass(frozen=True)
+class CatalogPage:
+    body: bytes # 그대로 응답하는 JSON 바이트
+    etag: str
+    empty: bool
+
+def _sort_key(item: Dict[str, Any]) -> CursorKey:
+    return (item["uploaded_at"] or datetime.min, item["id"])
+
+class ShopCatalogSnapshot:
+    """
+    한 시점의 상점 옷 목록입니다. 항목은 응답용 dict로 변환해 보관하고,
+    페이지별 JSON 바이트는 처음 요청될 때 한 번만 직렬화해 재사용합니다.
+    """
+    def __init__(self, version: int, items: List[Dict[str, Any]]):
+        self.version = version
+        self.items = items # (uploaded_at, id) 내림차순
+        self.built_at = time.monotonic()
+        self._ascending_keys = [_sort_key(item) for item in reversed(items)]
+        self._pages: Dict[Tuple[int, Optional[CursorKey]], CatalogPage] = {}
+        # 내용에서 만든 값이므로 같은 목록을 가진 워커끼리는 ETag가 같습니다.
+        content = json.dumps(items, default=str, sort_keys=True).encode()
+        self.digest = hashlib.blake2b(content, digest_size=12).hexdigest()
+
+    def page(self, page: PageParams) -> CatalogPage:
+        key = (page.limit, page.after)
+        cached = self._pages.get(key)
+        if cached is not None:
+            return cached
+
+        start = 0
+        if page.after is not None:
+            after = (page.after[0] or datetime.min, page.after[1])
+            # 커서보다 작은 키의 개수 = 내림차순 목록에서 커서 뒤에 오는 항목 수
+            start = len(self.items) - bisect_left(self._ascending_keys, after)
+        end = start + page.limit
+        items = self.items[start:end]
+        next_cursor = None
+        if end < len(self.items):
+            last = self.items[end - 1]
+            next_cursor = encode_cursor(last["uploaded_at"], last["id"])
+
+        body = ShopPage(items=items, next_cursor=next_cursor, limit=page.limit).model_dump_json().encode()
+        catalog_page = CatalogPage(body=body, etag=f'"shop-{self.digest}"', empty=not items)
+        if len(self._pages) < settings.SHOP_CATALOG_MAX_CACHED_PAGES:
+            self._pages[key] = catalog_page
+        return catalog_page
+
+class ShopCatalog:
+    """
+    상점(SHOP_USER_ID) 옷 목록 스냅샷을 메모리에 보관합니다.
+    상점 계정의 업로드나 관리자 삭제가 invalidate로 버전을 올리면 다음 요청에서 한 번만 다시 만듭니다.
+    invalidate는 현재 프로세스에만 적용되므로 다른 uvicorn 워커에는 TTL이 지나야 반영됩니다.
+    """
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._snapshot: Optional[ShopCatalogSnapshot] = None
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.rebuilds = 0
+        self.invalidations = 0
+
+    async def get_snapshot(self, load: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> ShopCatalogSnapshot:
+        """
+        현재 버전의 스냅샷을 반환합니다. 없거나 오래되었으면 load로 목록을 읽어 다시 만듭니다.
+        """
+        snapshot = self._snapshot
+        if (
+            snapshot is not None
+            and snapshot.version == self.version
+            and time.monotonic() - snapshot.built_at < self.ttl_seconds
+        ):
+            self.hits += 1
+            return snapshot
+        return await self._flight.do(self.version, lambda: self._rebuild(load))
+
+    async def _rebuild(self, load: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> ShopCatalogSnapshot:
+        version = self.version
+        snapshot = ShopCatalogSnapshot(version, await load())
+        self.rebuilds += 1
+        # 읽는 도중 invalidate되었다면 이 스냅샷은 이번 요청에만 쓰고 보관하지 않습니다.
+        if version == self.version:
+            self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self):
+        self.version += 1
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "version": self.version,
+            "hits": self.hits,
+            "rebuilds": self.rebuilds,
+            "invalidations": self.invalidations,
+            "items": len(snapshot.items) if snapshot else 0,
+            "cached_pages": len(snapshot._pages) if snapshot else 0,
+            "age_seconds": time.monotonic() - snapshot.built_at if snapshot else None,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+shop_catalog = ShopCatalog(ttl_seconds=settings.SHOP_CATALOG_TTL_SECONDS)
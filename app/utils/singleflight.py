@@ -0,0 +1,35 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 비동기 호출을 하나로 합칩니다.
+    먼저 들어온 호출만 실제로 실행되고, 나머지는 그 결과(또는 예외)를 공유합니다.
+    """
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.executed = 0
+        self.collapsed = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            # 별도 Task로 실행하므로 먼저 온 요청이 취소되어도 기다리는 쪽의 작업은 계속됩니다.
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.executed += 1
+        else:
+            self.collapsed += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+    def stats(self) -> dict:
+        return {
+            "executed": self.executed,
+            "collapsed": self.collapsed,
+            "in_flight": len(self._calls),
+        }
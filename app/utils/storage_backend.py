@@ -0,0 +1,298 @@
+import os
+import re
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+import httpx
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.utils.resilience import CircuitBreaker, ResilientDependency, RetryPolicy
+
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# uuid 기반 저장 파일명은 인코딩이 필요 없으므로 그 외의 이름만 quote 합니다.
+_URL_SAFE_FILENAME = re.compile(r"[A-Za-z0-9._-]+")
+
+def _url_filename(filename: str) -> str:
+    return filename if _URL_SAFE_FILENAME.fullmatch(filename) else quote(filename)
+
+FileContent = bytes | memoryview | BinaryIO
+
+# Custom Exceptions
+class StorageError(Exception):
+    pass
+
+class StorageNotFoundError(StorageError):
+    pass
+
+class StorageUnavailableError(StorageError):
+    pass
+
+# 요청 시간 초과, 한도 초과, 서버 오류는 다시 시도하면 성공할 수 있습니다.
+_TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+def is_transient_storage_error(error: Exception) -> bool:
+    """
+    연결 오류나 5xx처럼 다시 시도하면 성공할 수 있는 저장소 오류인지 확인합니다.
+    """
+    return isinstance(error, (httpx.TransportError, StorageUnavailableError))
+
+def is_unsent_storage_error(error: Exception) -> bool:
+    """
+    연결 자체를 맺지 못해 요청이 저장소에 전달되지 않은 오류인지 확인합니다. 멱등하지 않은 요청도 재시도할 수 있습니다.
+    """
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+class StorageBackend(ABC):
+    """
+    이미지 파일 저장소 인터페이스입니다. 입출력 메서드는 모두 비동기입니다.
+    """
+    # 로컬 파일을 직접 서빙할 수 있는 저장소인지 여부 (디스크 캐시 불필요, 리다이렉트 대신 파일 응답)
+    is_local = False
+
+    @abstractmethod
+    async def get(self, bucket: str, path: str) -> bytes:
+        ...
+
+    @abstractmethod
+    async def put(self, bucket: str, path: str, data: FileContent, content_type: str, upsert: bool = False):
+        ...
+
+    @abstractmethod
+    async def delete(self, bucket: str, paths: Iterable[str]):
+        ...
+
+    @abstractmethod
+    async def copy(self, bucket: str, from_path: str, to_path: str):
+        ...
+
+    @abstractmethod
+    def public_url(self, bucket: str, path: str) -> str:
+        ...
+
+    def public_urls(self, bucket: str, paths: Iterable[str]) -> List[Optional[str]]:
+        return [self.public_url(bucket, path) if path else None for path in paths]
+
+    def local_path(self, bucket: str, path: str) -> Optional[str]:
+        return None
+
+    async def aclose(self):
+        pass
+
+async def _iter_file(file: BinaryIO):
+    while chunk := await run_in_threadpool(file.read, STREAM_CHUNK_SIZE):
+        yield chunk
+
+def _file_size(file: BinaryIO) -> int:
+    position = file.tell()
+    file.seek(0, os.SEEK_END)
+    size = file.tell() - position
+    file.seek(position)
+    return size
+
+class SupabaseStorageBackend(StorageBackend):
+    """
+    Supabase Storage REST API를 keep-alive 연결 풀을 가진 httpx.AsyncClient 하나로 호출합니다.
+    """
+    def __init__(self, url: str, key: str, max_connections: int, timeout_seconds: float):
+        self.storage_url = f"{url.rstrip('/')}/storage/v1"
+        self._headers = {"Authorization": f"Bearer {key}", "apikey": key}
+        self._limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._timeout = httpx.Timeout(timeout_seconds)
+        self._client: Optional[httpx.AsyncClient] = None
+        # 공개 URL = {storage_url}/object/public/{bucket}/{path}, 버킷별 접두사는 한 번만 만듭니다.
+        self._public_prefixes: Dict[str, str] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.storage_url,
+                headers=self._headers,
+                limits=self._limits,
+                timeout=self._timeout,
+            )
+        return self._client
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response, bucket: str, path: str):
+        if response.is_success:
+            return
+        # Supabase는 없는 객체에 대해 404 또는 statusCode "404"를 담은 400을 돌려줍니다.
+        if response.status_code == 404 or (response.status_code == 400 and '"404"' in response.text):
+            raise StorageNotFoundError(f"{bucket}/{path} not found")
+        if response.status_code in _TRANSIENT_STATUS_CODES:
+            raise StorageUnavailableError(f"Supabase({bucket}) {response.status_code}: {response.text}")
+        raise StorageError(f"Supabase({bucket}) {response.status_code}: {response.text}")
+
+    async def get(self, bucket: str, path: str) -> bytes:
+        response = await self.client.get(f"/object/{bucket}/{path}")
+        self._raise_for_status(response, bucket, path)
+        return response.content
+
+    async def put(self, bucket: str, path: str, data: FileContent, content_type: str, upsert: bool = False):
+        headers = {"content-type": content_type, "x-upsert": "true" if upsert else "false"}
+        if hasattr(data, "read"):
+            # 파일 객체는 메모리에 올리지 않고 청크 단위로 전송합니다.
+            headers["content-length"] = str(_file_size(data))
+            content = _iter_file(data)
+        else:
+            content = bytes(data) if isinstance(data, memoryview) else data
+        response = await self.client.post(f"/object/{bucket}/{path}", content=content, headers=headers)
+        self._raise_for_status(response, bucket, path)
+
+    async def delete(self, bucket: str, paths: Iterable[str]):
+        paths = list(paths)
+        if not paths:
+            return
+        response = await self.client.request("DELETE", f"/object/{bucket}", json={"prefixes": paths})
+        self._raise_for_status(response, bucket, ",".join(paths))
+
+    async def copy(self, bucket: str, from_path: str, to_path: str):
+        response = await self.client.post(
+            "/object/copy",
+            json={"bucketId": bucket, "sourceKey": from_path, "destinationKey": to_path},
+        )
+        self._raise_for_status(response, bucket, from_path)
+
+    def _public_prefix(self, bucket: str) -> str:
+        prefix = self._public_prefixes.get(bucket)
+        if prefix is None:
+            prefix = self._public_prefixes[bucket] = f"{self.storage_url}/object/public/{quote(bucket, safe='')}/"
+        return prefix
+
+    def public_url(self, bucket: str, path: str) -> str:
+        return self._public_prefix(bucket) + _url_filename(path)
+
+    def public_urls(self, bucket: str, paths: Iterable[str]) -> List[Optional[str]]:
+        prefix = self._public_prefix(bucket)
+        return [prefix + _url_filename(path) if path else None for path in paths]
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+# 버킷 -> (로컬 디렉터리, /images/{category} 경로의 카테고리)
+LOCAL_BUCKETS = {
+    "person_photo": (settings.PERSON_RESOURCE_DIR, "persons"),
+    "cloth_photo": (settings.CLOTH_RESOURCE_DIR, "clothes"),
+    "result_photo": (settings.RESULT_RESOURCE_DIR, "results"),
+}
+
+def _write_atomic(target: str, data: FileContent):
+    directory = os.path.dirname(target)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if hasattr(data, "read"):
+                shutil.copyfileobj(data, f, STREAM_CHUNK_SIZE)
+            else:
+                f.write(data)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class LocalStorageBackend(StorageBackend):
+    """
+    *_RESOURCE_DIR 디렉터리에 파일을 저장하는 저장소입니다. 테스트와 단일 서버 배포용입니다.
+    공개 URL은 /images/{category}/{filename} 이며, 이 경로에서 파일을 직접 응답합니다.
+    """
+    is_local = True
+
+    def __init__(self, buckets: Dict[str, tuple]):
+        self.buckets = buckets
+        for directory, _ in buckets.values():
+            os.makedirs(directory, exist_ok=True)
+
+    def local_path(self, bucket: str, path: str) -> Optional[str]:
+        entry = self.buckets.get(bucket)
+        # 경로 조작 공격 방지를 위한 보안 검사
+        if not entry or not path or ".." in path or "/" in path or "\\" in path:
+            return None
+        return os.path.join(entry[0], path)
+
+    def _require_path(self, bucket: str, path: str) -> str:
+        local_path = self.local_path(bucket, path)
+        if local_path is None:
+            raise StorageError(f"Invalid storage path: {bucket}/{path}")
+        return local_path
+
+    async def get(self, bucket: str, path: str) -> bytes:
+        local_path = self._require_path(bucket, path)
+        try:
+            return await run_in_threadpool(_read_file, local_path)
+        except FileNotFoundError:
+            raise StorageNotFoundError(f"{bucket}/{path} not found")
+
+    async def put(self, bucket: str, path: str, data: FileContent, content_type: str, upsert: bool = False):
+        local_path = self._require_path(bucket, path)
+        if not upsert and os.path.exists(local_path):
+            raise StorageError(f"{bucket}/{path} already exists")
+        await run_in_threadpool(_write_atomic, local_path, data)
+
+    async def delete(self, bucket: str, paths: Iterable[str]):
+        for path in paths:
+            local_path = self._require_path(bucket, path)
+            try:
+                os.remove(local_path)
+            except FileNotFoundError:
+                pass
+
+    async def copy(self, bucket: str, from_path: str, to_path: str):
+        source = self._require_path(bucket, from_path)
+        target = self._require_path(bucket, to_path)
+        try:
+            await run_in_threadpool(shutil.copyfile, source, target)
+        except FileNotFoundError:
+            raise StorageNotFoundError(f"{bucket}/{from_path} not found")
+
+    def public_url(self, bucket: str, path: str) -> str:
+        _, category = self.buckets[bucket]
+        return f"/images/{category}/{_url_filename(path)}"
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+def create_storage_backend() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorageBackend(LOCAL_BUCKETS)
+    if settings.STORAGE_BACKEND == "supabase":
+        return SupabaseStorageBackend(
+            url=settings.SUPABASE_URL,
+            # Service Role Key bypasses RLS.
+            key=settings.SUPABASE_SERVICE_ROLE_KEY or settings.SUPABASE_KEY,
+            max_connections=settings.STORAGE_MAX_CONNECTIONS,
+            timeout_seconds=settings.STORAGE_TIMEOUT_SECONDS,
+        )
+    raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+
+storage_backend = create_storage_backend()
+
+def get_storage_backend() -> StorageBackend:
+    return storage_backend
+
+storage_resilience = ResilientDependency(
+    name="storage",
+    retry=RetryPolicy(
+        attempts=settings.STORAGE_RETRY_ATTEMPTS,
+        base_delay_seconds=settings.STORAGE_RETRY_BASE_DELAY_SECONDS,
+        max_delay_seconds=settings.STORAGE_RETRY_MAX_DELAY_SECONDS,
+    ),
+    breaker=CircuitBreaker(
+        "storage",
+        failure_threshold=settings.STORAGE_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout_seconds=settings.STORAGE_BREAKER_RESET_SECONDS,
+    ),
+    is_transient=is_transient_storage_error,
+    is_unsent=is_unsent_storage_error,
+    hedge_min_delay_seconds=settings.STORAGE_HEDGE_MIN_DELAY_SECONDS,
+    hedge_max_ratio=settings.STORAGE_HEDGE_MAX_RATIO,
+)
@@ -0,0 +1,363 @@
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+
+import httpx
+from sqlalchemy import event
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+class Trace:
+    """
+    요청 하나에서 만든 span들을 모읍니다. 열린 span과 보류(hold)가 모두 끝나면 내보냅니다.
+    """
+    def __init__(self, trace_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.spans: List["Span"] = []
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        with self._lock:
+            self._pending += 1
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+            done = self._pending == 0
+        if done and self.sampled:
+            trace_exporter.add(self.spans)
+
+class Span:
+    __slots__ = ("trace", "name", "kind", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    # OTLP SpanKind
+    INTERNAL = 1
+    SERVER = 2
+
+    def __init__(self, trace: Trace, name: str, parent_id: Optional[str], attributes: Dict[str, Any],
+                 start_ns: Optional[int] = None, kind: int = INTERNAL):
+        self.trace = trace
+        self.kind = kind
+        self.name = name
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        trace._acquire()
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def end(self, error: Optional[BaseException] = None, end_ns: Optional[int] = None):
+        if self.end_ns is not None:
+            return
+        self.end_ns = end_ns or time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        self.trace.spans.append(self)
+        self.trace._release()
+
+    def child(self, name: str, start_ns: Optional[int] = None, **attributes) -> "Span":
+        return Span(self.trace, name, self.span_id, attributes, start_ns)
+
+    def hold(self) -> "SpanHandle":
+        """
+        다른 태스크(작업 큐 워커 등)에서 이어서 기록할 수 있도록 trace를 열어 둔 핸들을 반환합니다.
+        """
+        self.trace._acquire()
+        return SpanHandle(self)
+
+class SpanHandle:
+    def __init__(self, span: Span):
+        self.span = span
+
+    def release(self):
+        self.span.trace._release()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+@contextmanager
+def start_span(name: str, **attributes):
+    """
+    현재 span의 자식 span을 엽니다. 요청 밖(스크립트, 백그라운드 작업)에서는 아무것도 기록하지 않습니다.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    span = parent.child(name, **attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.end(error=e)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+def hold_current_span() -> Optional[SpanHandle]:
+    span = _current_span.get()
+    return span.hold() if span is not None else None
+
+@contextmanager
+def resume_span(handle: Optional[SpanHandle], name: str, **attributes):
+    """
+    hold_current_span()으로 받은 핸들 아래에 새 span을 열고, 끝나면 핸들을 놓습니다.
+    """
+    if handle is None:
+        yield None
+        return
+    token = _current_span.set(handle.span)
+    try:
+        with start_span(name, **attributes) as span:
+            yield span
+    finally:
+        _current_span.reset(token)
+        handle.release()
+
+def record_span(name: str, start_ns: int, end_ns: int, **attributes):
+    """
+    이미 지난 구간(예: 큐 대기)을 현재 span의 자식으로 기록합니다.
+    """
+    parent = _current_span.get()
+    if parent is not None:
+        parent.child(name, start_ns=start_ns, **attributes).end(end_ns=end_ns)
+
+# Server-Timing 항목 = span 이름의 첫 마디 (db.query -> db, storage.get -> storage)
+def server_timing(trace: Trace, root: Span) -> str:
+    totals: Dict[str, List[float]] = {}
+    for span in list(trace.spans):
+        if span is root:
+            continue
+        total = totals.setdefault(span.name.split(".", 1)[0], [0.0, 0])
+        total[0] += span.duration_ms
+        total[1] += 1
+    entries = [f'{name};dur={ms:.1f};desc="{count} spans"' for name, (ms, count) in totals.items()]
+    entries.append(f"total;dur={root.duration_ms:.1f}")
+    return ", ".join(entries)
+
+def _parse_traceparent(value: Optional[str]):
+    # W3C traceparent: 00-<trace_id 32hex>-<parent_id 16hex>-<flags 2hex>
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16), int(parts[3], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], int(parts[3], 16) & 1 == 1
+
+class TracingMiddleware:
+    """
+    요청마다 루트 span을 만들고, 응답 헤더에 단계별 소요 시간(Server-Timing)과 trace ID(X-Trace-Id)를 붙입니다.
+    traceparent 헤더가 오면 그 trace를 이어서 기록합니다.
+    """
+    def __init__(self, app: ASGIApp, sample_rate: float, timing_allow_origin: Optional[str] = None):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.timing_allow_origin = timing_allow_origin
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = _parse_traceparent(dict(scope["headers"]).get(b"traceparent", b"").decode("latin-1"))
+        if incoming:
+            trace_id, parent_id, sampled = incoming
+        else:
+            trace_id, parent_id, sampled = f"{random.getrandbits(128):032x}", None, random.random() < self.sample_rate
+        trace = Trace(trace_id, sampled=sampled and trace_exporter.enabled)
+        root = Span(
+            trace, f"{scope['method']} {scope['path']}", parent_id,
+            {"http.method": scope["method"], "http.target": scope["path"]}, kind=Span.SERVER,
+        )
+        token = _current_span.set(root)
+        status_code = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(trace, root))
+                headers.append("X-Trace-Id", trace_id)
+                if self.timing_allow_origin:
+                    headers.append("Timing-Allow-Origin", self.timing_allow_origin)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_span.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                root.name = f"{scope['method']} {route.path}"
+            root.attributes["http.status_code"] = status_code
+            root.end()
+
+def _attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+def _otlp_span(span: Span) -> dict:
+    otlp = {
+        "traceId": span.trace.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [_attribute(k, v) for k, v in span.attributes.items()],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 0},
+    }
+    if span.parent_id:
+        otlp["parentSpanId"] = span.parent_id
+    return otlp
+
+class TraceExporter:
+    """
+    끝난 trace를 모아 주기적으로 OTLP/JSON(ExportTraceServiceRequest) 형식으로 내보냅니다.
+      - file: 한 번 내보낼 때마다 한 줄씩 JSON Lines 파일에 추가 (OpenTelemetry file exporter와 같은 형식)
+      - otlp: OTLP/HTTP 수집기(/v1/traces)로 POST
+    버퍼가 가득 차면 오래된 span부터 버립니다.
+    """
+    def __init__(self, mode: str, file_path: str, endpoint: str, service_name: str, interval_seconds: float, max_spans: int):
+        if mode not in ("none", "file", "otlp"):
+            raise ValueError(f"Unknown TRACE_EXPORTER: {mode}")
+        self.mode = mode
+        self.file_path = file_path
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.interval_seconds = interval_seconds
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self.exported_spans = 0
+        self.export_failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "none"
+
+    def add(self, spans: List[Span]):
+        self._spans.extend(spans)
+
+    def _payload(self, spans: List[Span]) -> dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", self.service_name)]},
+            "scopeSpans": [{"scope": {"name": "app.utils.tracing"}, "spans": [_otlp_span(s) for s in spans]}],
+        }]}
+
+    async def flush(self):
+        if not self._spans:
+            return
+        spans = list(self._spans)
+        self._spans.clear()
+        body = json.dumps(self._payload(spans), separators=(",", ":"))
+        try:
+            if self.mode == "file":
+                await run_in_threadpool(_append_line, self.file_path, body)
+            elif self.mode == "otlp":
+                if self._client is None:
+                    self._client = httpx.AsyncClient(timeout=10)
+                response = await self._client.post(self.endpoint, content=body, headers={"content-type": "application/json"})
+                response.raise_for_status()
+            self.exported_spans += len(spans)
+        except Exception as e:
+            self.export_failures += 1
+            logging.warning(f"Failed to export {len(spans)} spans: {e}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.flush()
+
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="trace-exporter")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "buffered_spans": len(self._spans),
+            "exported_spans": self.exported_spans,
+            "export_failures": self.export_failures,
+        }
+
+def _append_line(path: str, line: str):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+trace_exporter = TraceExporter(
+    mode=settings.TRACE_EXPORTER,
+    file_path=settings.TRACE_EXPORT_FILE,
+    endpoint=settings.TRACE_OTLP_ENDPOINT,
+    service_name=settings.TRACE_SERVICE_NAME,
+    interval_seconds=settings.TRACE_EXPORT_INTERVAL_SECONDS,
+    max_spans=settings.TRACE_EXPORT_MAX_SPANS,
+)
+
+# SQL 문 전체는 길고 값이 들어 있을 수 있으므로 앞부분만 남깁니다. (파라미터는 기록하지 않습니다)
+_STATEMENT_MAX_CHARS = 200
+
+def instrument_engine(engine):
+    """
+    SQLAlchemy 엔진의 모든 쿼리를 db.query span으로 기록합니다. 비동기 엔진은 sync_engine을 넘깁니다.
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        parent = _current_span.get()
+        if parent is not None and context is not None:
+            context._trace_span = parent.child("db.query", **{"db.statement": statement[:_STATEMENT_MAX_CHARS]})
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        span = getattr(exception_context.execution_context, "_trace_span", None)
+        if span is not None:
+            span.end(error=exception_context.original_exception)
@@ -0,0 +1,164 @@
+"""
+워커 프로세스 하나가 DB 대기 중에 동시에 처리하는 요청 수를 DB 접근 방식별로 측정합니다.
+
+  - blocking: 동기 Session을 이벤트 루프에서 바로 호출하던 기존 방식
+  - threaded: DATABASE_ASYNC=False, 동기 Session 호출을 스레드 풀에서 실행
+  - async:    DATABASE_ASYNC=True, aiosqlite/asyncpg AsyncSession
+
+Supabase Postgres pooler까지의 왕복 시간을 흉내 내기 위해 SQLite 커서의 execute마다
+--db-latency-ms 만큼 (이벤트 루프가 아닌 DB 호출 스레드에서) 대기합니다.
+인증된 GET /images/persons 요청(쿼리 2회)을 --concurrency 개의 클라이언트가 반복해서 보냅니다.
+peak_in_db는 동시에 DB 응답을 기다린 쿼리 수의 최댓값입니다.
+
+    python benchmarks/bench_db_concurrency.py --concurrency 32 --requests 800 --db-latency-ms 5
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class _Probe:
+    latency = 0.0
+    lock = threading.Lock()
+    in_db = 0
+    peak_in_db = 0
+
+class _SlowCursor(sqlite3.Cursor):
+    def execute(self, *args, **kwargs):
+        with _Probe.lock:
+            _Probe.in_db += 1
+            _Probe.peak_in_db = max(_Probe.peak_in_db, _Probe.in_db)
+        try:
+            time.sleep(_Probe.latency)
+            return super().execute(*args, **kwargs)
+        finally:
+            with _Probe.lock:
+                _Probe.in_db -= 1
+
+class _SlowConnection(sqlite3.Connection):
+    def cursor(self, factory=_SlowCursor):
+        return super().cursor(factory)
+
+async def _call_inline(func, *args, **kwargs):
+    return func(*args, **kwargs)
+
+def _percentile(values, q):
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+def _run_mode(mode: str, concurrency: int, total_requests: int, latency_ms: float, photos: int):
+    db_path = os.path.join(tempfile.mkdtemp(prefix="bench-db-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["DATABASE_ASYNC"] = "true" if mode == "async" else "false"
+    os.environ.setdefault("STORAGE_BACKEND", "local")
+
+    import httpx
+    from sqlalchemy import create_engine
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from app import database, models
+    from app.utils.security import create_access_token
+
+    # 시딩은 지연 없이 진행합니다.
+    seed_engine = create_engine(database.engine.url)
+    models.Base.metadata.create_all(seed_engine)
+    with sessionmaker(bind=seed_engine)() as db:
+        user = models.User(google_id="bench", email="bench@example.com", name="bench")
+        db.add(user)
+        db.flush()
+        db.add_all(
+            models.PersonPhoto(user_id=user.id, filename_original=f"{i}.png", filename=f"bench_{i}.png")
+            for i in range(photos)
+        )
+        db.commit()
+        token = create_access_token({"sub": str(user.id)})
+    seed_engine.dispose()
+
+    # 지연을 주입한 커넥션으로 요청 처리용 세션 팩토리를 교체합니다.
+    # blocking 방식은 풀이 고갈되면 이벤트 루프에서 커넥션을 기다리다 교착되므로 세 방식 모두 풀을 concurrency에 맞춥니다.
+    pool_args = {"pool_size": concurrency, "max_overflow": 0}
+    if mode == "async":
+        engine = create_async_engine(
+            database.to_async_url(str(database.engine.url)), connect_args={"factory": _SlowConnection}, **pool_args
+        )
+        database.SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    else:
+        engine = create_engine(
+            database.engine.url, connect_args={"check_same_thread": False, "factory": _SlowConnection}, **pool_args
+        )
+        sync_factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+        database.SessionLocal = lambda: database.ThreadedSession(sync_factory())
+        if mode == "blocking":
+            database.run_in_threadpool = _call_inline
+    _Probe.latency = latency_ms / 1000
+
+    from app.main import app
+
+    async def drive():
+        headers = {"Authorization": f"Bearer {token}"}
+        latencies = []
+        remaining = iter(range(total_requests))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def client_loop():
+                for _ in remaining:
+                    started = time.perf_counter()
+                    response = await client.get("/images/persons", headers=headers)
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+        # 응답 후 의존성 정리(세션 close)가 끝나길 기다린 뒤 풀을 닫습니다.
+        # aiosqlite 커넥션 스레드가 남아 있으면 프로세스가 종료되지 않습니다.
+        pool = engine.sync_engine.pool if mode == "async" else engine.pool
+        while pool.checkedout():
+            await asyncio.sleep(0.01)
+        if mode == "async":
+            await engine.dispose()
+        else:
+            engine.dispose()
+        return elapsed, latencies
+
+    elapsed, latencies = asyncio.run(drive())
+    print(
+        f"{mode}\t{len(latencies) / elapsed:.1f}\t"
+        f"{_percentile(latencies, 50) * 1000:.1f}\t{_percentile(latencies, 99) * 1000:.1f}\t"
+        f"{_Probe.peak_in_db}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=800)
+    parser.add_argument("--db-latency-ms", type=float, default=5.0)
+    parser.add_argument("--photos", type=int, default=20, help="사용자당 사람 사진 수")
+    parser.add_argument("--mode", choices=["blocking", "threaded", "async"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        _run_mode(args.mode, args.concurrency, args.requests, args.db_latency_ms, args.photos)
+        return
+
+    print(f"concurrency={args.concurrency} requests={args.requests} db_latency={args.db_latency_ms}ms")
+    print("mode\treq_per_s\tp50_ms\tp99_ms\tpeak_in_db")
+    for mode in ("blocking", "threaded", "async"):
+        subprocess.run(
+            [sys.executable, __file__, "--mode", mode,
+             "--concurrency", str(args.concurrency),
+             "--requests", str(args.requests),
+             "--db-latency-ms", str(args.db_latency_ms),
+             "--photos", str(args.photos)],
+            check=True,
+        )
+
+if __name__ == "__main__":
+    main()
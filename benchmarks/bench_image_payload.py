@@ -0,0 +1,83 @@
+"""
+가상 피팅 한 건이 이미지 페이로드 때문에 차지하는 최대 메모리(RSS)를 측정합니다.
+
+  - legacy:  base64 문자열을 Part.from_data에 넘기고 응답의 inline_data.data를 두 번 읽던 방식
+  - current: 원본 바이트를 그대로 넘기고 응답 바이트를 한 번만 읽는 방식 (app.repositories.vton_repository)
+
+각 방식은 별도 프로세스에서 실행되어 ru_maxrss가 서로 섞이지 않습니다.
+요청 페이로드를 만드는 데 걸린 시간(payload_ms_per_tryon)도 함께 출력합니다.
+
+    python benchmarks/bench_image_payload.py --concurrency 8 --image-mb 4 --result-mb 2
+"""
+import argparse
+import base64
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _peak_rss_mb() -> float:
+    # Linux에서 ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _run_mode(mode: str, concurrency: int, image_mb: float, result_mb: float):
+    from vertexai.generative_models import Part
+    from app.repositories.vton_repository import _create_image_part
+
+    image_size = int(image_mb * 1024 * 1024)
+    result_size = int(result_mb * 1024 * 1024)
+    baseline = _peak_rss_mb()
+
+    # 동시에 진행 중인 try-on 수만큼 페이로드를 한꺼번에 메모리에 유지합니다.
+    in_flight = []
+    encode_seconds = 0.0
+    for _ in range(concurrency):
+        person = os.urandom(image_size)
+        cloth = os.urandom(image_size)
+        response_part = Part.from_data(data=os.urandom(result_size), mime_type="image/png")
+
+        started = time.perf_counter()
+        if mode == "legacy":
+            person_part = Part.from_data(data=base64.b64encode(person).decode("utf-8"), mime_type="image/png")
+            cloth_part = Part.from_data(data=base64.b64encode(cloth).decode("utf-8"), mime_type="image/png")
+            if response_part.inline_data and response_part.inline_data.data:
+                result = response_part.inline_data.data
+        else:
+            person_part = _create_image_part(person, "image/png")
+            cloth_part = _create_image_part(cloth, "image/png")
+            result = response_part.inline_data.data if response_part.inline_data else None
+        encode_seconds += time.perf_counter() - started
+
+        in_flight.append((person, cloth, person_part, cloth_part, response_part, result))
+
+    peak = _peak_rss_mb() - baseline
+    print(f"{mode}\t{peak:.1f}\t{peak / concurrency:.1f}\t{encode_seconds / concurrency * 1000:.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--image-mb", type=float, default=4.0)
+    parser.add_argument("--result-mb", type=float, default=2.0)
+    parser.add_argument("--mode", choices=["legacy", "current"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        _run_mode(args.mode, args.concurrency, args.image_mb, args.result_mb)
+        return
+
+    print(f"concurrency={args.concurrency} image={args.image_mb}MB result={args.result_mb}MB")
+    print("mode\tpeak_rss_mb\tper_tryon_mb\tpayload_ms_per_tryon")
+    for mode in ("legacy", "current"):
+        subprocess.run(
+            [sys.executable, __file__, "--mode", mode,
+             "--concurrency", str(args.concurrency),
+             "--image-mb", str(args.image_mb),
+             "--result-mb", str(args.result_mb)],
+            check=True,
+        )
+
+if __name__ == "__main__":
+    main()
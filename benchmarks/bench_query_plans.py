@@ -0,0 +1,189 @@
+"""
+목록 API가 실제로 보내는 쿼리의 실행 계획과 소요 시간을 인덱스 마이그레이션(0002) 전후로 비교합니다.
+
+0001 리비전에서 시딩한 DB를 head까지 업그레이드한 뒤, 0002의 인덱스만 내린 상태(without-0002)와 다시 올린 상태(head)를 측정합니다.
+(0001 스키마에는 이후 리비전에서 추가된 컬럼이 없어 현재 모델이 만드는 쿼리를 그대로 실행할 수 없습니다)
+쿼리는 리포지토리 메서드를 실제로 호출하면서 가로챈 SQL과 파라미터를 그대로 EXPLAIN 합니다.
+  - full_scan: 인덱스 없이 테이블 전체를 읽음 (SQLite "SCAN <table>", Postgres "Seq Scan")
+  - sort:      인덱스 순서를 쓰지 못하고 별도로 정렬함 (SQLite "TEMP B-TREE", Postgres "Sort")
+
+    python benchmarks/bench_query_plans.py --users 200 --photos-per-user 100
+    python benchmarks/bench_query_plans.py --database-url postgresql://user:pw@localhost/bench_empty
+
+--database-url을 주지 않으면 임시 SQLite 파일을 사용합니다. Postgres는 테이블이 없는 빈 DB가 필요합니다.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 비교할 인덱스 마이그레이션
+INDEX_REVISION = "0002"
+
+def _seed(engine, users: int, photos_per_user: int):
+    """
+    현재 리비전의 테이블 구조를 DB에서 읽어 시딩합니다. 이후 마이그레이션에서 추가된 모델 컬럼은 아직 테이블에 없습니다.
+    """
+    from sqlalchemy import MetaData
+
+    rng = random.Random(0)
+    start = datetime(2025, 1, 1)
+
+    def when():
+        return start + timedelta(seconds=rng.randrange(300 * 24 * 3600))
+
+    with engine.begin() as connection:
+        metadata = MetaData()
+        metadata.reflect(connection)
+        tables = metadata.tables
+        connection.execute(tables["users"].insert(), [
+            {"id": i, "google_id": f"g{i}", "email": f"user{i}@example.com", "name": f"user{i}",
+             "is_active": True, "is_superuser": False, "created_at": when()}
+            for i in range(1, users + 1)
+        ])
+        for table in (tables["person_photos"], tables["cloth_photos"]):
+            rows = []
+            for user_id in range(1, users + 1):
+                for n in range(photos_per_user):
+                    row = {"user_id": user_id, "filename_original": "o.png",
+                           "filename": f"{table.name}_{user_id}_{n}.png", "uploaded_at": when()}
+                    if table.name == "cloth_photos":
+                        row["fitting_type"] = rng.choice(("upper", "lower", "overall"))
+                    rows.append(row)
+            connection.execute(table.insert(), rows)
+        connection.execute(tables["result_photos"].insert(), [
+            {"user_id": user_id, "person_photo_id": (user_id - 1) * photos_per_user + 1,
+             "cloth_photo_id": (user_id - 1) * photos_per_user + 1,
+             "filename": f"result_{user_id}_{n}.png", "created_at": when()}
+            for user_id in range(1, users + 1)
+            for n in range(photos_per_user)
+        ])
+
+def _run_index_migration(engine, direction: str):
+    """
+    인덱스 마이그레이션의 upgrade 또는 downgrade만 현재 스키마에 적용합니다. 다른 리비전의 변경은 그대로 둡니다.
+    """
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+    from alembic.script import ScriptDirectory
+    from app.db_migrations import alembic_config
+
+    module = ScriptDirectory.from_config(alembic_config()).get_revision(INDEX_REVISION).module
+    with engine.begin() as connection:
+        with Operations.context(MigrationContext.configure(connection)):
+            getattr(module, direction)()
+
+async def _capture_queries(engine, user_id: int, limit: int):
+    """
+    목록 API가 사용하는 리포지토리 메서드를 호출하며 보낸 SELECT 문을 (이름, SQL, 파라미터)로 모읍니다.
+    """
+    from sqlalchemy import event
+    from sqlalchemy.orm import sessionmaker
+    from app.database import ThreadedSession
+    from app.repositories.image_repository import ImageRepository
+    from app.repositories.photo_repository import PhotoRepository
+    from app.repositories.result_repository import ResultRepository
+    from app.repositories.user_repository import UserRepository
+    from app.utils.pagination import PageParams, decode_cursor
+
+    captured = []
+    listener = lambda conn, cursor, statement, parameters, context, executemany: captured.append((statement, parameters))
+    event.listen(engine, "before_cursor_execute", listener)
+    queries = []
+    db = ThreadedSession(sessionmaker(bind=engine)())
+    try:
+        async def record(name, call):
+            captured.clear()
+            result = await call
+            statement, parameters = captured[-1]
+            queries.append((name, statement, parameters))
+            return result
+
+        photos, images, results, users = PhotoRepository(db), ImageRepository(db), ResultRepository(db), UserRepository(db)
+        first = await record("persons (page 1)", photos.get_all_by_user_id(user_id, PageParams(limit)))
+        await record("persons (page 2)", photos.get_all_by_user_id(user_id, PageParams(limit, decode_cursor(first.next_cursor))))
+        await record("my-clothes (page 1)", photos.get_all_cloth_photos_by_user_id(user_id, PageParams(limit)))
+        await record("results (page 1)", results.get_results_by_user_id(user_id, PageParams(limit)))
+        await record("persons validator", images.get_list_validator("persons", user_id))
+        await record("shop catalog", images.get_shop_cloth_photos())
+        page = await record("/images/clothes (page 1)", images.get_all_photos_by_category("clothes", PageParams(limit)))
+        await record("/images/clothes (page 2)", images.get_all_photos_by_category("clothes", PageParams(limit, decode_cursor(page.next_cursor))))
+        page = await record("admin users (page 1)", users.get_all_users(PageParams(limit)))
+        await record("admin users (page 2)", users.get_all_users(PageParams(limit, decode_cursor(page.next_cursor))))
+    finally:
+        await db.close()
+        event.remove(engine, "before_cursor_execute", listener)
+    return queries
+
+def _explain(connection, statement, parameters):
+    if connection.dialect.name == "sqlite":
+        details = [row[3] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+        full_scan = any(d.startswith("SCAN ") and "USING" not in d for d in details)
+        sort = any("TEMP B-TREE" in d for d in details)
+    else:
+        details = [row[0].strip() for row in connection.exec_driver_sql("EXPLAIN " + statement, parameters)]
+        full_scan = any("Seq Scan" in d for d in details)
+        sort = any(d.lstrip("-> ").startswith(("Sort", "Incremental Sort")) for d in details)
+    return full_scan, sort, " | ".join(details)
+
+def _time_ms(connection, statement, parameters, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        connection.exec_driver_sql(statement, parameters).fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="빈 DB 주소 (기본: 임시 SQLite 파일)")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--photos-per-user", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--verbose", action="store_true", help="실행 계획 전체를 출력")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench-plan-'), 'bench.db')}"
+    os.environ["DATABASE_ASYNC"] = "false"
+    os.environ.setdefault("STORAGE_BACKEND", "local")
+
+    from sqlalchemy import inspect, text
+    from app.database import engine
+    from app.db_migrations import upgrade_database
+
+    if inspect(engine).get_table_names():
+        sys.exit("벤치마크는 테이블이 없는 빈 DB에서만 실행합니다.")
+
+    upgrade_database("0001")
+    _seed(engine, args.users, args.photos_per_user)
+    upgrade_database("head")
+    # 사용자별 쿼리는 id가 중간인 사용자로 측정합니다.
+    user_id = args.users // 2
+
+    print(f"{engine.dialect.name}: users={args.users} photos_per_user={args.photos_per_user} limit={args.limit}")
+    print("revision\tquery\tmedian_ms\tfull_scan\tsort")
+    for revision, direction in ((f"without-{INDEX_REVISION}", "downgrade"), ("head", "upgrade")):
+        _run_index_migration(engine, direction)
+        with engine.connect() as connection:
+            connection.execute(text("ANALYZE"))
+            connection.commit()
+        queries = asyncio.run(_capture_queries(engine, user_id, args.limit))
+        with engine.connect() as connection:
+            for name, statement, parameters in queries:
+                full_scan, sort, plan = _explain(connection, statement, parameters)
+                elapsed = _time_ms(connection, statement, parameters, args.repeat)
+                print(f"{revision}\t{name}\t{elapsed:.2f}\t{'yes' if full_scan else 'no'}\t{'yes' if sort else 'no'}")
+                if args.verbose:
+                    print(f"\t{plan}")
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
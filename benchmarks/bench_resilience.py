@@ -0,0 +1,187 @@
+"""
+Storage 호출에 적용한 재시도, 헤징, 서킷 브레이커의 효과를 장애를 주입한 로컬 저장소로 측정합니다.
+
+  - flaky:   --error-rate 비율의 요청이 503을 돌려줌 -> 재시도 전후 성공률
+  - tail:    --slow-rate 비율의 요청이 --slow-ms 만큼 느림 -> 헤징 전후 p50/p99 지연
+  - outage:  저장소가 --outage-seconds 동안 연결을 거부함 -> 서킷 브레이커가 저장소로 보낸 요청 수와 복구 시점
+
+각 시나리오는 "direct"(저장소 직접 호출)와 "resilient"(storage_resilience와 같은 설정의 ResilientDependency)를 비교합니다.
+
+    python benchmarks/bench_resilience.py --requests 2000 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("STORAGE_BACKEND", "local")
+
+import httpx
+
+from app.config import settings
+from app.utils.resilience import CircuitBreaker, CircuitOpenError, ResilientDependency, RetryPolicy
+from app.utils.storage_backend import (
+    StorageBackend,
+    StorageUnavailableError,
+    is_transient_storage_error,
+    is_unsent_storage_error,
+)
+
+class FaultyStorage(StorageBackend):
+    """
+    메모리에 파일을 두고, 설정한 비율로 오류나 지연을 주입하는 저장소입니다.
+    """
+    def __init__(self, latency_ms: float, error_rate: float = 0.0, slow_rate: float = 0.0, slow_ms: float = 0.0, seed: int = 0):
+        self.latency = latency_ms / 1000
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow = slow_ms / 1000
+        self.down_until = 0.0
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._files = {}
+
+    async def _fault(self):
+        self.requests += 1
+        if time.monotonic() < self.down_until:
+            raise httpx.ConnectError("connection refused")
+        await asyncio.sleep(self.slow if self._rng.random() < self.slow_rate else self.latency)
+        if self._rng.random() < self.error_rate:
+            raise StorageUnavailableError("Supabase(bench) 503: injected")
+
+    async def get(self, bucket: str, path: str) -> bytes:
+        await self._fault()
+        return self._files.get((bucket, path), b"image")
+
+    async def put(self, bucket: str, path: str, data, content_type: str, upsert: bool = False):
+        await self._fault()
+        self._files[(bucket, path)] = bytes(data)
+
+    async def delete(self, bucket, paths):
+        pass
+
+    async def copy(self, bucket, from_path, to_path):
+        pass
+
+    def public_url(self, bucket: str, path: str) -> str:
+        return f"/{bucket}/{path}"
+
+def _dependency(breaker_reset_seconds: float = settings.STORAGE_BREAKER_RESET_SECONDS) -> ResilientDependency:
+    return ResilientDependency(
+        name="storage",
+        retry=RetryPolicy(
+            attempts=settings.STORAGE_RETRY_ATTEMPTS,
+            base_delay_seconds=settings.STORAGE_RETRY_BASE_DELAY_SECONDS,
+            max_delay_seconds=settings.STORAGE_RETRY_MAX_DELAY_SECONDS,
+        ),
+        breaker=CircuitBreaker(
+            "storage",
+            failure_threshold=settings.STORAGE_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout_seconds=breaker_reset_seconds,
+        ),
+        is_transient=is_transient_storage_error,
+        is_unsent=is_unsent_storage_error,
+        hedge_min_delay_seconds=settings.STORAGE_HEDGE_MIN_DELAY_SECONDS,
+        hedge_max_ratio=settings.STORAGE_HEDGE_MAX_RATIO,
+    )
+
+async def _drive(storage: FaultyStorage, dependency, requests: int, concurrency: int, interval: float = 0.0):
+    """
+    concurrency개의 클라이언트가 합계 requests번 get을 호출하고 (성공 수, 빠른 실패 수, 지연 목록, 성공 시각 목록)을 반환합니다.
+    """
+    remaining = iter(range(requests))
+    latencies, succeeded_at, outcome = [], [], {"ok": 0, "short_circuit": 0}
+
+    async def client():
+        for n in remaining:
+            started = time.perf_counter()
+            try:
+                if dependency is None:
+                    await storage.get("bench", f"{n}.png")
+                else:
+                    await dependency.call(lambda: storage.get("bench", f"{n}.png"), hedge=True)
+                outcome["ok"] += 1
+                latencies.append(time.perf_counter() - started)
+                succeeded_at.append(time.monotonic())
+            except CircuitOpenError:
+                outcome["short_circuit"] += 1
+            except Exception:
+                pass
+            if interval:
+                await asyncio.sleep(interval)
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return outcome["ok"], outcome["short_circuit"], latencies, succeeded_at
+
+def _ms(latencies, q):
+    if not latencies:
+        return float("nan")
+    latencies = sorted(latencies)
+    return latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000
+
+async def flaky(args):
+    print(f"\n[flaky] error_rate={args.error_rate}")
+    print("mode\tsuccess_rate\tstorage_requests\tretries")
+    for mode in ("direct", "resilient"):
+        storage = FaultyStorage(args.latency_ms, error_rate=args.error_rate)
+        dependency = None if mode == "direct" else _dependency()
+        # 서킷이 열리지 않는 수준의 오류율에서 재시도 효과만 봅니다.
+        if dependency is not None:
+            dependency.breaker.failure_threshold = args.requests
+        ok, _, _, _ = await _drive(storage, dependency, args.requests, args.concurrency)
+        retries = dependency.retries if dependency else 0
+        print(f"{mode}\t{ok / args.requests:.4f}\t{storage.requests}\t{retries}")
+
+async def tail(args):
+    print(f"\n[tail] slow_rate={args.slow_rate} slow_ms={args.slow_ms}")
+    print("mode\tp50_ms\tp95_ms\tp99_ms\tstorage_requests\thedges\thedge_wins")
+    for mode in ("direct", "resilient"):
+        storage = FaultyStorage(args.latency_ms, slow_rate=args.slow_rate, slow_ms=args.slow_ms)
+        dependency = None if mode == "direct" else _dependency()
+        _, _, latencies, _ = await _drive(storage, dependency, args.requests, args.concurrency)
+        hedges = (dependency.hedges, dependency.hedge_wins) if dependency else (0, 0)
+        print(f"{mode}\t{_ms(latencies, 0.5):.1f}\t{_ms(latencies, 0.95):.1f}\t{_ms(latencies, 0.99):.1f}\t"
+              f"{storage.requests}\t{hedges[0]}\t{hedges[1]}")
+
+async def outage(args):
+    print(f"\n[outage] outage_seconds={args.outage_seconds} breaker_reset_seconds={args.breaker_reset_seconds}")
+    print("mode\tsucceeded\tshort_circuits\tstorage_requests\tbreaker_opens\trecovered_after_s")
+    duration = args.outage_seconds * 3
+    for mode in ("direct", "resilient"):
+        storage = FaultyStorage(args.latency_ms)
+        dependency = None if mode == "direct" else _dependency(args.breaker_reset_seconds)
+        started = time.monotonic()
+        storage.down_until = started + args.outage_seconds
+        # 요청 간격을 두고 outage 전후 구간 동안 일정한 부하를 보냅니다.
+        interval = duration * args.concurrency / args.requests
+        ok, short, _, succeeded_at = await _drive(storage, dependency, args.requests, args.concurrency, interval)
+        opens = dependency.breaker.opens if dependency else 0
+        # 장애가 끝난 뒤 첫 성공까지 걸린 시간
+        after = [t - storage.down_until for t in succeeded_at if t >= storage.down_until]
+        recovered = f"{min(after):.2f}" if after else "-"
+        print(f"{mode}\t{ok}\t{short}\t{storage.requests}\t{opens}\t{recovered}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--slow-rate", type=float, default=0.03)
+    parser.add_argument("--slow-ms", type=float, default=300)
+    parser.add_argument("--outage-seconds", type=float, default=2.0)
+    parser.add_argument("--breaker-reset-seconds", type=float, default=0.5)
+    parser.add_argument("--scenario", choices=("flaky", "tail", "outage", "all"), default="all")
+    args = parser.parse_args()
+
+    async def run():
+        for name, scenario in (("flaky", flaky), ("tail", tail), ("outage", outage)):
+            if args.scenario in (name, "all"):
+                await scenario(args)
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""
+Supabase, Vertex AI 없이 서비스 계층(업로드, 가상 피팅, 목록 API)의 처리량과 지연, 메모리 사용량을 측정합니다.
+
+  - DB:      임시 SQLite 파일에 --users x --photos-per-user 규모로 시딩 (마이그레이션 head 적용)
+  - Storage: 메모리 저장소 (MemoryStorage)
+  - VTON:    --vton-latency-ms 만큼 기다린 뒤 --vton-output-kb 크기의 PNG를 돌려주는 가짜 모델
+             (--vton-engine local이면 실제 CPU 합성 엔진)
+
+요청은 앱(app.main:app)에 ASGI로 직접 보내므로 라우팅, 인증, 미들웨어, 서비스, 리포지토리를 모두 거칩니다.
+시나리오마다 --requests개를 --concurrency개의 클라이언트로 보내 requests/s와 p50/p99 지연을 측정합니다.
+메모리는 시나리오마다 별도 프로세스에서 실행해 RSS 최대치(ru_maxrss)로 측정하므로 Pillow 이미지 버퍼처럼
+Python 힙 밖에서 할당되는 메모리도 포함됩니다. (peak_rss_mb: 프로세스 전체, rss_growth_mb: 준비(시딩/워밍업) 이후 늘어난 양)
+
+    python benchmarks/bench_service_layer.py --requests 200 --concurrency 8
+    python benchmarks/bench_service_layer.py --json bench.json                      # 결과 저장
+    python benchmarks/bench_service_layer.py --vton-engine local --scenarios tryon   # CPU 합성 엔진 부하 측정
+    python benchmarks/bench_service_layer.py --baseline bench.json --tolerance 0.2   # 기준보다 20% 넘게 나빠지면 exit 1
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("upload_person", "tryon", "list_persons", "list_my_clothes", "list_shop_clothes", "list_results")
+
+def _hermetic_env(workdir: str, args):
+    """
+    .env 값과 상관없이 외부 서비스에 접속하지 않도록 설정을 덮어씁니다.
+    """
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        "DATABASE_ASYNC": "true" if args.db_async else "false",
+        "DATABASE_AUTO_MIGRATE": "false",
+        "STORAGE_BACKEND": "local",
+        "PERSON_RESOURCE_DIR": os.path.join(workdir, "persons"),
+        "CLOTH_RESOURCE_DIR": os.path.join(workdir, "cloths"),
+        "RESULT_RESOURCE_DIR": os.path.join(workdir, "results"),
+        "IMAGE_CACHE_DIR": os.path.join(workdir, "cache"),
+        "ALLOWED_ORIGINS": '["*"]',
+        "SECRET_KEY": "bench",
+        "GOOGLE_CLIENT_ID": "bench",
+        "GOOGLE_CLIENT_SECRET": "bench",
+        "SUPABASE_URL": "http://127.0.0.1:9",
+        "SUPABASE_KEY": "bench",
+        "GOOGLE_CLOUD_PROJECT": "bench",
+        "GOOGLE_APPLICATION_CREDENTIALS": os.path.join(workdir, "none.json"),
+        # fake: Vertex AI 엔진 자리에 지연만 주는 가짜 모델, local: 실제 CPU 합성 엔진
+        "VTON_METHOD": "local" if args.vton_engine == "local" else "vertex_ai",
+        "LOCAL_VTON_CONCURRENCY": str(args.vton_concurrency),
+        "TRACE_EXPORTER": "none",
+        # 한 사용자가 모든 요청을 보내므로 사용자별 요청 한도를 풉니다.
+        "TRYON_USER_RATE_PER_MINUTE": "1000000",
+        "TRYON_USER_BURST": "1000000",
+        "VTON_CONCURRENCY_INITIAL": str(args.vton_concurrency),
+        "VTON_CONCURRENCY_MAX": str(args.vton_concurrency),
+    })
+
+def _peak_rss_mb() -> float:
+    # Linux에서 ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _photo_bytes(rng: random.Random, width: int, height: int, fmt: str) -> bytes:
+    """
+    사진처럼 압축되는 (그라디언트 + 잡음) 이미지를 만듭니다. 호출마다 내용이 달라 결과 캐시에 걸리지 않습니다.
+    """
+    from PIL import Image
+    base = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    noise = Image.effect_noise((width, height), 40).convert("RGB")
+    image = Image.blend(base, noise, 0.3)
+    image.putpixel((rng.randrange(width), rng.randrange(height)), (rng.randrange(256), 0, 0))
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, quality=90) if fmt == "JPEG" else image.save(buffer, fmt)
+    return buffer.getvalue()
+
+def _noise_png(size_kb: int) -> bytes:
+    from PIL import Image
+    # 잡음 PNG는 거의 압축되지 않으므로 픽셀 수로 크기를 맞춥니다.
+    side = max(16, int((size_kb * 1024 / 3) ** 0.5))
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", (side, side), os.urandom(side * side * 3)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+def _make_memory_storage():
+    from app.utils.storage_backend import StorageBackend, StorageError, StorageNotFoundError
+
+    class MemoryStorage(StorageBackend):
+        """
+        Supabase Storage 대신 쓰는 메모리 저장소입니다. 원격 저장소처럼 is_local=False이므로 디스크 캐시 경로도 함께 측정됩니다.
+        """
+        def __init__(self):
+            self.objects = {}
+
+        async def get(self, bucket, path):
+            try:
+                return self.objects[(bucket, path)]
+            except KeyError:
+                raise StorageNotFoundError(f"{bucket}/{path} not found")
+
+        async def put(self, bucket, path, data, content_type, upsert=False):
+            if not upsert and (bucket, path) in self.objects:
+                raise StorageError(f"{bucket}/{path} already exists")
+            self.objects[(bucket, path)] = data.read() if hasattr(data, "read") else bytes(data)
+
+        async def delete(self, bucket, paths):
+            for path in paths:
+                self.objects.pop((bucket, path), None)
+
+        async def copy(self, bucket, from_path, to_path):
+            self.objects[(bucket, to_path)] = await self.get(bucket, from_path)
+
+        def public_url(self, bucket, path):
+            return f"memory://{bucket}/{path}"
+
+    return MemoryStorage()
+
+def _seed(args, storage, rng: random.Random) -> int:
+    """
+    사용자/사진/결과 행을 시딩하고, 측정에 쓰는 사용자(id=2)의 사진만 저장소에 실제 파일을 올립니다.
+    """
+    from app import models
+    from app.database import engine
+    from app.config import settings
+
+    start = datetime(2025, 1, 1)
+    bench_user_id = 2
+    shop_user_id = settings.SHOP_USER_ID
+
+    def when():
+        return start + timedelta(seconds=rng.randrange(300 * 24 * 3600))
+
+    with engine.begin() as connection:
+        connection.execute(models.User.__table__.insert(), [
+            {"id": i, "google_id": f"g{i}", "email": f"user{i}@example.com", "name": f"user{i}",
+             "is_active": True, "is_superuser": False, "created_at": when()}
+            for i in range(1, args.users + 1)
+        ])
+        for model, bucket in ((models.PersonPhoto, "person_photo"), (models.ClothPhoto, "cloth_photo")):
+            rows = []
+            for user_id in range(1, args.users + 1):
+                for n in range(args.photos_per_user):
+                    filename = f"{bucket}_{user_id}_{n}.jpg"
+                    row = {"user_id": user_id, "filename_original": "o.jpg", "filename": filename, "uploaded_at": when()}
+                    if model is models.ClothPhoto:
+                        row["fitting_type"] = rng.choice(("upper", "lower", "overall"))
+                    rows.append(row)
+                    if user_id in (bench_user_id, shop_user_id) and n < args.stored_photos:
+                        storage.objects[(bucket, filename)] = _photo_bytes(rng, 768, 1024, "JPEG")
+            connection.execute(model.__table__.insert(), rows)
+        connection.execute(models.ResultPhoto.__table__.insert(), [
+            {"user_id": user_id, "person_photo_id": (user_id - 1) * args.photos_per_user + 1,
+             "cloth_photo_id": (user_id - 1) * args.photos_per_user + 1,
+             "filename": f"result_{user_id}_{n}.png", "created_at": when()}
+            for user_id in range(1, args.users + 1)
+            for n in range(args.photos_per_user)
+        ])
+    return bench_user_id
+
+def _percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))] if samples else float("nan")
+
+async def _drive(send, requests: int, concurrency: int):
+    """
+    concurrency개의 클라이언트가 send(n)을 합계 requests번 호출하고 (지연 목록, 오류 목록, 경과 시간)을 반환합니다.
+    """
+    remaining = iter(range(requests))
+    latencies, errors = [], []
+
+    async def client():
+        for n in remaining:
+            started = time.perf_counter()
+            response = await send(n)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors.append(f"{response.status_code} {response.text[:120]}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+async def run(args) -> dict:
+    import httpx
+    from app import database
+    from app.config import settings
+    from app.db_migrations import upgrade_database
+    from app.main import app
+    from app.repositories import vton_repository
+    from app.services.tryon_job_service import tryon_job_manager
+    from app.utils import storage_backend as storage_module
+    from app.utils.security import create_access_token
+
+    rng = random.Random(0)
+    storage = _make_memory_storage()
+    storage_module.storage_backend = storage
+
+    vton_output = _noise_png(args.vton_output_kb)
+
+    async def fake_vton(person_image_bytes, person_mime_type, cloth_image_bytes, cloth_mime_type, cloth_type="upper"):
+        await asyncio.sleep(args.vton_latency_ms / 1000)
+        return vton_output
+    if args.vton_engine == "fake":
+        vton_repository.run_vton_with_vertex_ai = fake_vton
+
+    upgrade_database()
+    user_id = _seed(args, storage, rng)
+    person_ids = list(range((user_id - 1) * args.photos_per_user + 1, (user_id - 1) * args.photos_per_user + 1 + args.stored_photos))
+    cloth_ids = list(range((settings.SHOP_USER_ID - 1) * args.photos_per_user + 1, (settings.SHOP_USER_ID - 1) * args.photos_per_user + 1 + args.stored_photos))
+    # 모든 가상 피팅 요청이 모델을 호출하도록 겹치지 않는 (사람, 옷) 조합을 씁니다.
+    pairs = [(p, c) for p in person_ids for c in cloth_ids]
+    rng.shuffle(pairs)
+    uploads = [_photo_bytes(rng, 1024, 1536, "JPEG") for _ in range(8)]
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+    await tryon_job_manager.start()
+    results = {}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120) as client:
+            pair_iter = iter(pairs)
+
+            def tryon_request(n):
+                person_id, cloth_id = next(pair_iter)
+                return client.post("/tryon", headers=headers, json={"user_id": user_id, "person_photo_id": person_id, "cloth_photo_id": cloth_id})
+
+            senders = {
+                "upload_person": lambda n: client.post(
+                    "/upload/person", headers=headers, files={"file": ("photo.jpg", uploads[n % len(uploads)], "image/jpeg")}),
+                "tryon": tryon_request,
+                "list_persons": lambda n: client.get("/images/persons", headers=headers),
+                "list_my_clothes": lambda n: client.get("/images/my-clothes", headers=headers),
+                "list_shop_clothes": lambda n: client.get("/images/shop-clothes", headers=headers),
+                "list_results": lambda n: client.get(f"/results/{user_id}", headers=headers),
+            }
+            needed = args.requests + args.warmup if "tryon" in args.scenarios else 0
+            if needed > len(pairs):
+                sys.exit(f"--stored-photos {args.stored_photos}로는 가상 피팅 조합이 {len(pairs)}개뿐입니다. (필요: {needed})")
+
+            for name in args.scenarios:
+                send = senders[name]
+                await _drive(send, args.warmup, 1)
+                rss_before = _peak_rss_mb()
+                latencies, errors, elapsed = await _drive(send, args.requests, args.concurrency)
+                peak_rss = _peak_rss_mb()
+
+                results[name] = {
+                    "requests": len(latencies),
+                    "errors": len(errors),
+                    "rps": len(latencies) / elapsed,
+                    "p50_ms": _percentile(latencies, 0.5) * 1000,
+                    "p99_ms": _percentile(latencies, 0.99) * 1000,
+                    "peak_rss_mb": peak_rss,
+                    "rss_growth_mb": peak_rss - rss_before,
+                }
+                if errors:
+                    print(f"{name}: {len(errors)} errors, e.g. {errors[0]}", file=sys.stderr)
+    finally:
+        await tryon_job_manager.stop()
+        if database.async_engine is not None:
+            await database.async_engine.dispose()
+        database.engine.dispose()
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def _compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    기준 결과보다 처리량이 tolerance 넘게 줄었거나 p99 지연이 tolerance 넘게 늘어난 시나리오를 돌려줍니다.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {base['rps']:.1f} -> {current['rps']:.1f}")
+        if current["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {base['p99_ms']:.1f}ms -> {current['p99_ms']:.1f}ms")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="시나리오별 측정 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--photos-per-user", type=int, default=50)
+    parser.add_argument("--stored-photos", type=int, default=20, help="측정 사용자/상점의 사진 중 실제 파일을 올릴 개수")
+    parser.add_argument("--vton-engine", choices=("fake", "local"), default="fake",
+                        help="fake: 지연만 주는 가짜 모델, local: CPU 합성 엔진")
+    parser.add_argument("--vton-latency-ms", type=float, default=50)
+    parser.add_argument("--vton-output-kb", type=int, default=1024)
+    parser.add_argument("--vton-concurrency", type=int, default=16, help="모델 동시 호출 수 (고정)")
+    parser.add_argument("--db-async", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker_output:
+        # 시나리오 하나를 실행하는 하위 프로세스: 결과만 파일로 남깁니다.
+        workdir = tempfile.mkdtemp(prefix="bench-service-")
+        _hermetic_env(workdir, args)
+        with open(args.worker_output, "w", encoding="utf-8") as f:
+            json.dump(asyncio.run(run(args)), f)
+        return
+
+    # 시나리오마다 별도 프로세스에서 실행해 ru_maxrss가 서로 섞이지 않게 합니다.
+    results = {}
+    output = os.path.join(tempfile.mkdtemp(prefix="bench-service-"), "result.json")
+    for name in args.scenarios:
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), *sys.argv[1:], "--scenarios", name, "--worker-output", output],
+            check=True,
+        )
+        with open(output, encoding="utf-8") as f:
+            results.update(json.load(f))
+
+    print(f"commit={_git_commit()} db_async={args.db_async} concurrency={args.concurrency} "
+          f"vton_engine={args.vton_engine} vton_latency_ms={args.vton_latency_ms} vton_output_kb={args.vton_output_kb}")
+    print("scenario\trequests\terrors\trps\tp50_ms\tp99_ms\tpeak_rss_mb\trss_growth_mb")
+    for name, r in results.items():
+        print(f"{name}\t{r['requests']}\t{r['errors']}\t{r['rps']:.1f}\t{r['p50_ms']:.1f}\t{r['p99_ms']:.1f}"
+              f"\t{r['peak_rss_mb']:.1f}\t{r['rss_growth_mb']:.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"commit": _git_commit(), "args": vars(args), "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = _compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
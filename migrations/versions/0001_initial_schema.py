@@ -0,0 +1,77 @@
+"""initial schema
+
+기존에 Base.metadata.create_all로 만들던 테이블입니다.
+create_all로 이미 만들어진 DB는 app.db_migrations가 이 리비전으로 stamp한 뒤 업그레이드합니다.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("google_id", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("profile_image", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_superuser", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("email"),
+    )
+    op.create_index("ix_users_google_id", "users", ["google_id"], unique=True)
+    op.create_index("ix_users_id", "users", ["id"])
+
+    for table in ("person_photos", "cloth_photos"):
+        op.create_table(
+            table,
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("filename_original", sa.String(), nullable=False),
+            sa.Column("filename", sa.String(), nullable=False),
+            *([sa.Column("fitting_type", sa.String(), nullable=False)] if table == "cloth_photos" else []),
+            sa.Column("uploaded_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("filename"),
+        )
+        op.create_index(f"ix_{table}_id", table, ["id"])
+
+    op.create_table(
+        "result_photos",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("person_photo_id", sa.Integer(), nullable=False),
+        sa.Column("cloth_photo_id", sa.Integer(), nullable=False),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["cloth_photo_id"], ["cloth_photos.id"]),
+        sa.ForeignKeyConstraint(["person_photo_id"], ["person_photos.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("filename"),
+    )
+    op.create_index("ix_result_photos_id", "result_photos", ["id"])
+
+
+def downgrade():
+    op.drop_index("ix_result_photos_id", table_name="result_photos")
+    op.drop_table("result_photos")
+    for table in ("cloth_photos", "person_photos"):
+        op.drop_index(f"ix_{table}_id", table_name=table)
+        op.drop_table(table)
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_index("ix_users_google_id", table_name="users")
+    op.drop_table("users")
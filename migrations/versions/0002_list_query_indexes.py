@@ -0,0 +1,42 @@
+"""list query indexes
+
+목록 API의 키셋 페이지네이션 쿼리에 맞춘 인덱스입니다.
+  - 사용자별 목록/검증자/상점 카탈로그: WHERE user_id = ? ORDER BY <시각> DESC, id DESC
+  - 카테고리 전체 목록(/images/{category}, 관리자): ORDER BY <시각> DESC, id DESC
+  - 관리자 사용자 목록: ORDER BY created_at DESC, id DESC
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (테이블, 정렬 시각 컬럼)
+PHOTO_TABLES = (
+    ("person_photos", "uploaded_at"),
+    ("cloth_photos", "uploaded_at"),
+    ("result_photos", "created_at"),
+)
+
+
+def upgrade():
+    for table, ts in PHOTO_TABLES:
+        op.create_index(
+            f"ix_{table}_user_id_{ts}", table, ["user_id", sa.text(f"{ts} DESC"), sa.text("id DESC")]
+        )
+        op.create_index(f"ix_{table}_{ts}", table, [sa.text(f"{ts} DESC"), sa.text("id DESC")])
+    op.create_index("ix_users_created_at", "users", [sa.text("created_at DESC"), sa.text("id DESC")])
+
+
+def downgrade():
+    op.drop_index("ix_users_created_at", table_name="users")
+    for table, ts in PHOTO_TABLES:
+        op.drop_index(f"ix_{table}_{ts}", table_name=table)
+        op.drop_index(f"ix_{table}_user_id_{ts}", table_name=table)
@@ -0,0 +1,33 @@
+"""photo thumbnail widths
+
+사진 레코드에 실제로 저장된 WebP 썸네일의 가로 폭 목록을 쉼표로 구분해 기록합니다. (예: "160,320")
+원본보다 넓은 폭은 만들지 않으므로 레코드마다 목록이 다를 수 있습니다.
+기존 레코드는 빈 문자열(썸네일 없음)로 채워지며, scripts/backfill_thumbnails.py가 썸네일을 만든 뒤 기록합니다.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+PHOTO_TABLES = ("person_photos", "cloth_photos", "result_photos")
+
+
+def upgrade():
+    for table in PHOTO_TABLES:
+        op.add_column(
+            table, sa.Column("thumbnail_widths", sa.String(), nullable=False, server_default="")
+        )
+
+
+def downgrade():
+    for table in PHOTO_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("thumbnail_widths")
@@ -7,6 +7,12 @@ document.addEventListener('DOMContentLoaded', () => {
     const photosTableBody = document.getElementById('photosTableBody');
     const photoCategorySelect = document.getElementById('photoCategory');
     const loadPhotosBtn = document.getElementById('loadPhotosBtn');
+    const loadMoreUsersBtn = document.getElementById('loadMoreUsersBtn');
+    const loadMorePhotosBtn = document.getElementById('loadMorePhotosBtn');
+
+    // 목록 API는 커서 기반 페이지네이션을 사용합니다. 다음 페이지가 없으면 null입니다.
+    let usersNextCursor = null;
+    let photosNextCursor = null;
 
     let currentToken = null; // Store the JWT token
 
@@ -78,13 +84,14 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     // --- User Management ---
-    async function loadUsers() {
+    async function loadUsers(cursor = null) {
         if (!currentToken) {
             alert("관리자 토큰이 없습니다. 로그인해주세요.");
             return;
         }
         try {
-            const response = await fetch('/admin/users', {
+            const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+            const response = await fetch(`/admin/users${query}`, {
                 headers: {
                     'Authorization': `Bearer ${currentToken}`
                 }
@@ -98,16 +105,20 @@ document.addEventListener('DOMContentLoaded', () => {
                 }
                 throw new Error('사용자 데이터를 불러오는데 실패했습니다.');
             }
-            const users = await response.json();
-            renderUsers(users);
+            const page = await response.json();
+            renderUsers(page.items, Boolean(cursor));
+            usersNextCursor = page.next_cursor;
+            loadMoreUsersBtn.style.display = usersNextCursor ? '' : 'none';
         } catch (error) {
             console.error('Error loading users:', error);
             alert('사용자 데이터를 불러오는 중 오류가 발생했습니다.');
         }
     }
 
-    function renderUsers(users) {
-        usersTableBody.innerHTML = '';
+    function renderUsers(users, append = false) {
+        if (!append) {
+            usersTableBody.innerHTML = '';
+        }
         users.forEach(user => {
             const row = usersTableBody.insertRow();
             row.insertCell().textContent = user.id;
@@ -191,16 +202,24 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // --- Photo Management ---
-    loadPhotosBtn.addEventListener('click', loadPhotos);
+    loadMoreUsersBtn.addEventListener('click', () => loadUsers(usersNextCursor));
+    loadPhotosBtn.addEventListener('click', () => loadPhotos());
+    loadMorePhotosBtn.addEventListener('click', () => loadPhotos(photosNextCursor));
+    // 커서는 카테고리별로 다르므로 카테고리를 바꾸면 처음부터 다시 불러와야 합니다.
+    photoCategorySelect.addEventListener('change', () => {
+        photosNextCursor = null;
+        loadMorePhotosBtn.style.display = 'none';
+    });
 
-    async function loadPhotos() {
+    async function loadPhotos(cursor = null) {
         if (!currentToken) {
             alert("관리자 토큰이 없습니다. 로그인해주세요.");
             return;
         }
         const category = photoCategorySelect.value;
         try {
-            const response = await fetch(`/admin/photos/${category}`, {
+            const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+            const response = await fetch(`/admin/photos/${category}${query}`, {
                 headers: {
                     'Authorization': `Bearer ${currentToken}`
                 }
@@ -214,16 +233,20 @@ document.addEventListener('DOMContentLoaded', () => {
                 }
                 throw new Error('사진 데이터를 불러오는데 실패했습니다.');
             }
-            const photos = await response.json();
-            renderPhotos(photos, category);
+            const page = await response.json();
+            renderPhotos(page.items, category, Boolean(cursor));
+            photosNextCursor = page.next_cursor;
+            loadMorePhotosBtn.style.display = photosNextCursor ? '' : 'none';
         } catch (error) {
             console.error('Error loading photos:', error);
             alert('사진 데이터를 불러오는 중 오류가 발생했습니다.');
         }
     }
 
-    function renderPhotos(photos, category) {
-        photosTableBody.innerHTML = '';
+    function renderPhotos(photos, category, append = false) {
+        if (!append) {
+            photosTableBody.innerHTML = '';
+        }
         photos.forEach(photo => {
             const row = photosTableBody.insertRow();
             row.insertCell().textContent = photo.id;
@@ -0,0 +1,91 @@
+"""
+썸네일이 없는(thumbnail_widths가 빈 값) PersonPhoto / ClothPhoto / ResultPhoto 레코드의 WebP 썸네일을 생성하고,
+저장된 폭 목록을 레코드의 thumbnail_widths에 기록합니다.
+가장 작은 THUMBNAIL_WIDTHS보다 좁은 원본은 만들 썸네일이 없으므로 실행할 때마다 다시 확인됩니다.
+
+    python -m scripts.backfill_thumbnails                  # 모든 카테고리
+    python -m scripts.backfill_thumbnails --category clothes --after-id 1200
+"""
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import select, update
+
+from app.database import SessionLocal, async_engine
+from app.repositories.image_repository import ImageRepository, CATEGORY_BUCKETS, CATEGORY_MODELS
+from app.repositories.upload_repository import UploadRepository
+from app.services.thumbnail_service import ThumbnailService
+from app.utils.image_processing import format_thumbnail_widths
+from app.utils.storage_backend import storage_backend
+
+BATCH_SIZE = 100
+
+async def backfill(category: str, after_id: int, concurrency: int) -> tuple[int, int]:
+    model = CATEGORY_MODELS[category]
+    bucket = CATEGORY_BUCKETS[category]
+    db = SessionLocal()
+    image_repo = ImageRepository(db)
+    thumbnail_service = ThumbnailService(UploadRepository(db))
+    semaphore = asyncio.Semaphore(concurrency)
+    succeeded = failed = 0
+
+    async def process(filename: str) -> list[int]:
+        async with semaphore:
+            try:
+                image_bytes = await image_repo.download_image(bucket, filename)
+            except Exception as e:
+                logging.warning(f"Skipping {bucket}/{filename}: {e}")
+                return []
+            # 이미 일부 썸네일이 있을 수 있으므로 덮어쓰기(upsert)로 저장합니다.
+            return await thumbnail_service.create_thumbnails(bucket, filename, image_bytes, upsert=True)
+
+    try:
+        last_id = after_id
+        while True:
+            rows = (await db.execute(
+                select(model.id, model.filename)
+                .where(model.id > last_id, model.thumbnail_widths == "")
+                .order_by(model.id)
+                .limit(BATCH_SIZE)
+            )).all()
+            if not rows:
+                break
+            results = await asyncio.gather(*(process(row.filename) for row in rows))
+            for row, widths in zip(rows, results):
+                if widths:
+                    await db.execute(
+                        update(model).where(model.id == row.id).values(thumbnail_widths=format_thumbnail_widths(widths))
+                    )
+            # 배치마다 커밋해 중단되어도 처리한 레코드는 다시 처리하지 않습니다.
+            await db.commit()
+            stored = sum(1 for widths in results if widths)
+            succeeded += stored
+            failed += len(results) - stored
+            last_id = rows[-1].id
+            logging.info(f"[{category}] processed up to id {last_id} (ok={succeeded}, failed={failed})")
+    finally:
+        await db.close()
+    return succeeded, failed
+
+async def main():
+    parser = argparse.ArgumentParser(description="Generate WebP thumbnails for existing photos.")
+    parser.add_argument("--category", choices=sorted(CATEGORY_MODELS), action="append",
+                        help="처리할 카테고리 (여러 번 지정 가능, 기본값: 전체)")
+    parser.add_argument("--after-id", type=int, default=0, help="이 ID 이후의 레코드부터 처리 (중단 후 재개용)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    try:
+        for category in args.category or sorted(CATEGORY_MODELS):
+            succeeded, failed = await backfill(category, args.after_id, args.concurrency)
+            print(f"{category}: {succeeded} ok, {failed} failed")
+    finally:
+        await storage_backend.aclose()
+        # 비동기 엔진의 커넥션(aiosqlite 스레드)이 남아 있으면 프로세스가 종료되지 않습니다.
+        if async_engine is not None:
+            await async_engine.dispose()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())